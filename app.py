@@ -1,14 +1,30 @@
 import os
+import atexit
 import psycopg2
 from flask import Flask
 from src.controllers.tmdb_controller import TMDBController
 from src.controllers.game_controller import GameController
+from src.controllers.metrics_controller import MetricsController
 
 from src.services.tmdb_service import TMDBService
+from src.services.tmdb_async_fetcher import TMDBAsyncFetcher
+from src.services.tmdb_cache_service import TMDBResponseCache, TTL_POR_ENDPOINT
+from src.services.rate_limiter import AdaptiveRateLimiter
 from src.services.actors_service import ActorService
 from src.services.movies_service import MovieService
 from src.services.actor_movie_service import ActorMovieService
 from src.services.game_sevice import GameService
+from src.services.path_cache_service import PathCacheService
+from src.services.actor_search_service import ActorSearchService
+from src.services.ingestion_job_service import IngestionJobService
+from src.services.ingestion_worker_pool import IngestionWorkerPool
+from src.services.single_flight import SingleFlight, AdvisoryLocks
+from src.services.copy_bulk_loader import CopyBulkLoader
+from src.services import metrics
+from src.models.landmarks import LandmarkIndex
+from src.models.graph_snapshot import GraphSnapshot
+from src.models.components import ComponentIndex
+from src.commands.graph_commands import GraphCommands
 
 from flask_cors import CORS
 from dotenv import load_dotenv
@@ -29,6 +45,59 @@ def create_app():
     # Configurar desde variables de entorno
     app.config['TMDB_API_KEY'] = os.getenv('TMDB_API_KEY')
     app.config['TMDB_BASE_URL'] = os.getenv('TMDB_BASE_URL')
+    # Pool de conexiones HTTP hacia TMDB (compartido por todos los hilos)
+    app.config['TMDB_MAX_CONNECTIONS'] = int(os.getenv('TMDB_MAX_CONNECTIONS', 20))
+    app.config['TMDB_MAX_KEEPALIVE'] = int(os.getenv('TMDB_MAX_KEEPALIVE', 10))
+    app.config['TMDB_TIMEOUT'] = float(os.getenv('TMDB_TIMEOUT', 10))
+    app.config['TMDB_HTTP2'] = os.getenv('TMDB_HTTP2', '0') == '1'
+    # Caché persistente de respuestas de TMDB (ruta vacía = desactivada)
+    app.config['TMDB_CACHE_PATH'] = os.getenv('TMDB_CACHE_PATH', 'tmdb_cache.sqlite3')
+    app.config['TMDB_CACHE_MAX_ENTRIES'] = int(os.getenv('TMDB_CACHE_MAX_ENTRIES', 50000))
+    # TTL por endpoint en segundos, p. ej. TMDB_CACHE_TTL_SEARCH=600
+    app.config['TMDB_CACHE_TTLS'] = {
+        endpoint: float(os.environ[f'TMDB_CACHE_TTL_{endpoint.upper()}'])
+        for endpoint in TTL_POR_ENDPOINT
+        if os.getenv(f'TMDB_CACHE_TTL_{endpoint.upper()}')
+    }
+    # Descarga de créditos: 'hilos' (lotes con pausa) o 'async' (pipeline continuo)
+    app.config['CAST_FETCH_MODE'] = os.getenv('CAST_FETCH_MODE', 'hilos')
+    # Limitador AIMD compartido por todas las llamadas a TMDB del proceso (req/s)
+    app.config['TMDB_RATE_LIMIT'] = float(os.getenv('TMDB_RATE_LIMIT', 40))
+    app.config['TMDB_RATE_LIMIT_MIN'] = float(os.getenv('TMDB_RATE_LIMIT_MIN', 2))
+    app.config['TMDB_MAX_IN_FLIGHT'] = int(os.getenv('TMDB_MAX_IN_FLIGHT', 20))
+    app.config['GRAPH_BACKEND'] = os.getenv('GRAPH_BACKEND', 'lista')
+    app.config['GRAPH_SEARCH'] = os.getenv('GRAPH_SEARCH', 'bidireccional')
+    # 0 = sin límite de vértices expandidos en memoria
+    app.config['GRAPH_MAX_VERTICES'] = int(os.getenv('GRAPH_MAX_VERTICES', 0)) or None
+    # Con GRAPH_BACKEND=sql: saltos máximos de la búsqueda en Postgres
+    app.config['GRAPH_SQL_MAX_HOPS'] = int(os.getenv('GRAPH_SQL_MAX_HOPS', 12))
+    app.config['LANDMARKS_PATH'] = os.getenv('LANDMARKS_PATH', 'landmarks.bin')
+    app.config['GRAPH_SNAPSHOT_PATH'] = os.getenv('GRAPH_SNAPSHOT_PATH', 'graph_snapshot.bin')
+    # Índice de componentes conexos (flask build-components) para responder "sin ruta" sin buscar
+    app.config['COMPONENTS_PATH'] = os.getenv('COMPONENTS_PATH', 'components.bin')
+    # Caché de rutas por par de actores (0 = desactivada) y su TTL en segundos (0 = sin TTL)
+    app.config['PATH_CACHE_SIZE'] = int(os.getenv('PATH_CACHE_SIZE', 1000))
+    app.config['PATH_CACHE_TTL'] = float(os.getenv('PATH_CACHE_TTL', 3600)) or None
+    app.config['VERIFY_CONNECTION_MODE'] = os.getenv('VERIFY_CONNECTION_MODE', 'secuencial')
+    # Ingesta de actores: 'inline' (dentro del request) o 'background' (cola de jobs)
+    app.config['INGESTION_MODE'] = os.getenv('INGESTION_MODE', 'inline')
+    app.config['INGESTION_WORKERS'] = int(os.getenv('INGESTION_WORKERS', 2))
+    app.config['INGESTION_POLL_SECONDS'] = float(os.getenv('INGESTION_POLL_SECONDS', 2))
+    # Inserción por lotes: 'insert' (INSERT ... VALUES) o 'copy' (COPY a staging + merge)
+    app.config['BULK_LOAD_MODE'] = os.getenv('BULK_LOAD_MODE', 'copy')
+    # Leer las aristas del grafo de la tabla costar_edges (llenarla antes con 'flask backfill-costar-edges')
+    app.config['COSTAR_EDGES'] = os.getenv('COSTAR_EDGES', '0') == '1'
+    # Deduplicación de ingestas concurrentes del mismo actor/película: en el proceso y entre procesos
+    app.config['SINGLE_FLIGHT'] = os.getenv('SINGLE_FLIGHT', '1') == '1'
+    app.config['ADVISORY_LOCKS'] = os.getenv('ADVISORY_LOCKS', '1') == '1'
+    app.config['ADVISORY_LOCK_TIMEOUT'] = float(os.getenv('ADVISORY_LOCK_TIMEOUT', 300))
+    # Búsqueda de actores: local (tabla actors, TMDB solo si hay pocos resultados) | tmdb
+    app.config['ACTOR_SEARCH_MODE'] = os.getenv('ACTOR_SEARCH_MODE', 'local')
+    app.config['ACTOR_SEARCH_MIN_RESULTS'] = int(os.getenv('ACTOR_SEARCH_MIN_RESULTS', 5))
+    app.config['ACTOR_SEARCH_LIMIT'] = int(os.getenv('ACTOR_SEARCH_LIMIT', 20))
+    # /metrics (Prometheus) y desglose de tiempos por request; Server-Timing lo expone al cliente
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', '1') == '1'
+    app.config['SERVER_TIMING'] = os.getenv('SERVER_TIMING', '0') == '1'
 
     conexion_db(app)
     initial_services_controllers(app)
@@ -38,24 +107,168 @@ def create_app():
 
 def initial_services_controllers(app):
     # Iniciar servicios
-    tmdb_service = TMDBService(api_key=app.config['TMDB_API_KEY'], base_url=app.config['TMDB_BASE_URL'])
-    actor_service = ActorService(app.db)
-    movie_service = MovieService(app.db)
-    actor_movie_service = ActorMovieService(app.db)
+    tmdb_cache = None
+    if app.config['TMDB_CACHE_PATH']:
+        tmdb_cache = TMDBResponseCache(
+            app.config['TMDB_CACHE_PATH'], app.config['TMDB_CACHE_MAX_ENTRIES'], app.config['TMDB_CACHE_TTLS']
+        )
+    tmdb_limiter = AdaptiveRateLimiter(app.config['TMDB_RATE_LIMIT'], app.config['TMDB_RATE_LIMIT_MIN'])
+    tmdb_service = TMDBService(
+        api_key=app.config['TMDB_API_KEY'], base_url=app.config['TMDB_BASE_URL'],
+        max_connections=app.config['TMDB_MAX_CONNECTIONS'], max_keepalive=app.config['TMDB_MAX_KEEPALIVE'],
+        timeout=app.config['TMDB_TIMEOUT'], http2=app.config['TMDB_HTTP2'], cache=tmdb_cache,
+        limiter=tmdb_limiter
+    )
+    # Cerrar el pool de conexiones al apagar la app
+    atexit.register(tmdb_service.close)
+    credits_fetcher = None
+    if app.config['CAST_FETCH_MODE'] == 'async':
+        credits_fetcher = TMDBAsyncFetcher(
+            api_key=app.config['TMDB_API_KEY'], base_url=app.config['TMDB_BASE_URL'],
+            max_in_flight=app.config['TMDB_MAX_IN_FLIGHT'], timeout=app.config['TMDB_TIMEOUT'],
+            cache=tmdb_cache, limiter=tmdb_limiter
+        )
+        atexit.register(credits_fetcher.close)
+    elif app.config['CAST_FETCH_MODE'] != 'hilos':
+        raise ValueError(f"Modo de descarga de créditos desconocido: {app.config['CAST_FETCH_MODE']}")
+    bulk_loader = None
+    if app.config['BULK_LOAD_MODE'] == 'copy':
+        bulk_loader = CopyBulkLoader(app.db)
+    elif app.config['BULK_LOAD_MODE'] != 'insert':
+        raise ValueError(f"Modo de carga por lotes desconocido: {app.config['BULK_LOAD_MODE']}")
+    actor_service = ActorService(app.db, bulk_loader=bulk_loader)
+    movie_service = MovieService(app.db, bulk_loader=bulk_loader)
+    actor_movie_service = ActorMovieService(
+        app.db, bulk_loader=bulk_loader, use_costar_edges=app.config['COSTAR_EDGES']
+    )
+    ingestion_pool = None
+    if app.config['INGESTION_MODE'] == 'background':
+        # La función de ingesta se conecta después de crear GameService
+        ingestion_pool = IngestionWorkerPool(
+            IngestionJobService(app.db), ingest=None,
+            workers=app.config['INGESTION_WORKERS'], poll_seconds=app.config['INGESTION_POLL_SECONDS']
+        )
+    elif app.config['INGESTION_MODE'] != 'inline':
+        raise ValueError(f"Modo de ingesta desconocido: {app.config['INGESTION_MODE']}")
+    single_flight = None
+    advisory_locks = None
+    if app.config['SINGLE_FLIGHT']:
+        single_flight = SingleFlight()
+        if app.config['ADVISORY_LOCKS']:
+            advisory_locks = AdvisoryLocks(app.engine, app.config['ADVISORY_LOCK_TIMEOUT'])
+    components = load_components(app.config['COMPONENTS_PATH'], actor_movie_service)
+    if components is not None:
+        # Al apagar se guarda con el watermark al día: el próximo arranque solo lee lo nuevo
+        atexit.register(save_components, components, app.config['COMPONENTS_PATH'])
+
+    actor_search = None
+    if app.config['ACTOR_SEARCH_MODE'] == 'local':
+        actor_search = ActorSearchService(
+            actor_service, tmdb_service,
+            min_results=app.config['ACTOR_SEARCH_MIN_RESULTS'], limit=app.config['ACTOR_SEARCH_LIMIT']
+        )
+    elif app.config['ACTOR_SEARCH_MODE'] != 'tmdb':
+        raise ValueError(f"Modo de búsqueda de actores desconocido: {app.config['ACTOR_SEARCH_MODE']}")
+
+    path_cache = None
+    if app.config['PATH_CACHE_SIZE'] > 0:
+        path_cache = PathCacheService(app.config['PATH_CACHE_SIZE'], app.config['PATH_CACHE_TTL'])
     game_service = GameService(
         actor_service=actor_service,
         movie_service=movie_service,
         actor_movie_service=actor_movie_service,
-        tmdb_service=tmdb_service
+        tmdb_service=tmdb_service,
+        graph_backend=app.config['GRAPH_BACKEND'],
+        graph_search=app.config['GRAPH_SEARCH'],
+        graph_max_vertices=app.config['GRAPH_MAX_VERTICES'],
+        landmarks=load_landmarks(app.config['LANDMARKS_PATH']),
+        graph_snapshot=load_graph_snapshot(app.config['GRAPH_SNAPSHOT_PATH']),
+        path_cache=path_cache,
+        verify_mode=app.config['VERIFY_CONNECTION_MODE'],
+        credits_fetcher=credits_fetcher,
+        ingestion_pool=ingestion_pool,
+        single_flight=single_flight,
+        advisory_locks=advisory_locks,
+        graph_sql_max_hops=app.config['GRAPH_SQL_MAX_HOPS'],
+        components=components
     )
+    if ingestion_pool is not None:
+        ingestion_pool.ingest = game_service.ingest_actor
+        ingestion_pool.start()
+        atexit.register(ingestion_pool.stop)
 
     # Iniciar controllers
-    tmdb_controller = TMDBController(tmdb_service)
+    tmdb_controller = TMDBController(tmdb_service, actor_search)
     game_controller = GameController(game_service)
 
     # Registrar blueprints (controllers manejan la API)
     app.register_blueprint(tmdb_controller.blueprint, url_prefix='/tmdb')
     app.register_blueprint(game_controller.blueprint, url_prefix='/game')
+    if app.config['METRICS_ENABLED']:
+        metrics.instrumentar_engine(app.engine)
+        MetricsController(app.config['SERVER_TIMING']).register(app)
+
+    # Registrar comandos de consola (flask build-landmarks, ...)
+    graph_commands = GraphCommands(
+        actor_service, movie_service, actor_movie_service,
+        landmarks_path=app.config['LANDMARKS_PATH'],
+        snapshot_path=app.config['GRAPH_SNAPSHOT_PATH'],
+        components_path=app.config['COMPONENTS_PATH']
+    )
+    graph_commands.register(app)
+
+
+def load_landmarks(path):
+    """Carga el índice de landmarks si ya se construyó (flask build-landmarks)."""
+    if not path or not os.path.exists(path):
+        print(f"Sin índice de landmarks en '{path}', ejecute 'flask build-landmarks' para crearlo")
+        return None
+    try:
+        landmarks = LandmarkIndex.cargar(path)
+        print(f"Índice de landmarks cargado: {landmarks.k} landmarks, {landmarks.num_actores} actores")
+        return landmarks
+    except Exception as e:
+        print(f"Error al cargar el índice de landmarks: {str(e)}")
+        return None
+
+
+def load_graph_snapshot(path):
+    """Abre (mmap) el snapshot del grafo si ya se construyó (flask graph-snapshot)."""
+    if not path or not os.path.exists(path):
+        print(f"Sin snapshot del grafo en '{path}', ejecute 'flask graph-snapshot' para crearlo")
+        return None
+    try:
+        return GraphSnapshot(path)
+    except Exception as e:
+        # Versión de formato distinta o archivo dañado: se arranca con el grafo vacío
+        print(f"Error al abrir el snapshot del grafo: {str(e)}")
+        return None
+
+
+def load_components(path, actor_movie_service):
+    """Carga el índice de componentes (flask build-components) y lo pone al día con la DB."""
+    if not path or not os.path.exists(path):
+        print(f"Sin índice de componentes en '{path}', ejecute 'flask build-components' para crearlo")
+        return None
+    try:
+        components = ComponentIndex.cargar(path)
+        nuevos = components.sincronizar(actor_movie_service)
+        estadisticas = components.estadisticas()
+        print(
+            f"Índice de componentes cargado: {estadisticas['actores']} actores en "
+            f"{estadisticas['componentes']} componentes ({nuevos} créditos leídos desde el watermark)"
+        )
+        return components
+    except Exception as e:
+        print(f"Error al cargar el índice de componentes: {str(e)}")
+        return None
+
+
+def save_components(components, path):
+    try:
+        components.guardar(path)
+    except Exception as e:
+        print(f"Error al guardar el índice de componentes: {str(e)}")
 
 
 def conexion_db(app):
@@ -97,6 +310,8 @@ def conexion_db(app):
     # Crear la sesión de la base de datos
     db_session = scoped_session(sessionmaker(bind=engine))
     app.db = db_session
+    # Conexiones fuera de la sesión ORM (advisory locks)
+    app.engine = engine
     
     @app.teardown_appcontext
     def shutdown_session(exception=None):
@@ -0,0 +1,102 @@
+"""
+Latencia del autocompletado local de actores (ActorService.search_actors_by_name)
+sobre la tabla 'actors', como lo usaría el frontend: una consulta por tecla
+con los prefijos de nombres reales y fragmentos del apellido.
+
+Necesita Postgres: carga --actores actores con nombres sintéticos en un
+schema propio (--schema), que se borra al terminar. create_all instala el
+índice por prefijo y, si se puede crear la extensión, el de trigramas
+(pg_trgm). La meta es p99 < 10 ms.
+
+Uso:
+    python -m benchmarks.busqueda_actores --actores 200000 --consultas 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from benchmarks.carga_copy import conectar
+from src.models.database import Base
+from src.services.actors_service import ActorService
+from src.services.copy_bulk_loader import CopyBulkLoader
+
+SILABAS = ('an', 'ber', 'ca', 'del', 'e', 'fa', 'gon', 'har', 'is', 'jo', 'ka', 'lo', 'mar',
+           'na', 'or', 'pe', 'ri', 'sa', 'tom', 'u', 'van', 'wi', 'ya', 'zel')
+
+
+def nombre(rnd):
+    def palabra(minimo, maximo):
+        return ''.join(rnd.choice(SILABAS) for _ in range(rnd.randint(minimo, maximo))).capitalize()
+    return f'{palabra(1, 3)} {palabra(2, 4)}'
+
+
+def consultas(rnd, nombres, n):
+    """Lo que se escribe tecla a tecla: prefijos del nombre o del apellido."""
+    resultado = []
+    while len(resultado) < n:
+        palabra = rnd.choice(rnd.choice(nombres).split())
+        for largo in range(1, min(len(palabra), 8) + 1):
+            resultado.append(palabra[:largo])
+    return resultado[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--actores', type=int, default=200000)
+    parser.add_argument('--consultas', type=int, default=2000)
+    parser.add_argument('--limite', type=int, default=20)
+    parser.add_argument('--schema', default='bench_busqueda_actores')
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+    load_dotenv()
+
+    rnd = random.Random(args.semilla)
+    actores = [
+        {'id': 1000 + i, 'name': nombre(rnd), 'profile_path': None, 'popularity': round(rnd.paretovariate(1.5), 3)}
+        for i in range(args.actores)
+    ]
+
+    engine = create_engine('postgresql://', creator=lambda: conectar(args.schema))
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA {args.schema}'))
+    db_session = scoped_session(sessionmaker(bind=engine))
+    try:
+        Base.metadata.create_all(bind=engine)
+        CopyBulkLoader(db_session).load_actors(actores)
+        db_session.execute(text('ANALYZE actors'))
+        db_session.commit()
+        trigramas = db_session.execute(text(
+            "SELECT 1 FROM pg_indexes WHERE schemaname = :schema AND indexname = 'idx_actors_name_trgm'"
+        ), {'schema': args.schema}).first() is not None
+        print(f"{len(actores)} actores, índice de trigramas: {'sí' if trigramas else 'no (sin pg_trgm)'}")
+
+        servicio = ActorService(db_session)
+        por_largo = {}
+        for consulta in consultas(rnd, [a['name'] for a in actores], args.consultas):
+            inicio = time.perf_counter()
+            servicio.search_actors_by_name(consulta, args.limite)
+            por_largo.setdefault(min(len(consulta), 3), []).append((time.perf_counter() - inicio) * 1000)
+            db_session.rollback()
+
+        todas = sorted(x for latencias in por_largo.values() for x in latencias)
+        for largo, latencias in sorted(por_largo.items()):
+            latencias.sort()
+            etiqueta = f'{largo}+ letras' if largo == 3 else f'{largo} letra' + ('s' if largo > 1 else '')
+            print(f"    {etiqueta:>9}: media {statistics.mean(latencias):6.2f} ms  "
+                  f"p99 {latencias[int(len(latencias) * 0.99) - 1]:6.2f} ms  (n={len(latencias)})")
+        print(f"        total: p50 {todas[len(todas) // 2]:6.2f} ms  p99 {todas[int(len(todas) * 0.99) - 1]:6.2f} ms")
+    finally:
+        db_session.remove()
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Filas por segundo al insertar actores, películas y créditos con los métodos
+*_bulk actuales (INSERT ... VALUES ON CONFLICT) y con CopyBulkLoader (COPY a
+una tabla temporal + un merge ON CONFLICT por tabla).
+
+Necesita Postgres: usa las variables DB_* de la app, pero crea las tablas en
+un schema propio (--schema) que borra al terminar. Cada modo carga el dataset
+dos veces: la primera sobre tablas vacías y la segunda con todo repetido
+(solo conflictos, como una ingesta que se solapa con otra).
+
+Uso:
+    python -m benchmarks.carga_copy --actores 50000 --peliculas 8000
+"""
+import argparse
+import os
+import time
+
+import psycopg2
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from benchmarks.sintetico import generar_dataset
+from src.models.database import Base
+from src.services.actors_service import ActorService
+from src.services.movies_service import MovieService
+from src.services.actor_movie_service import ActorMovieService
+from src.services.copy_bulk_loader import CopyBulkLoader
+
+
+def conectar(schema: str = None):
+    opciones = f'-c search_path={schema}' if schema else ''
+    return psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432'),
+        dbname=os.getenv('DB_NAME', 'movies_db'),
+        user=os.getenv('DB_USER_NAME', 'postgres'),
+        password=os.getenv('DB_PASSWORD', ''),
+        options=opciones
+    )
+
+
+def medir(nombre, fn, filas):
+    inicio = time.perf_counter()
+    fn(filas)
+    segundos = time.perf_counter() - inicio
+    print(f"    {nombre:>14}: {len(filas):7d} filas  {segundos:7.2f}s  {len(filas) / segundos:9.0f} filas/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--actores', type=int, default=50000)
+    parser.add_argument('--peliculas', type=int, default=8000)
+    parser.add_argument('--schema', default='bench_carga_copy')
+    args = parser.parse_args()
+    load_dotenv()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas)
+    engine = create_engine('postgresql://', creator=lambda: conectar(args.schema))
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA {args.schema}'))
+    Base.metadata.create_all(bind=engine)
+    db_session = scoped_session(sessionmaker(bind=engine))
+
+    try:
+        for modo, loader in (('insert', None), ('copy', CopyBulkLoader(db_session))):
+            db_session.execute(text('TRUNCATE actors_movies, actors, movies'))
+            db_session.commit()
+            actor_service = ActorService(db_session, bulk_loader=loader)
+            movie_service = MovieService(db_session, bulk_loader=loader)
+            actor_movie_service = ActorMovieService(db_session, bulk_loader=loader)
+            for ronda in ('vacías', 'repetidas'):
+                print(f"{modo}, tablas {ronda}:")
+                medir('actors', actor_service.create_actors_bulk, actores)
+                medir('movies', movie_service.create_movies_bulk, peliculas)
+                medir('actors_movies', actor_movie_service.add_actor_to_movies_bulk, creditos)
+    finally:
+        db_session.remove()
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
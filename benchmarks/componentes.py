@@ -0,0 +1,66 @@
+"""
+Pares de actores sin ruta: Graphs.bfs_bidireccional (recorre todo el
+componente más chico, cargando cada vértice) contra la consulta al índice
+de componentes (ComponentIndex.conectados), sobre el dataset sintético en
+memoria (ServicioSintetico, sin DB).
+
+Los pares se arman con un actor del componente gigante y otro de un
+componente chico, el peor caso de la búsqueda cuando empieza por el lado
+grande.
+
+Uso:
+    python -m benchmarks.componentes --actores 20000 --peliculas 2000 --pares 10
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico
+from src.models.components import ComponentIndex
+from src.models.graphs import Graphs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--actores', type=int, default=20000)
+    parser.add_argument('--peliculas', type=int, default=2000)
+    parser.add_argument('--pares', type=int, default=10)
+    parser.add_argument('--semilla', type=int, default=7)
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    inicio = time.perf_counter()
+    indice = ComponentIndex.construir(((c['id_movie'], c['id_actor']) for c in creditos), len(creditos))
+    estadisticas = indice.estadisticas()
+    print(f"Índice: {estadisticas['actores']} actores en {estadisticas['componentes']} componentes "
+          f"(mayores {estadisticas['mayores']}), construido en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    con_creditos = [a['id'] for a in actores if indice.tamano_componente(a['id'])]
+    mayor = max(indice.tamano_componente(a) for a in con_creditos)
+    gigante = [a for a in con_creditos if indice.tamano_componente(a) == mayor]
+    chicos = [a for a in con_creditos if indice.tamano_componente(a) < mayor]
+    if not chicos:
+        print("Todos los actores están en un solo componente, pruebe con otra --semilla")
+        return
+
+    rnd = random.Random(args.semilla)
+    pares = [(rnd.choice(gigante), rnd.choice(chicos)) for _ in range(args.pares)]
+    servicio = ServicioSintetico(peliculas, creditos)
+
+    busqueda, consulta = [], []
+    for a, b in pares:
+        inicio = time.perf_counter()
+        assert Graphs(servicio).bfs_bidireccional(a, b) is None
+        busqueda.append((time.perf_counter() - inicio) * 1000)
+
+        inicio = time.perf_counter()
+        assert indice.conectados(a, b) is False
+        consulta.append((time.perf_counter() - inicio) * 1000)
+
+    print(f"bfs_bidireccional: media {statistics.mean(busqueda):9.2f} ms  máx {max(busqueda):9.2f} ms")
+    print(f"           índice: media {statistics.mean(consulta):9.4f} ms  máx {max(consulta):9.4f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Cuenta las consultas a la DB por búsqueda bidireccional sobre un grafo frío.
+
+Con la carga por niveles el número de consultas queda cerca de la
+profundidad de la ruta, en vez de una consulta por vértice expandido.
+
+Con --estrategia balanceada también muestra cuántos vértices expandió cada lado.
+
+Uso:
+    python -m benchmarks.consultas_busqueda --backend csr --estrategia balanceada
+"""
+import argparse
+import random
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico
+from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.bipartite_graphs import BipartiteGraphs
+
+BACKENDS = {'lista': Graphs, 'csr': CSRGraphs, 'bipartito': BipartiteGraphs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=BACKENDS, default='csr')
+    parser.add_argument('--estrategia', choices=('bidireccional', 'balanceada'), default='bidireccional')
+    parser.add_argument('--actores', type=int, default=30000)
+    parser.add_argument('--peliculas', type=int, default=4000)
+    parser.add_argument('--pares', type=int, default=20)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    servicio = ServicioSintetico(peliculas, creditos)
+    rnd = random.Random(args.semilla)
+    ids = [a['id'] for a in actores]
+
+    print(f"{'saltos':>6} {'consultas':>9} {'vértices cargados':>17} {'expandidos A/B':>15}")
+    for _ in range(args.pares):
+        # Grafo frío en cada búsqueda para contar todas las cargas
+        grafo = BACKENDS[args.backend](servicio)
+        servicio.consultas = 0
+        inicio, meta = rnd.choice(ids), rnd.choice(ids)
+        estadisticas = {}
+        if args.estrategia == 'balanceada':
+            ruta = grafo.bfs_bidireccional_balanceada(inicio, meta, estadisticas)
+            expandidos = f"{estadisticas['expandidos_a']}/{estadisticas['expandidos_b']}"
+        else:
+            ruta = grafo.bfs_bidireccional(inicio, meta)
+            expandidos = '-'
+        saltos = len(ruta) if ruta else '-'
+        print(f"{saltos:>6} {servicio.consultas:>9} {len(grafo.loaded_vertices):>17} {expandidos:>15}")
+
+
+if __name__ == '__main__':
+    main()
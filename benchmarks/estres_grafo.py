@@ -0,0 +1,120 @@
+"""
+Prueba de estrés del grafo compartido: muchas búsquedas en paralelo sobre la
+misma instancia, como ocurre con los hilos de Flask.
+
+Verifica que:
+- ningún hilo falle ni obtenga una ruta distinta (en largo) a la de referencia
+- sin presupuesto de memoria, cada vértice se consulte a la DB una sola vez
+  (las cargas concurrentes del mismo vértice se comparten)
+
+Uso:
+    python -m benchmarks.estres_grafo --backend csr --hilos 16 --max-vertices 200
+"""
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico
+from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.bipartite_graphs import BipartiteGraphs
+
+BACKENDS = {'lista': Graphs, 'csr': CSRGraphs, 'bipartito': BipartiteGraphs}
+
+
+class ServicioConLatencia(ServicioSintetico):
+    """Agrega latencia a cada consulta y cuenta cuántas veces se cargó cada actor."""
+    def __init__(self, peliculas, creditos, latencia):
+        super().__init__(peliculas, creditos)
+        self.latencia = latencia
+        self.cargas = Counter()
+        self._lock = threading.Lock()
+
+    def _registrar(self, ids):
+        with self._lock:
+            self.cargas.update(list(ids))
+        time.sleep(self.latencia)
+
+    def get_all_actors_asociated_with_one(self, id_actor):
+        self._registrar([id_actor])
+        return super().get_all_actors_asociated_with_one(id_actor)
+
+    def get_all_actors_asociated_with_many(self, ids_actors):
+        self._registrar(ids_actors)
+        return super().get_all_actors_asociated_with_many(ids_actors)
+
+    def get_credits_of_actor_movies(self, id_actor):
+        self._registrar([id_actor])
+        return super().get_credits_of_actor_movies(id_actor)
+
+    def get_credits_of_many_actors_movies(self, ids_actors):
+        self._registrar(ids_actors)
+        return super().get_credits_of_many_actors_movies(ids_actors)
+
+    def get_cast_of_many_movies(self, movie_ids):
+        self._registrar(-m for m in movie_ids)
+        return super().get_cast_of_many_movies(movie_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=BACKENDS, default='csr')
+    parser.add_argument('--hilos', type=int, default=16)
+    parser.add_argument('--busquedas', type=int, default=400)
+    parser.add_argument('--max-vertices', type=int, default=0, help='0 = sin límite')
+    parser.add_argument('--latencia', type=float, default=0.002, help='segundos por consulta')
+    parser.add_argument('--actores', type=int, default=20000)
+    parser.add_argument('--peliculas', type=int, default=3000)
+    parser.add_argument('--semilla', type=int, default=7)
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    rnd = random.Random(args.semilla)
+    ids = [a['id'] for a in actores]
+    # Pocos actores distintos para forzar que varios hilos expandan los mismos vértices
+    candidatos = rnd.sample(ids, 60)
+    pares = [(rnd.choice(candidatos), rnd.choice(candidatos)) for _ in range(args.busquedas)]
+
+    # Referencia secuencial
+    referencia = BACKENDS[args.backend](ServicioSintetico(peliculas, creditos))
+    esperado = {}
+    for a, b in set(pares):
+        ruta = referencia.bfs_bidireccional_balanceada(a, b)
+        esperado[(a, b)] = len(ruta) if ruta else None
+
+    servicio = ServicioConLatencia(peliculas, creditos, args.latencia)
+    grafo = BACKENDS[args.backend](servicio, max_vertices=args.max_vertices or None)
+
+    def buscar(i):
+        a, b = pares[i]
+        # Se alternan las dos estrategias para mezclar patrones de acceso
+        if i % 2:
+            ruta = grafo.bfs_bidireccional_balanceada(a, b)
+            largo = len(ruta) if ruta else None
+            assert largo == esperado[(a, b)], (a, b, largo, esperado[(a, b)])
+        else:
+            ruta = grafo.bfs_bidireccional(a, b)
+            assert (ruta is None) == (esperado[(a, b)] is None), (a, b)
+        if ruta:
+            assert ruta[0][0] == a and ruta[-1][2] == b, (a, b)
+            assert all(x[2] == y[0] for x, y in zip(ruta, ruta[1:])), (a, b)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.hilos) as executor:
+        list(executor.map(buscar, range(len(pares))))
+    segundos = time.perf_counter() - inicio
+
+    repetidas = sum(n - 1 for n in servicio.cargas.values() if n > 1)
+    print(f"{len(pares)} búsquedas con {args.hilos} hilos en {segundos:.2f}s")
+    print(f"vértices cargados: {len(servicio.cargas)}, cargas repetidas: {repetidas}")
+    print(f"caché: {grafo.estadisticas_cache()}")
+    if not args.max_vertices:
+        assert repetidas == 0, "sin presupuesto ningún vértice debería cargarse dos veces"
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
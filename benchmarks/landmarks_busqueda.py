@@ -0,0 +1,93 @@
+"""
+Compara BFS (unidireccional y bidireccional balanceada) contra A* guiado por
+landmarks: vértices expandidos, consultas a la DB y exactitud de las rutas.
+
+Uso:
+    python -m benchmarks.landmarks_busqueda --backend csr --landmarks 16
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico
+from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.bipartite_graphs import BipartiteGraphs
+from src.models.landmarks import LandmarkIndex
+
+BACKENDS = {'lista': Graphs, 'csr': CSRGraphs, 'bipartito': BipartiteGraphs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=BACKENDS, default='csr')
+    parser.add_argument('--landmarks', type=int, default=16)
+    parser.add_argument('--pares', type=int, default=30)
+    parser.add_argument('--actores', type=int, default=20000)
+    parser.add_argument('--peliculas', type=int, default=3000)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    print(f"Dataset: {len(actores)} actores, {len(peliculas)} películas, {len(creditos)} créditos")
+
+    # 1. Construcción offline (misma entrada que 'flask build-landmarks')
+    inicio = time.perf_counter()
+    candidatos = [a['id'] for a in sorted(actores, key=lambda a: a['popularity'], reverse=True)]
+    indice = LandmarkIndex.construir(
+        ((c['id_movie'], c['id_actor'], c['order']) for c in creditos),
+        candidatos, args.landmarks
+    )
+    segundos = time.perf_counter() - inicio
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'landmarks.bin')
+        indice.guardar(ruta)
+        tamano = os.path.getsize(ruta)
+        indice = LandmarkIndex.cargar(ruta)
+    print(f"Índice: {indice.k} landmarks, {indice.num_actores} actores, "
+          f"{tamano / 2**20:.2f} MiB, construido en {segundos:.2f}s")
+
+    rnd = random.Random(args.semilla)
+    ids = list(indice.ids)
+    pares = [tuple(rnd.sample(ids, 2)) for _ in range(args.pares)]
+
+    # 2. Cada búsqueda con un grafo vacío: se cuentan los vértices que tuvo que cargar
+    estrategias = {
+        'bfs': lambda grafo, a, b: grafo.bfs(a, b),
+        'balanceada': lambda grafo, a, b: grafo.bfs_bidireccional_balanceada(a, b),
+        'a_estrella': lambda grafo, a, b: grafo.a_estrella(a, b, indice),
+    }
+    cargados = {}
+    largos = {}
+    for nombre, buscar in estrategias.items():
+        servicio = ServicioSintetico(peliculas, creditos)
+        cargados[nombre] = 0
+        inicio = time.perf_counter()
+        for a, b in pares:
+            grafo = BACKENDS[args.backend](servicio)
+            ruta = buscar(grafo, a, b)
+            cargados[nombre] += grafo.cache_misses
+            largos.setdefault(nombre, []).append(len(ruta) if ruta else None)
+        segundos = time.perf_counter() - inicio
+        print(f"{nombre:>10}: {cargados[nombre]:8d} vértices cargados  "
+              f"{servicio.consultas:6d} consultas  {segundos:6.2f}s")
+
+    # 3. Las tres búsquedas son exactas y el índice acota la distancia real
+    for (a, b), largo, largo_a, largo_bi in zip(pares, largos['bfs'], largos['a_estrella'], largos['balanceada']):
+        assert largo == largo_a == largo_bi, (a, b, largo, largo_a, largo_bi)
+        if largo is None:
+            continue
+        cotas = indice.estimar(a, b)
+        assert cotas['inferior'] <= largo <= cotas['superior'], (a, b, largo, cotas)
+    print("Rutas de A* y de la balanceada iguales al BFS; cotas inferior y superior OK")
+
+    for nombre in ('bfs', 'balanceada'):
+        proporcion = cargados['a_estrella'] / max(cargados[nombre], 1)
+        print(f"A* carga {proporcion:.2f}x los vértices de {nombre}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Compara la memoria del grafo en lista de adyacencia contra los grafos CSR y bipartito.
+
+Uso:
+    python -m benchmarks.memoria_grafos --actores 3000 --peliculas 1500
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico
+from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.bipartite_graphs import BipartiteGraphs
+
+
+def medir(clase_grafo, servicio, actores):
+    """Expande todos los actores y retorna (bytes, segundos, grafo)."""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+
+    grafo = clase_grafo(servicio)
+    for actor in actores:
+        grafo.expandir_vertice(actor['id'])
+
+    segundos = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memoria, segundos, grafo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--actores', type=int, default=3000)
+    parser.add_argument('--peliculas', type=int, default=1500)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    servicio = ServicioSintetico(peliculas, creditos)
+    print(f"Dataset: {len(actores)} actores, {len(peliculas)} películas, {len(creditos)} créditos")
+
+    resultados = {}
+    for nombre, clase in (('lista', Graphs), ('csr', CSRGraphs), ('bipartito', BipartiteGraphs)):
+        memoria, segundos, grafo = medir(clase, servicio, actores)
+        resultados[nombre] = (memoria, grafo)
+        print(f"{nombre:>6}: {memoria / 2**20:8.1f} MiB  carga {segundos:6.2f}s  ({grafo.num_vertices} vértices)")
+
+    # Ambos grafos deben encontrar (o no) ruta para los mismos pares. El largo
+    # puede variar: bfs_bidireccional corta a mitad de nivel y el orden de los
+    # vecinos no es el mismo en las dos estructuras.
+    ids = [a['id'] for a in actores]
+    for a, b in zip(ids[:50], reversed(ids[-50:])):
+        ruta_lista = resultados['lista'][1].bfs_bidireccional(a, b)
+        for nombre in ('csr', 'bipartito'):
+            ruta = resultados[nombre][1].bfs_bidireccional(a, b)
+            assert (ruta_lista is None) == (ruta is None), (nombre, a, b)
+            if ruta:
+                assert ruta[0][0] == a and ruta[-1][2] == b, (nombre, a, b)
+                assert all(x[2] == y[0] for x, y in zip(ruta, ruta[1:])), (nombre, a, b)
+
+    for nombre in ('csr', 'bipartito'):
+        ahorro = 1 - resultados[nombre][0] / resultados['lista'][0]
+        print(f"Ahorro de memoria {nombre}: {ahorro:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Latencia y memoria de la búsqueda en el proceso (Graphs / CSRGraphs, que
+cargan vértices desde la DB) contra SQLGraphs (búsqueda dentro de Postgres
+con costar_shortest_path) para varios tamaños de grafo.
+
+Necesita Postgres: por cada tamaño carga un dataset sintético en un schema
+propio (--schema), que se borra al terminar. La memoria es la del proceso
+(tracemalloc) después de todas las búsquedas; la de SQLGraphs queda del lado
+de Postgres (tablas temporales de la conexión).
+
+Uso:
+    python -m benchmarks.motor_sql --tamanos 5000 20000 50000 --pares 30
+"""
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from benchmarks.carga_copy import conectar
+from benchmarks.sintetico import generar_dataset
+from src.models.database import Base
+from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.sql_graphs import SQLGraphs
+from src.services.actor_movie_service import ActorMovieService
+from src.services.copy_bulk_loader import CopyBulkLoader
+
+MOTORES = (('lista', Graphs), ('csr', CSRGraphs), ('sql', SQLGraphs))
+
+
+def medir(clase_grafo, servicio, pares):
+    """Resuelve todos los pares con un grafo nuevo; retorna (latencias ms, bytes, largos de ruta)."""
+    gc.collect()
+    tracemalloc.start()
+    grafo = clase_grafo(servicio)
+    latencias, largos = [], []
+    for a, b in pares:
+        inicio = time.perf_counter()
+        ruta = grafo.bfs_bidireccional(a, b)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        largos.append(len(ruta) if ruta else None)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latencias, memoria, largos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[5000, 20000, 50000], help='actores por dataset')
+    parser.add_argument('--pares', type=int, default=30)
+    parser.add_argument('--schema', default='bench_motor_sql')
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+    load_dotenv()
+
+    engine = create_engine('postgresql://', creator=lambda: conectar(args.schema))
+    db_session = scoped_session(sessionmaker(bind=engine))
+    try:
+        for actores_n in args.tamanos:
+            with engine.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+                conn.execute(text(f'CREATE SCHEMA {args.schema}'))
+            # También instala costar_shortest_path en el schema
+            Base.metadata.create_all(bind=engine)
+
+            actores, peliculas, creditos = generar_dataset(actores_n, actores_n // 6, args.semilla)
+            loader = CopyBulkLoader(db_session)
+            loader.load_actors(actores)
+            loader.load_movies(peliculas)
+            loader.load_actor_movies(creditos)
+            db_session.execute(text('ANALYZE'))
+            db_session.commit()
+
+            rnd = random.Random(args.semilla)
+            ids = [a['id'] for a in actores]
+            pares = [tuple(rnd.sample(ids, 2)) for _ in range(args.pares)]
+            print(f"{actores_n} actores, {len(peliculas)} películas, {len(creditos)} créditos:")
+
+            largos_referencia = None
+            for nombre, clase in MOTORES:
+                latencias, memoria, largos = medir(clase, ActorMovieService(db_session), pares)
+                db_session.rollback()
+                p95 = sorted(latencias)[int(len(latencias) * 0.95) - 1]
+                print(f"    {nombre:>5}: media {statistics.mean(latencias):8.1f} ms  p95 {p95:8.1f} ms  "
+                      f"memoria {memoria / 2**20:7.1f} MiB")
+                # Las rutas pueden ser distintas, pero la existencia y el largo mínimo deben coincidir
+                # (bfs_bidireccional alterna lados y puede cortar con una ruta un salto más larga)
+                if largos_referencia is None:
+                    largos_referencia = largos
+                else:
+                    for esperado, largo in zip(largos_referencia, largos):
+                        assert (esperado is None) == (largo is None), (nombre, esperado, largo)
+    finally:
+        db_session.remove()
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
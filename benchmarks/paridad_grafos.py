@@ -0,0 +1,176 @@
+"""
+Paridad entre backends del grafo sobre el dataset sintético.
+
+Calcula la distancia real de cada par con un BFS sobre los créditos (dos
+actores son co-protagonistas si comparten una película donde al menos uno
+tiene order <= 50) y la compara con la ruta de cada backend y algoritmo.
+Una ruta es correcta si tiene ese largo y cada salto es una arista real.
+También verifica las cotas del índice de landmarks que usa A*.
+
+Sale con código 1 si algún backend difiere.
+
+Uso:
+    python -m benchmarks.paridad_grafos --actores 1200 --peliculas 400 --semilla 11
+    python -m benchmarks.paridad_grafos --max-vertices 100
+    python -m benchmarks.paridad_grafos --actores 3000 --peliculas 600 --algoritmos bfs_bidireccional_balanceada a_estrella
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict, deque
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico, ORDER_THRESHOLD
+from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.bipartite_graphs import BipartiteGraphs
+from src.models.graph_snapshot import GraphSnapshot
+from src.models.landmarks import LandmarkIndex
+
+ALGORITMOS = ('bfs', 'bfs_bidireccional', 'bfs_bidireccional_balanceada', 'a_estrella')
+
+
+class Referencia:
+    """Grafo de co-protagonistas completo, armado directo desde los créditos."""
+    def __init__(self, creditos):
+        self.peliculas_por_actor = defaultdict(list)
+        self.reparto = defaultdict(set)
+        self.principal = defaultdict(set)
+        for c in creditos:
+            self.peliculas_por_actor[c['id_actor']].append(c['id_movie'])
+            self.reparto[c['id_movie']].add(c['id_actor'])
+            if c['order'] <= ORDER_THRESHOLD:
+                self.principal[c['id_movie']].add(c['id_actor'])
+
+    def es_arista(self, a, b, movie_id) -> bool:
+        reparto = self.reparto.get(movie_id, ())
+        return a != b and a in reparto and b in reparto and (
+            a in self.principal[movie_id] or b in self.principal[movie_id]
+        )
+
+    def vecinos(self, a):
+        for m in self.peliculas_por_actor.get(a, ()):
+            yield from (self.reparto[m] if a in self.principal[m] else self.principal[m])
+
+    def distancia(self, inicio, meta):
+        if inicio == meta:
+            return 0
+        distancia = {inicio: 0}
+        cola = deque([inicio])
+        while cola:
+            u = cola.popleft()
+            for v in self.vecinos(u):
+                if v not in distancia:
+                    distancia[v] = distancia[u] + 1
+                    if v == meta:
+                        return distancia[v]
+                    cola.append(v)
+        return None
+
+
+def saltos(ruta):
+    """Normaliza las rutas de bfs (dicts) y de las bidireccionales (tuplas) a (a, movie_id, b)."""
+    if ruta is None:
+        return None
+    normalizada = []
+    for salto in ruta:
+        if isinstance(salto, dict):
+            salto = (salto['anterior'], salto['attr'], salto['actual'])
+        a, attr, b = salto
+        if attr is not None:
+            normalizada.append((a, attr['movie_id'], b))
+    return normalizada
+
+
+def verificar(referencia, ruta, inicio, meta, esperada):
+    """Retorna None si la ruta es correcta, o la descripción del error."""
+    pasos = saltos(ruta)
+    if pasos is None:
+        return None if esperada is None else f"sin ruta (distancia real {esperada})"
+    if esperada is None:
+        return f"ruta de {len(pasos)} saltos entre actores desconectados"
+    if len(pasos) != esperada:
+        return f"{len(pasos)} saltos (distancia real {esperada})"
+    actual = inicio
+    for a, movie_id, b in pasos:
+        if a != actual or not referencia.es_arista(a, b, movie_id):
+            return f"salto inexistente {a} -> {b} (película {movie_id})"
+        actual = b
+    if actual != meta:
+        return f"la ruta termina en {actual}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--busquedas', type=int, default=300)
+    parser.add_argument('--algoritmos', nargs='+', choices=ALGORITMOS, default=list(ALGORITMOS))
+    parser.add_argument('--landmarks', type=int, default=8)
+    parser.add_argument('--max-vertices', type=int, default=0, help='0 = sin límite')
+    parser.add_argument('--actores', type=int, default=1200)
+    parser.add_argument('--peliculas', type=int, default=400)
+    parser.add_argument('--semilla', type=int, default=11)
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    referencia = Referencia(creditos)
+    rnd = random.Random(args.semilla)
+    ids = [a['id'] for a in actores if a['id'] in referencia.peliculas_por_actor]
+    pares = [tuple(rnd.sample(ids, 2)) for _ in range(args.busquedas)]
+    distancias = [referencia.distancia(a, b) for a, b in pares]
+    max_vertices = args.max_vertices or None
+    print(f"Dataset: {len(ids)} actores con créditos, {len(creditos)} créditos, {len(pares)} pares")
+
+    candidatos = [a['id'] for a in sorted(actores, key=lambda a: a['popularity'], reverse=True)]
+    indice = LandmarkIndex.construir(
+        ((c['id_movie'], c['id_actor'], c['order']) for c in creditos), candidatos, args.landmarks
+    )
+    errores = 0
+    for (a, b), esperada in zip(pares, distancias):
+        cotas = indice.estimar(a, b)
+        if esperada is None:
+            continue
+        if not cotas['inferior'] <= esperada <= cotas['superior']:
+            errores += 1
+            print(f"Landmarks: {a} -> {b} distancia real {esperada}, cotas {cotas}")
+    print(f"{'landmarks':>13} {'estimar':<29} {errores:4d} errores")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'graph_snapshot.bin')
+        GraphSnapshot.construir(
+            ((p['id'], p['title'], p['poster_path'], p['release_date']) for p in peliculas),
+            ((c['id_movie'], c['id_actor'], c['order']) for c in creditos),
+            watermark=len(creditos), ruta=ruta
+        )
+        snapshot = GraphSnapshot(ruta)
+        backends = {
+            'lista': lambda s: Graphs(s, max_vertices=max_vertices),
+            'csr': lambda s: CSRGraphs(s, max_vertices=max_vertices),
+            'csr+snapshot': lambda s: CSRGraphs(s, max_vertices=max_vertices, snapshot=snapshot),
+            'bipartito': lambda s: BipartiteGraphs(s, max_vertices=max_vertices),
+        }
+
+        for nombre, crear in backends.items():
+            for algoritmo in args.algoritmos:
+                # Un grafo por algoritmo, compartido por todos los pares (como en la app)
+                grafo = crear(ServicioSintetico(peliculas, creditos))
+                buscar = getattr(grafo, algoritmo)
+                if algoritmo == 'a_estrella':
+                    buscar = lambda a, b, buscar=buscar: buscar(a, b, indice)
+                fallas = []
+                for (a, b), esperada in zip(pares, distancias):
+                    error = verificar(referencia, buscar(a, b), a, b, esperada)
+                    if error:
+                        fallas.append(f"{a} -> {b}: {error}")
+                errores += len(fallas)
+                print(f"{nombre:>13} {algoritmo:<29} {len(fallas):4d} errores")
+                for falla in fallas[:3]:
+                    print(f"{'':>14} {falla}")
+        snapshot.cerrar()
+
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Varias ingestas concurrentes cuyas filmografías se solapan (el caso de dos
+requests que piden actores del mismo elenco) contra el servidor TMDB falso:
+cuántas descargas de créditos llegan a TMDB sin deduplicar y con
+SingleFlight por película, como en GameService.__add_cast_deduplicated__.
+
+Solo mide la parte en el proceso; los advisory locks necesitan Postgres.
+
+Uso:
+    python -m benchmarks.single_flight --ingestas 8 --peliculas 60 --solapamiento 0.7
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.tmdb_falso import ServidorTMDBFalso
+from src.services.rate_limiter import AdaptiveRateLimiter
+from src.services.single_flight import SingleFlight
+from src.services.tmdb_service import TMDBService
+
+
+def filmografias(ingestas: int, peliculas: int, solapamiento: float, semilla: int = 7):
+    """Cada ingesta toma 'solapamiento' de sus películas de un conjunto común y el resto propias."""
+    rnd = random.Random(semilla)
+    comunes = list(range(600000, 600000 + peliculas))
+    resultado = []
+    for i in range(ingestas):
+        compartidas = rnd.sample(comunes, int(peliculas * solapamiento))
+        propias = list(range(700000 + i * peliculas, 700000 + i * peliculas + peliculas - len(compartidas)))
+        resultado.append(compartidas + propias)
+    return resultado
+
+
+def sin_deduplicar(tmdb: TMDBService, movie_ids):
+    for mid in movie_ids:
+        tmdb.get_movie_credits(mid)
+
+
+def deduplicado(tmdb: TMDBService, single_flight: SingleFlight, movie_ids):
+    leading, following = single_flight.lead_many('movie', movie_ids)
+    try:
+        for mid in leading:
+            tmdb.get_movie_credits(mid)
+    finally:
+        single_flight.resolve_many('movie', leading)
+    for call in following.values():
+        call.wait()
+    single_flight.count('movie', 'avoided', len(following))
+
+
+def medir(nombre, servidor, listas, ingesta):
+    servidor.requests = 0
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(listas)) as executor:
+        list(executor.map(ingesta, listas))
+    segundos = time.perf_counter() - inicio
+    pedidas = sum(len(lista) for lista in listas)
+    print(f"{nombre:>14}: {segundos:6.2f}s  {pedidas:5d} películas pedidas  "
+          f"{servidor.requests:5d} requests a TMDB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ingestas', type=int, default=8)
+    parser.add_argument('--peliculas', type=int, default=60, help='películas por ingesta')
+    parser.add_argument('--solapamiento', type=float, default=0.7, help='fracción de películas compartidas')
+    parser.add_argument('--latencia', type=float, default=0.02)
+    args = parser.parse_args()
+
+    servidor = ServidorTMDBFalso(args.latencia).iniciar()
+    listas = filmografias(args.ingestas, args.peliculas, args.solapamiento)
+    try:
+        tmdb = TMDBService(api_key='falsa', base_url=servidor.url, limiter=AdaptiveRateLimiter(1e6, 1e6))
+        medir('sin deduplicar', servidor, listas, lambda ids: sin_deduplicar(tmdb, ids))
+        single_flight = SingleFlight()
+        medir('single-flight', servidor, listas, lambda ids: deduplicado(tmdb, single_flight, ids))
+        tmdb.close()
+        print(f"single-flight: {single_flight.get_stats()}")
+    finally:
+        servidor.detener()
+
+
+if __name__ == '__main__':
+    main()
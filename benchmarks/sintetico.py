@@ -0,0 +1,144 @@
+"""
+Datos sintéticos de actores y películas para los benchmarks.
+
+El tamaño de los repartos sigue una ley de potencias (muchas películas con
+repartos chicos y pocas con repartos enormes), igual que en TMDB, y cada
+actor aparece en películas elegidas con preferencia por actores populares.
+Todo es determinista a partir de la semilla.
+"""
+import random
+from collections import defaultdict
+
+MAX_CAST = 80  # Mismo tope que TMDBService.get_movie_credits
+ORDER_THRESHOLD = 50
+
+
+def generar_dataset(n_actores: int, n_peliculas: int, semilla: int = 42, alfa: float = 2.1):
+    """
+    Genera (actores, peliculas, creditos) en el formato de las tablas
+    'actors', 'movies' y 'actors_movies'.
+    """
+    rnd = random.Random(semilla)
+
+    actores = [
+        {
+            'id': 1000 + i,
+            'name': f'Actor {i}',
+            'profile_path': None,
+            # Popularidad tipo Pareto: unos pocos actores muy conocidos
+            'popularity': round(rnd.paretovariate(1.5), 3)
+        }
+        for i in range(n_actores)
+    ]
+    pesos = [a['popularity'] for a in actores]
+
+    peliculas = []
+    creditos = []
+    for j in range(n_peliculas):
+        movie_id = 500000 + j
+        anio = 1950 + rnd.randrange(75)
+        peliculas.append({
+            'id': movie_id,
+            'title': f'Movie {j}',
+            'release_date': f'{anio}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}',
+            'poster_path': f'/poster_{j}.jpg',
+            'vote_average': round(rnd.uniform(3, 9), 1)
+        })
+
+        # Tamaño del reparto con cola pesada, acotado como en TMDB
+        tamano = min(MAX_CAST, max(2, int(rnd.paretovariate(alfa - 1) * 4)))
+        reparto = set()
+        while len(reparto) < min(tamano, n_actores):
+            reparto.add(rnd.choices(actores, weights=pesos)[0]['id'])
+
+        for order, actor_id in enumerate(reparto):
+            creditos.append({
+                'id_actor': actor_id,
+                'id_movie': movie_id,
+                'character': f'Character {order}',
+                'order': order
+            })
+
+    return actores, peliculas, creditos
+
+
+class ServicioSintetico:
+    """
+    Reemplazo en memoria de ActorMovieService para los benchmarks de grafos.
+    Reproduce la semántica de get_all_actors_asociated_with_one: un vecino por
+    co-protagonista (order <= 50 en al menos uno de los dos) y la película
+    compartida más reciente.
+    """
+    def __init__(self, peliculas, creditos):
+        self.peliculas = {p['id']: p for p in peliculas}
+        self.peliculas_por_actor = defaultdict(list)
+        self.reparto_por_pelicula = defaultdict(list)
+        for c in creditos:
+            self.agregar_credito(c)
+        self.consultas = 0
+
+    def agregar_credito(self, credito: dict):
+        """Simula una inserción en 'actors_movies'."""
+        self.peliculas_por_actor[credito['id_actor']].append(credito['id_movie'])
+        self.reparto_por_pelicula[credito['id_movie']].append(credito)
+
+    def get_all_actors_asociated_with_one(self, id_actor: int) -> list:
+        self.consultas += 1
+        return self._aristas(id_actor)
+
+    def get_all_actors_asociated_with_many(self, ids_actors) -> list:
+        self.consultas += 1
+        return [edge for id_actor in ids_actors for edge in self._aristas(id_actor)]
+
+    def get_credits_of_actor_movies(self, id_actor: int) -> list:
+        self.consultas += 1
+        return self._creditos(id_actor)
+
+    def get_credits_of_many_actors_movies(self, ids_actors) -> list:
+        self.consultas += 1
+        return [(id_actor,) + c for id_actor in ids_actors for c in self._creditos(id_actor)]
+
+    def get_cast_of_many_movies(self, movie_ids) -> list:
+        self.consultas += 1
+        credits = []
+        for movie_id in movie_ids:
+            p = self.peliculas[movie_id]
+            attr = {'movie_id': p['id'], 'movie_title': p['title'], 'poster_path': p['poster_path']}
+            for c in sorted(self.reparto_por_pelicula[movie_id], key=lambda c: c['order']):
+                credits.append((movie_id, c['id_actor'], attr, c['order'] <= ORDER_THRESHOLD))
+        return credits
+
+    def get_actor_ids_by_movies(self, movie_ids) -> list:
+        self.consultas += 1
+        return list({c['id_actor'] for m in movie_ids for c in self.reparto_por_pelicula[m]})
+
+    def _aristas(self, id_actor: int) -> list:
+        mejor = {}
+        for movie_id in self.peliculas_por_actor.get(id_actor, []):
+            pelicula = self.peliculas[movie_id]
+            reparto = self.reparto_por_pelicula[movie_id]
+            principal = any(c['id_actor'] == id_actor and c['order'] <= ORDER_THRESHOLD for c in reparto)
+            for c in reparto:
+                co_actor = c['id_actor']
+                if co_actor == id_actor or (c['order'] > ORDER_THRESHOLD and not principal):
+                    continue
+                actual = mejor.get(co_actor)
+                if actual is None or pelicula['release_date'] > actual['release_date']:
+                    mejor[co_actor] = pelicula
+
+        return [
+            (id_actor, co_actor, {'movie_id': p['id'], 'movie_title': p['title'], 'poster_path': p['poster_path']})
+            for co_actor, p in mejor.items()
+        ]
+
+    def _creditos(self, id_actor: int) -> list:
+        peliculas = sorted(
+            (self.peliculas[m] for m in self.peliculas_por_actor.get(id_actor, [])),
+            key=lambda p: (p['release_date'], -p['id']), reverse=True
+        )
+        credits = []
+        for p in peliculas:
+            attr = {'movie_id': p['id'], 'movie_title': p['title'], 'poster_path': p['poster_path']}
+            for c in sorted(self.reparto_por_pelicula[p['id']], key=lambda c: c['order']):
+                credits.append((p['id'], c['id_actor'], attr, c['order'] <= ORDER_THRESHOLD))
+        return credits
@@ -0,0 +1,98 @@
+"""
+Arranque en frío contra arranque con snapshot mmap del grafo.
+
+Construye el snapshot desde el dataset sintético (lo mismo que hace
+'flask graph-snapshot' con la DB), mide cuánto tarda en abrirse y compara
+las primeras búsquedas de un grafo vacío contra uno respaldado por el
+snapshot. Al final inserta un crédito nuevo y verifica que se lea desde la
+"DB" por encima del snapshot.
+
+Uso:
+    python -m benchmarks.snapshot_grafo --backend csr --actores 20000 --peliculas 3000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico
+from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.graph_snapshot import GraphSnapshot
+
+BACKENDS = {'lista': Graphs, 'csr': CSRGraphs}
+
+
+def buscar_todos(grafo, pares):
+    inicio = time.perf_counter()
+    largos = []
+    for a, b in pares:
+        ruta = grafo.bfs_bidireccional_balanceada(a, b)
+        largos.append(len(ruta) if ruta else None)
+    return largos, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=BACKENDS, default='csr')
+    parser.add_argument('--busquedas', type=int, default=50)
+    parser.add_argument('--actores', type=int, default=20000)
+    parser.add_argument('--peliculas', type=int, default=3000)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    print(f"Dataset: {len(actores)} actores, {len(peliculas)} películas, {len(creditos)} créditos")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'graph_snapshot.bin')
+        inicio = time.perf_counter()
+        vertices, aristas = GraphSnapshot.construir(
+            ((p['id'], p['title'], p['poster_path'], p['release_date']) for p in peliculas),
+            ((c['id_movie'], c['id_actor'], c['order']) for c in creditos),
+            watermark=len(creditos), ruta=ruta
+        )
+        print(f"Snapshot: {vertices} vértices, {aristas} aristas, "
+              f"{os.path.getsize(ruta) / 2**20:.1f} MiB, construido en {time.perf_counter() - inicio:.2f}s")
+
+        inicio = time.perf_counter()
+        snapshot = GraphSnapshot(ruta)
+        print(f"Apertura (mmap): {(time.perf_counter() - inicio) * 1000:.2f} ms")
+
+        # 1. Mismos vecinos que la consulta a la DB
+        servicio = ServicioSintetico(peliculas, creditos)
+        rnd = random.Random(args.semilla)
+        for actor in rnd.sample(actores, 200):
+            esperado = {v for _, v, _ in servicio._aristas(actor['id'])}
+            assert {v for v, _ in snapshot.vecinos(actor['id'])} == esperado, actor['id']
+
+        # 2. Primeras búsquedas después de un reinicio
+        ids = [a['id'] for a in actores]
+        pares = [tuple(rnd.sample(ids, 2)) for _ in range(args.busquedas)]
+
+        frio = ServicioSintetico(peliculas, creditos)
+        largos_frio, segundos_frio = buscar_todos(BACKENDS[args.backend](frio), pares)
+        tibio = ServicioSintetico(peliculas, creditos)
+        grafo = BACKENDS[args.backend](tibio, snapshot=snapshot)
+        largos_tibio, segundos_tibio = buscar_todos(grafo, pares)
+        assert largos_frio == largos_tibio
+        print(f"   vacío: {frio.consultas:5d} consultas  {segundos_frio:6.2f}s")
+        print(f"snapshot: {tibio.consultas:5d} consultas  {segundos_tibio:6.2f}s")
+
+        # 3. Un crédito posterior al snapshot se lee desde la DB, encima del snapshot
+        actor_a, actor_b = pares[0]
+        nuevo = {'id_actor': actor_b, 'id_movie': peliculas[0]['id'], 'character': 'Nuevo', 'order': 0}
+        reparto = [c['id_actor'] for c in tibio.reparto_por_pelicula[nuevo['id_movie']] if c['order'] <= 50]
+        tibio.agregar_credito(nuevo)
+        grafo.invalidar_creditos([nuevo])
+        for actor_id in reparto:
+            grafo.expandir_vertice(actor_id)
+            assert actor_b in {v for v, _ in grafo.obtener_vecinos(actor_id)}, actor_id
+        print(f"Crédito nuevo visible para {len(reparto)} co-protagonistas; caché: {grafo.estadisticas_cache()}")
+
+        snapshot.cerrar()
+
+
+if __name__ == '__main__':
+    main()
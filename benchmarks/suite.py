@@ -0,0 +1,256 @@
+"""
+Suite de benchmarks de los caminos calientes, sin red: un dataset sintético
+(repartos con ley de potencias, ver sintetico.py) cargado en las tablas
+'actors', 'movies' y 'actors_movies', y el servidor TMDB falso (latencia y
+429 configurables) para la ingesta.
+
+Casos:
+    expandir       ActorMovieService.get_all_actors_asociated_with_one
+    bfs            Graphs.bfs con el grafo frío en cada par
+    bidireccional  Graphs.bfs_bidireccional con el grafo frío en cada par
+    ingesta        GameService.__add_movies_and_cast__ contra el TMDB falso
+
+Todo sale de --semilla, así dos corridas con los mismos argumentos miden lo
+mismo. Los resultados se escriben en JSON (--salida) con el commit actual;
+--comparar muestra la diferencia contra otra corrida.
+
+Necesita Postgres (variables DB_* de la app): cada corrida usa un schema
+propio (--schema) que se borra al terminar. Con --sin-db los casos de grafo
+corren sobre ServicioSintetico en memoria y la ingesta se omite.
+
+Uso:
+    python -m benchmarks.suite --salida bench.json
+    python -m benchmarks.suite --salida nuevo.json --comparar bench.json
+    python -m benchmarks.suite --sin-db --casos bfs bidireccional
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from benchmarks.sintetico import generar_dataset, ServicioSintetico
+from benchmarks.tmdb_falso import ServidorTMDBFalso
+from src.models.graphs import Graphs
+
+CASOS = ('expandir', 'bfs', 'bidireccional', 'ingesta')
+
+
+def resumen(latencias_ms, **extra):
+    ordenadas = sorted(latencias_ms)
+    return {
+        'n': len(ordenadas),
+        'media_ms': round(statistics.mean(ordenadas), 3),
+        'p50_ms': round(ordenadas[len(ordenadas) // 2], 3),
+        'p95_ms': round(ordenadas[max(0, int(len(ordenadas) * 0.95) - 1)], 3),
+        'min_ms': round(ordenadas[0], 3),
+        'max_ms': round(ordenadas[-1], 3),
+        **extra
+    }
+
+
+def cronometrar(fn, argumentos):
+    """Llama fn(*args) para cada elemento y retorna (latencias en ms, resultados)."""
+    latencias, resultados = [], []
+    for args in argumentos:
+        inicio = time.perf_counter()
+        resultados.append(fn(*args))
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias, resultados
+
+
+def caso_expandir(servicio, actores_muestra, despues=None):
+    latencias, aristas = cronometrar(
+        lambda a: _y_luego(servicio.get_all_actors_asociated_with_one(a), despues),
+        [(a,) for a in actores_muestra]
+    )
+    return resumen(latencias, aristas_media=round(statistics.mean(len(x) for x in aristas), 1))
+
+
+def caso_busqueda(metodo, servicio, pares, despues=None):
+    """Cada par con un grafo nuevo: mide la búsqueda completa, cargas de vértices incluidas."""
+    def una(a, b):
+        return _y_luego(getattr(Graphs(servicio), metodo)(a, b), despues)
+
+    latencias, rutas = cronometrar(una, pares)
+    largos = [len(r) for r in rutas if r]
+    return resumen(
+        latencias, sin_ruta=sum(1 for r in rutas if not r),
+        saltos_media=round(statistics.mean(largos), 2) if largos else None
+    )
+
+
+def _y_luego(resultado, despues):
+    # Cierra la transacción de lectura, como el teardown de Flask entre requests
+    if despues is not None:
+        despues()
+    return resultado
+
+
+def caso_ingesta(db_session, args):
+    from src.services.actors_service import ActorService
+    from src.services.movies_service import MovieService
+    from src.services.actor_movie_service import ActorMovieService
+    from src.services.copy_bulk_loader import CopyBulkLoader
+    from src.services.game_sevice import GameService
+    from src.services.rate_limiter import AdaptiveRateLimiter
+    from src.services.tmdb_async_fetcher import TMDBAsyncFetcher
+    from src.services.tmdb_service import TMDBService
+    from sqlalchemy import text
+
+    db_session.execute(text('TRUNCATE actors_movies, costar_edges, actors, movies'))
+    db_session.commit()
+    servidor = ServidorTMDBFalso(args.latencia, semilla=args.semilla, limite_tasa=args.limite_tasa).iniciar()
+    limiter = AdaptiveRateLimiter(args.tasa)
+    tmdb = TMDBService(api_key='falsa', base_url=servidor.url, limiter=limiter)
+    fetcher = None
+    if args.descarga == 'async':
+        fetcher = TMDBAsyncFetcher(api_key='falsa', base_url=servidor.url, limiter=limiter)
+    loader = CopyBulkLoader(db_session) if args.carga == 'copy' else None
+    actor_service = ActorService(db_session, bulk_loader=loader)
+    game = GameService(
+        actor_service, MovieService(db_session, bulk_loader=loader),
+        ActorMovieService(db_session, bulk_loader=loader), tmdb, credits_fetcher=fetcher
+    )
+    try:
+        actor_ids = [1000 + i * 37 for i in range(args.ingestas)]
+        # Los créditos referencian al actor: se crea antes, fuera de la medición
+        actor_service.create_actors_bulk([
+            {'id': a, 'name': f'Actor {a}', 'profile_path': None, 'popularity': 1.0} for a in actor_ids
+        ])
+        latencias, _ = cronometrar(game.__add_movies_and_cast__, [(a,) for a in actor_ids])
+        return resumen(
+            latencias, requests=servidor.requests, con_429=servidor.limitados,
+            descarga=args.descarga, carga=args.carga
+        )
+    finally:
+        tmdb.close()
+        if fetcher is not None:
+            fetcher.close()
+        servidor.detener()
+
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(actual, base):
+    """Imprime la variación de la media de cada caso contra otra corrida."""
+    print(f"\nContra {base['meta'].get('commit')} ({base['meta'].get('fecha')}):")
+    for caso, datos in actual['resultados'].items():
+        anterior = base['resultados'].get(caso)
+        if not anterior:
+            print(f"{caso:>14}: sin dato en la base")
+            continue
+        cambio = (datos['media_ms'] - anterior['media_ms']) / anterior['media_ms'] * 100
+        print(f"{caso:>14}: {anterior['media_ms']:10.2f} ms -> {datos['media_ms']:10.2f} ms  ({cambio:+6.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--casos', nargs='+', choices=CASOS, default=list(CASOS))
+    parser.add_argument('--actores', type=int, default=20000)
+    parser.add_argument('--peliculas', type=int, default=3000)
+    parser.add_argument('--muestras', type=int, default=200, help='actores para el caso expandir')
+    parser.add_argument('--pares', type=int, default=20, help='pares para bidireccional')
+    parser.add_argument('--pares-bfs', type=int, default=5, help='pares para bfs (expande vértice por vértice, es lento)')
+    parser.add_argument('--ingestas', type=int, default=5, help='actores a ingestar')
+    parser.add_argument('--latencia', type=float, default=0.02, help='latencia del TMDB falso (s)')
+    parser.add_argument('--limite-tasa', type=int, default=None, help='req/s del TMDB falso antes de responder 429')
+    parser.add_argument('--tasa', type=float, default=40, help='tasa inicial del limitador de TMDBService')
+    parser.add_argument('--descarga', choices=('hilos', 'async'), default='hilos')
+    parser.add_argument('--carga', choices=('insert', 'copy'), default='copy')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--schema', default='bench_suite')
+    parser.add_argument('--sin-db', action='store_true', help='grafos sobre ServicioSintetico, sin ingesta')
+    parser.add_argument('--salida', default=None, help='archivo JSON con los resultados')
+    parser.add_argument('--comparar', default=None, help='JSON de una corrida anterior')
+    args = parser.parse_args()
+
+    actores, peliculas, creditos = generar_dataset(args.actores, args.peliculas, args.semilla)
+    rnd = random.Random(args.semilla)
+    ids = [a['id'] for a in actores]
+    muestra = rnd.sample(ids, min(args.muestras, len(ids)))
+    pares = [tuple(rnd.sample(ids, 2)) for _ in range(args.pares)]
+
+    resultados = {}
+    engine = db_session = None
+    try:
+        if args.sin_db:
+            servicio, despues = ServicioSintetico(peliculas, creditos), None
+        else:
+            from dotenv import load_dotenv
+            from sqlalchemy import create_engine, text
+            from sqlalchemy.orm import sessionmaker, scoped_session
+            from benchmarks.carga_copy import conectar
+            from src.models.database import Base
+            from src.services.actor_movie_service import ActorMovieService
+            from src.services.copy_bulk_loader import CopyBulkLoader
+
+            load_dotenv()
+            engine = create_engine('postgresql://', creator=lambda: conectar(args.schema))
+            with engine.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+                conn.execute(text(f'CREATE SCHEMA {args.schema}'))
+            Base.metadata.create_all(bind=engine)
+            db_session = scoped_session(sessionmaker(bind=engine))
+            loader = CopyBulkLoader(db_session)
+            loader.load_actors(actores)
+            loader.load_movies(peliculas)
+            loader.load_actor_movies(creditos)
+            db_session.execute(text('ANALYZE'))
+            db_session.commit()
+            servicio, despues = ActorMovieService(db_session), db_session.rollback
+
+        print(f"Dataset: {len(actores)} actores, {len(peliculas)} películas, {len(creditos)} créditos")
+        if 'expandir' in args.casos:
+            resultados['expandir'] = caso_expandir(servicio, muestra, despues)
+        if 'bfs' in args.casos:
+            resultados['bfs'] = caso_busqueda('bfs', servicio, pares[:args.pares_bfs], despues)
+        if 'bidireccional' in args.casos:
+            resultados['bidireccional'] = caso_busqueda('bfs_bidireccional', servicio, pares, despues)
+        if 'ingesta' in args.casos:
+            if db_session is None:
+                print("ingesta: omitida con --sin-db")
+            else:
+                resultados['ingesta'] = caso_ingesta(db_session, args)
+    finally:
+        if engine is not None:
+            db_session.remove()
+            with engine.begin() as conn:
+                conn.execute(text(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE'))
+            engine.dispose()
+
+    for caso, datos in resultados.items():
+        print(f"{caso:>14}: media {datos['media_ms']:10.2f} ms  p50 {datos['p50_ms']:10.2f} ms  "
+              f"p95 {datos['p95_ms']:10.2f} ms  (n={datos['n']})")
+
+    salida = {
+        'meta': {
+            'commit': commit_actual(),
+            'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'db': not args.sin_db,
+            'argumentos': vars(args)
+        },
+        'resultados': resultados
+    }
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.salida}")
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            comparar(salida, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Descarga de créditos de muchas películas: los lotes fijos con hilos y pausa
+de GameService.__add_cast_bulk__ contra el pipeline continuo de
+TMDBAsyncFetcher (limitador de tasa), con un servidor TMDB falso local donde
+algunas películas responden lento.
+
+Uso:
+    python -m benchmarks.tmdb_async --peliculas 300 --tasa 40 --lentas 0.05
+"""
+import argparse
+import concurrent.futures
+import time
+
+from benchmarks.tmdb_falso import ServidorTMDBFalso
+from src.services.rate_limiter import AdaptiveRateLimiter
+from src.services.tmdb_async_fetcher import TMDBAsyncFetcher
+from src.services.tmdb_service import TMDBService
+
+# Mismos parámetros que GameService
+MAX_WORKERS = 6
+CHUNK_SIZE = 20
+RATE_LIMIT_PAUSE = 0.25
+
+
+def por_lotes(tmdb: TMDBService, movie_ids):
+    """El camino 'hilos' de __add_cast_bulk__ (sin los reintentos, que no se disparan acá)."""
+    resultado = {}
+    for i in range(0, len(movie_ids), CHUNK_SIZE):
+        chunk = movie_ids[i:i + CHUNK_SIZE]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for mid, casts in zip(chunk, executor.map(tmdb.get_movie_credits, chunk)):
+                resultado[mid] = casts
+        time.sleep(RATE_LIMIT_PAUSE)
+    return resultado
+
+
+def medir(nombre, servidor, funcion, movie_ids):
+    servidor.requests = 0
+    inicio = time.perf_counter()
+    resultado = funcion(movie_ids)
+    segundos = time.perf_counter() - inicio
+    assert len(resultado) == len(movie_ids) and all(isinstance(c, list) and c for c in resultado.values())
+    print(f"{nombre:>9}: {segundos:6.2f}s  {len(movie_ids) / segundos:6.1f} películas/s  "
+          f"{servidor.requests / segundos:6.1f} req/s al servidor")
+    return segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--peliculas', type=int, default=300)
+    parser.add_argument('--tasa', type=float, default=40, help='requests por segundo permitidos')
+    parser.add_argument('--en-vuelo', type=int, default=20)
+    parser.add_argument('--latencia', type=float, default=0.05)
+    parser.add_argument('--lentas', type=float, default=0.05, help='proporción de respuestas lentas')
+    parser.add_argument('--latencia-lenta', type=float, default=1.0)
+    args = parser.parse_args()
+
+    servidor = ServidorTMDBFalso(
+        args.latencia, proporcion_lentas=args.lentas, latencia_lenta=args.latencia_lenta
+    ).iniciar()
+    movie_ids = list(range(500000, 500000 + args.peliculas))
+    tmdb = TMDBService(api_key='falsa', base_url=servidor.url, max_connections=MAX_WORKERS)
+    fetcher = TMDBAsyncFetcher(
+        api_key='falsa', base_url=servidor.url, max_in_flight=args.en_vuelo,
+        limiter=AdaptiveRateLimiter(args.tasa)
+    )
+    try:
+        antes = medir('lotes', servidor, lambda ids: por_lotes(tmdb, ids), movie_ids)
+        despues = medir('async', servidor, fetcher.fetch_movie_credits_many, movie_ids)
+    finally:
+        tmdb.close()
+        fetcher.close()
+        servidor.detener()
+
+    print(f"Speedup: {antes / despues:.2f}x (tope teórico async: {args.tasa:.0f} req/s)")
+
+
+if __name__ == '__main__':
+    main()
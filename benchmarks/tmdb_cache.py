@@ -0,0 +1,75 @@
+"""
+Caché persistente de respuestas de TMDB contra un servidor TMDB falso local:
+primera pasada (caché vacía), segunda pasada (todo vigente), revalidación
+de entradas vencidas con ETag (304) y la misma caché abierta desde varios
+hilos y dos instancias (como dos procesos worker).
+
+Uso:
+    python -m benchmarks.tmdb_cache --peliculas 300 --latencia 0.03
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.tmdb_falso import ServidorTMDBFalso
+from src.services.tmdb_cache_service import TMDBResponseCache, REVISAR_TOPE_CADA
+from src.services.tmdb_service import TMDBService
+
+
+def pasada(nombre, servidor, tmdb, movie_ids, hilos):
+    servidor.requests = servidor.no_modificados = 0
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        repartos = list(executor.map(tmdb.get_movie_credits, movie_ids))
+    segundos = time.perf_counter() - inicio
+    assert all(isinstance(r, list) and r for r in repartos)
+    print(f"{nombre:>14}: {segundos:6.2f}s  {servidor.requests:4d} requests  "
+          f"{servidor.no_modificados:4d} respondidos con 304")
+    return repartos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--peliculas', type=int, default=300)
+    parser.add_argument('--hilos', type=int, default=6)
+    parser.add_argument('--latencia', type=float, default=0.03)
+    parser.add_argument('--max-entradas', type=int, default=250)
+    args = parser.parse_args()
+
+    servidor = ServidorTMDBFalso(args.latencia).iniciar()
+    movie_ids = list(range(500000, 500000 + args.peliculas))
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'tmdb_cache.sqlite3')
+        cache = TMDBResponseCache(ruta, max_entries=args.max_entradas)
+        # Otra instancia sobre el mismo archivo, como la de otro proceso worker
+        otra = TMDBResponseCache(ruta, max_entries=args.max_entradas)
+        tmdb = TMDBService(api_key='falsa', base_url=servidor.url, cache=cache)
+        tmdb_otra = TMDBService(api_key='falsa', base_url=servidor.url, cache=otra)
+        try:
+            fria = pasada('caché vacía', servidor, tmdb, movie_ids, args.hilos)
+            # Con el tope, las primeras en entrar ya se desalojaron
+            recientes = movie_ids[-min(args.max_entradas, len(movie_ids)) // 2:]
+            tibia = pasada('vigente (otra)', servidor, tmdb_otra, recientes, args.hilos)
+            assert tibia == fria[-len(recientes):]
+            assert servidor.requests == 0, "las entradas vigentes no deberían ir a la red"
+
+            # TTL 0: todo vence y se revalida con If-None-Match
+            cache.ttls['movie_credits'] = 0
+            pasada('revalidación', servidor, tmdb, recientes, args.hilos)
+            assert servidor.no_modificados == servidor.requests == len(recientes)
+        finally:
+            tmdb.close()
+            tmdb_otra.close()
+            servidor.detener()
+
+        print(f"stats: {cache.get_stats()}")
+        print(f"stats (otra): {otra.get_stats()}")
+        # El tope se revisa cada REVISAR_TOPE_CADA escrituras
+        assert cache.get_stats()['entries'] < args.max_entradas + REVISAR_TOPE_CADA
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Cliente de TMDB: un httpx.Client nuevo por request (como antes) contra el
+pool compartido de TMDBService, con la misma concurrencia que
+GameService.__add_cast_bulk__ y un servidor TMDB falso local.
+
+Uso:
+    python -m benchmarks.tmdb_cliente --requests 300 --latencia-conexion 0.03
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from benchmarks.tmdb_falso import ServidorTMDBFalso
+from src.services.tmdb_service import TMDBService
+
+
+def cliente_por_request(base_url: str, movie_id: int):
+    """Lo que hacía TMDBService antes: abrir y cerrar un cliente en cada llamada."""
+    with httpx.Client() as client:
+        response = client.get(f"{base_url}/movie/{movie_id}/credits")
+        response.raise_for_status()
+        return response.json()
+
+
+def medir(nombre, servidor, funcion, movie_ids, hilos):
+    servidor.conexiones = servidor.requests = 0
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        resultados = list(executor.map(funcion, movie_ids))
+    segundos = time.perf_counter() - inicio
+    assert all(isinstance(r, (dict, list)) and r for r in resultados)
+    print(f"{nombre:>18}: {segundos:6.2f}s  {len(movie_ids) / segundos:7.1f} req/s  "
+          f"{servidor.conexiones:4d} conexiones")
+    return segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--hilos', type=int, default=6, help='igual que GameService._max_workers')
+    parser.add_argument('--latencia', type=float, default=0.005, help='segundos por request')
+    parser.add_argument('--latencia-conexion', type=float, default=0.03,
+                        help='segundos por conexión nueva (handshake TCP + TLS)')
+    args = parser.parse_args()
+
+    servidor = ServidorTMDBFalso(args.latencia, args.latencia_conexion).iniciar()
+    movie_ids = list(range(500000, 500000 + args.requests))
+    try:
+        antes = medir('cliente por request', servidor,
+                      lambda mid: cliente_por_request(servidor.url, mid), movie_ids, args.hilos)
+
+        tmdb = TMDBService(api_key='falsa', base_url=servidor.url, max_connections=args.hilos)
+        try:
+            despues = medir('pool compartido', servidor, tmdb.get_movie_credits, movie_ids, args.hilos)
+        finally:
+            tmdb.close()
+    finally:
+        servidor.detener()
+
+    print(f"Speedup: {antes / despues:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
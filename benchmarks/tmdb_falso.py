@@ -0,0 +1,165 @@
+"""
+Servidor HTTP local que imita los endpoints de TMDB que usa TMDBService,
+para medir el cliente sin depender de la red ni gastar cuota de la API.
+
+'latencia_conexion' se paga una vez por conexión nueva (simula el handshake
+TCP + TLS contra api.themoviedb.org) y 'latencia' en cada request; una
+fracción 'proporcion_lentas' de los requests tarda 'latencia_lenta'. Las
+respuestas llevan ETag y un If-None-Match que coincide recibe 304. Con
+'limite_tasa' (req/s, ventana de un segundo) los excedentes reciben 429 con
+Retry-After, como hace TMDB.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _reparto(movie_id: int, tamano: int = 30) -> list:
+    return [
+        {
+            'id': 1000 + (movie_id * 7 + i) % 5000, 'name': f'Actor {i}', 'profile_path': None,
+            'popularity': 1.0, 'character': f'Character {i}', 'order': i,
+            'known_for_department': 'Acting'
+        }
+        for i in range(tamano)
+    ]
+
+
+def _filmografia(actor_id: int, tamano: int = 40) -> list:
+    return [
+        {
+            'id': 500000 + (actor_id * 13 + i) % 3000, 'title': f'Movie {i}', 'poster_path': None,
+            'release_date': f'{1980 + i % 40}-01-01', 'vote_average': 6.5,
+            'character': f'Character {i}', 'order': i % 20
+        }
+        for i in range(tamano)
+    ]
+
+
+RUTAS = [
+    (re.compile(r'^/search/person$'), lambda m: {'results': _reparto(1, 10)}),
+    (re.compile(r'^/person/(\d+)/movie_credits$'), lambda m: {'cast': _filmografia(int(m.group(1)))}),
+    (re.compile(r'^/movie/(\d+)/credits$'), lambda m: {'cast': _reparto(int(m.group(1)))}),
+    (re.compile(r'^/person/(\d+)$'), lambda m: {
+        'id': int(m.group(1)), 'name': 'Actor', 'profile_path': None,
+        'popularity': 1.0, 'known_for_department': 'Acting'
+    }),
+    (re.compile(r'^/movie/(\d+)$'), lambda m: {
+        'id': int(m.group(1)), 'title': 'Movie', 'poster_path': None, 'release_date': '2000-01-01'
+    }),
+]
+
+
+class ServidorTMDBFalso(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+            self, latencia: float = 0.0, latencia_conexion: float = 0.0, puerto: int = 0,
+            proporcion_lentas: float = 0.0, latencia_lenta: float = 1.0, semilla: int = 42,
+            limite_tasa: int = None
+        ):
+        super().__init__(('127.0.0.1', puerto), _Manejador)
+        self.latencia = latencia
+        self.latencia_conexion = latencia_conexion
+        self.proporcion_lentas = proporcion_lentas
+        self.latencia_lenta = latencia_lenta
+        self._random = random.Random(semilla)
+        self.conexiones = 0
+        self.requests = 0
+        self.no_modificados = 0
+        self.limite_tasa = limite_tasa
+        self.limitados = 0
+        self._ventana = (0, 0)  # (segundo, requests en ese segundo)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def iniciar(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def detener(self):
+        self.shutdown()
+        self.server_close()
+
+    def _contar(self, campo: str):
+        with self._lock:
+            setattr(self, campo, getattr(self, campo) + 1)
+
+    def _excede_tasa(self) -> bool:
+        if not self.limite_tasa:
+            return False
+        with self._lock:
+            segundo = int(time.monotonic())
+            inicio, cantidad = self._ventana
+            cantidad = cantidad + 1 if inicio == segundo else 1
+            self._ventana = (segundo, cantidad)
+            if cantidad > self.limite_tasa:
+                self.limitados += 1
+                return True
+            return False
+
+    def _latencia_request(self) -> float:
+        with self._lock:
+            lenta = self._random.random() < self.proporcion_lentas
+        return self.latencia_lenta if lenta else self.latencia
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    # HTTP/1.1 para que el cliente pueda mantener la conexión abierta
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server._contar('conexiones')
+        time.sleep(self.server.latencia_conexion)
+
+    def do_GET(self):
+        self.server._contar('requests')
+        if self.server._excede_tasa():
+            datos = json.dumps({'status_code': 25, 'status_message': 'Rate limit exceeded'}).encode('utf-8')
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+            return
+        time.sleep(self.server._latencia_request())
+        ruta = self.path.split('?', 1)[0]
+        for patron, respuesta in RUTAS:
+            m = patron.match(ruta)
+            if m:
+                datos = json.dumps(respuesta(m)).encode('utf-8')
+                etag = '"' + hashlib.md5(datos).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.server._contar('no_modificados')
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self._enviar(200, datos, etag)
+                return
+        self._responder(404, {'status_message': 'Not found'})
+
+    def _responder(self, estado: int, cuerpo: dict):
+        self._enviar(estado, json.dumps(cuerpo).encode('utf-8'))
+
+    def _enviar(self, estado: int, datos: bytes, etag: str = None):
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json')
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,76 @@
+"""
+Varios hilos descargando créditos contra un servidor TMDB falso que limita
+la tasa (429 + Retry-After): el reintento con backoff fijo por hilo, sin
+limitador compartido (como antes), contra el AdaptiveRateLimiter (AIMD)
+compartido por todas las llamadas.
+
+Uso:
+    python -m benchmarks.tmdb_throttle --peliculas 400 --limite 30 --hilos 12
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.tmdb_falso import ServidorTMDBFalso
+from src.services.rate_limiter import AdaptiveRateLimiter
+from src.services.tmdb_errors import TMDBError, TMDBRateLimitError
+from src.services.tmdb_service import TMDBService
+
+MAX_RETRIES = 3
+
+
+def con_reintentos(tmdb: TMDBService, mid: int, respetar_limitador: bool):
+    """fetch_with_retries de GameService; 'respetar_limitador' = False imita el backoff fijo anterior."""
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            return tmdb.get_movie_credits(mid)
+        except TMDBError as e:
+            if not e.retryable:
+                return []
+            if attempt < MAX_RETRIES:
+                if respetar_limitador and isinstance(e, TMDBRateLimitError):
+                    continue
+                time.sleep(0.5 * (2 ** (attempt - 1)))
+    return []
+
+
+def medir(nombre, servidor, tmdb, movie_ids, hilos, respetar_limitador):
+    servidor.requests = servidor.limitados = 0
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        repartos = list(executor.map(lambda mid: con_reintentos(tmdb, mid, respetar_limitador), movie_ids))
+    segundos = time.perf_counter() - inicio
+    completas = sum(1 for r in repartos if r)
+    print(f"{nombre:>12}: {segundos:6.2f}s  {completas:4d}/{len(movie_ids)} películas  "
+          f"{completas / segundos:6.1f} películas/s  {servidor.requests:5d} requests  "
+          f"{servidor.limitados:5d} con 429")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--peliculas', type=int, default=400)
+    parser.add_argument('--hilos', type=int, default=12)
+    parser.add_argument('--limite', type=int, default=30, help='req/s que acepta el servidor')
+    parser.add_argument('--tasa', type=float, default=60, help='tasa inicial del limitador (por encima del límite)')
+    parser.add_argument('--latencia', type=float, default=0.02)
+    args = parser.parse_args()
+
+    servidor = ServidorTMDBFalso(args.latencia, limite_tasa=args.limite).iniciar()
+    movie_ids = list(range(500000, 500000 + args.peliculas))
+    try:
+        # Sin limitador efectivo: cada hilo reintenta por su cuenta
+        libre = TMDBService(api_key='falsa', base_url=servidor.url, limiter=AdaptiveRateLimiter(1e6, 1e6))
+        medir('backoff fijo', servidor, libre, movie_ids, args.hilos, False)
+        libre.close()
+
+        limiter = AdaptiveRateLimiter(args.tasa)
+        tmdb = TMDBService(api_key='falsa', base_url=servidor.url, limiter=limiter)
+        medir('AIMD', servidor, tmdb, movie_ids, args.hilos, True)
+        tmdb.close()
+        print(f"limitador: {limiter.get_stats()}")
+    finally:
+        servidor.detener()
+
+
+if __name__ == '__main__':
+    main()
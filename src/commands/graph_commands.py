@@ -0,0 +1,107 @@
+import time
+import click
+from src.models.landmarks import LandmarkIndex
+from src.models.graph_snapshot import GraphSnapshot
+from src.models.components import ComponentIndex
+from src.services.actors_service import ActorService
+from src.services.movies_service import MovieService
+from src.services.actor_movie_service import ActorMovieService
+
+class GraphCommands:
+    """Comandos de consola (flask <comando>) para los procesos offline del grafo."""
+    def __init__(
+            self, actor_service: ActorService, movie_service: MovieService,
+            actor_movie_service: ActorMovieService, landmarks_path: str, snapshot_path: str,
+            components_path: str = None
+        ):
+        self.actor_service = actor_service
+        self.movie_service = movie_service
+        self.actor_movie_service = actor_movie_service
+        self.landmarks_path = landmarks_path
+        self.snapshot_path = snapshot_path
+        self.components_path = components_path
+
+    def register(self, app):
+        """Registra todos los comandos en la CLI de Flask"""
+        @app.cli.command('build-landmarks')
+        @click.option('--k', default=16, show_default=True, help='Cantidad de landmarks')
+        @click.option('--output', default=None, help='Archivo de salida (por defecto LANDMARKS_PATH)')
+        def build_landmarks(k, output):
+            """Construye el índice de landmarks desde la tabla actors_movies."""
+            self.build_landmarks(k, output or self.landmarks_path)
+
+        @app.cli.command('graph-snapshot')
+        @click.option('--output', default=None, help='Archivo de salida (por defecto GRAPH_SNAPSHOT_PATH)')
+        def graph_snapshot(output):
+            """Construye (o reemplaza) el snapshot mmap del grafo de co-protagonistas."""
+            self.build_snapshot(output or self.snapshot_path)
+
+        @app.cli.command('build-components')
+        @click.option('--output', default=None, help='Archivo de salida (por defecto COMPONENTS_PATH)')
+        def build_components(output):
+            """Construye el índice de componentes conexos desde la tabla actors_movies."""
+            self.build_components(output or self.components_path)
+
+        @app.cli.command('backfill-costar-edges')
+        @click.option('--batch-size', default=500, show_default=True, help='Películas por bloque (un commit por bloque)')
+        def backfill_costar_edges(batch_size):
+            """Llena (o completa) la tabla costar_edges desde actors_movies."""
+            self.backfill_costar_edges(batch_size)
+
+    def build_landmarks(self, k: int, output: str):
+        inicio = time.perf_counter()
+        # Se piden más candidatos que K: se descartan los que no tienen créditos
+        # y los co-protagonistas directos de un landmark ya elegido
+        candidatos = self.actor_service.get_actor_ids_by_popularity(k * 50)
+        indice = LandmarkIndex.construir(self.actor_movie_service.iter_all_credits_with_order(), candidatos, k)
+        indice.guardar(output)
+
+        click.echo(
+            f"Índice de landmarks guardado en {output}: {indice.k} landmarks, "
+            f"{indice.num_actores} actores ({time.perf_counter() - inicio:.1f}s)"
+        )
+
+    def build_snapshot(self, output: str):
+        inicio = time.perf_counter()
+        # El watermark se toma antes de leer: lo insertado durante la lectura
+        # queda por encima y se vuelve a cargar desde la DB al arrancar. Espera
+        # a las transacciones en curso para que ningún ID menor confirme tarde
+        watermark = self.actor_movie_service.wait_credits_safe_watermark()
+        vertices, aristas = GraphSnapshot.construir(
+            self.movie_service.iter_all_movies(),
+            self.actor_movie_service.iter_all_credits_with_order(),
+            watermark, output
+        )
+
+        click.echo(
+            f"Snapshot del grafo guardado en {output}: {vertices} vértices, {aristas} aristas, "
+            f"watermark {watermark} ({time.perf_counter() - inicio:.1f}s). "
+            "Los workers lo usan al reiniciarse."
+        )
+
+    def build_components(self, output: str):
+        inicio = time.perf_counter()
+        # El watermark se toma antes de leer, esperando a las transacciones en
+        # curso: un ID bajo que confirma tarde no puede quedar por debajo
+        watermark = self.actor_movie_service.wait_credits_safe_watermark()
+        indice = ComponentIndex.construir(self.actor_movie_service.iter_all_credits(), watermark)
+        indice.guardar(output)
+
+        estadisticas = indice.estadisticas()
+        click.echo(
+            f"Índice de componentes guardado en {output}: {estadisticas['actores']} actores en "
+            f"{estadisticas['componentes']} componentes (los más grandes: {estadisticas['mayores']}), "
+            f"watermark {watermark} ({time.perf_counter() - inicio:.1f}s)"
+        )
+
+    def backfill_costar_edges(self, batch_size: int):
+        inicio = time.perf_counter()
+
+        def progress(hechas, total):
+            click.echo(f"\r{hechas}/{total} películas", nl=False)
+
+        aristas = self.actor_movie_service.rebuild_costar_edges(batch_size, progress)
+        click.echo(
+            f"\ncostar_edges completa: {aristas} aristas ({time.perf_counter() - inicio:.1f}s). "
+            "Activar COSTAR_EDGES=1 para que el grafo las lea."
+        )
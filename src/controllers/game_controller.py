@@ -17,26 +17,39 @@ class GameController:
         self.blueprint.add_url_rule(
             '/verify/connection_with_two_actor', 'verify_shared_conection', self.connection_with_two_actor, methods=['GET']
         )
+        self.blueprint.add_url_rule(
+            '/stats', 'stats', self.get_stats, methods=['GET']
+        )
+        self.blueprint.add_url_rule(
+            '/estimate', 'estimate_separation', self.estimate_separation, methods=['GET']
+        )
+        self.blueprint.add_url_rule(
+            '/jobs/<int:job_id>', 'ingestion_job', self.get_ingestion_job, methods=['GET']
+        )
 
     def verify_conection_actor(self):
         """
         Controller para ver si hay conexión entre 2 actores.
+        Con ?explain=1 cada tramo de 'timings.legs' trae las estadísticas de su búsqueda.
         """
         idActor0 = int(request.args.get('idActor0', 0))
         idActorA = int(request.args.get('idActorA', 0))
         idActorB = int(request.args.get('idActorB', 0))
+        explain = request.args.get('explain', '0') == '1'
 
         try:
-            # 1. Obtener datos del servicio
-            self.game_service.saved_data_in_db(idActor0, idActorA)
-            ruta = self.game_service.search_connection(idActor0, idActorA)
-            self.game_service.saved_data_in_db(idActorA, idActorB)
-            ruta2 = self.game_service.search_connection(idActorA, idActorB)
+            # 0. Con la cola de fondo, si falta ingestar algún actor se responde con los jobs
+            pending = self._pending_ingestions_response([idActor0, idActorA, idActorB])
+            if pending is not None:
+                return pending
+
+            # 1. Obtener datos del servicio (ingesta y búsqueda de ambos tramos)
+            ruta, ruta2, timings = self.game_service.verify_connection(idActor0, idActorA, idActorB, explain)
 
             if not ruta and not ruta2:
-                return jsonify({'connection': False, 'ruta': None, 'ruta2': None}), 200
+                return jsonify({'connection': False, 'ruta': None, 'ruta2': None, 'timings': timings}), 200
             else:
-                return jsonify({'connection': True, 'ruta': ruta, 'ruta2': ruta2}), 200
+                return jsonify({'connection': True, 'ruta': ruta, 'ruta2': ruta2, 'timings': timings}), 200
         except Exception as e:
             return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
         
@@ -51,6 +64,10 @@ class GameController:
             return jsonify({'is_shared':False, 'film': None}), 200
 
         try:
+            pending = self._pending_ingestions_response([idActorA, idActorB])
+            if pending is not None:
+                return pending
+
             # 1. Obtener datos del servicio
             movie_shared = self.game_service.actors_shared_movies(idActorA, idActorB)
 
@@ -59,4 +76,53 @@ class GameController:
             else:
                 return jsonify({'is_shared':True, 'film': movie_shared}), 200
         except Exception as e:
-            return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
\ No newline at end of file
+            return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
+
+    def estimate_separation(self):
+        """
+        Controller que acota los grados de separación entre 2 actores con el
+        índice de landmarks, antes de buscar la ruta completa.
+        """
+        idActorA = int(request.args.get('idActorA', 0))
+        idActorB = int(request.args.get('idActorB', 0))
+
+        try:
+            estimate = self.game_service.estimate_separation(idActorA, idActorB)
+            return jsonify({'indexed': estimate is not None, 'estimate': estimate}), 200
+        except Exception as e:
+            return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
+
+    def get_stats(self):
+        """
+        Controller con los contadores de caché (hits, misses, desalojos).
+        """
+        return jsonify(self.game_service.get_stats()), 200
+
+    def get_ingestion_job(self, job_id: int):
+        """
+        Controller con el estado de un job de ingesta: status y películas
+        descargadas sobre el total.
+        """
+        if self.game_service.ingestion_pool is None:
+            return jsonify({'error': 'Not Found', 'message': 'La ingesta en segundo plano está desactivada'}), 404
+
+        job = self.game_service.get_ingestion_job(job_id)
+        if job is None:
+            return jsonify({'error': 'Not Found', 'message': f'No existe el job {job_id}'}), 404
+        return jsonify(job), 200
+
+    def _pending_ingestions_response(self, actor_ids):
+        """
+        Si la ingesta es en segundo plano y falta algún actor, encola sus jobs y
+        retorna 202 con ellos (el cliente consulta /game/jobs/<id> y reintenta);
+        si alguno falló, 502. None si ya están todos y se puede responder.
+        """
+        if self.game_service.ingestion_pool is None:
+            return None
+
+        jobs = self.game_service.enqueue_missing_ingestions(actor_ids)
+        if not jobs:
+            return None
+        if any(job['status'] == 'failed' for job in jobs):
+            return jsonify({'error': 'Ingestion Failed', 'jobs': jobs}), 502
+        return jsonify({'status': 'ingesting', 'jobs': jobs}), 202
\ No newline at end of file
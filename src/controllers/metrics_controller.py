@@ -0,0 +1,65 @@
+import time
+from flask import Blueprint, Response, g, request
+from flask.json.provider import DefaultJSONProvider
+from src.services import metrics
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """El JSON por defecto de Flask, midiendo cuánto tarda serializar cada respuesta."""
+    def dumps(self, obj, **kwargs):
+        with metrics.medir('json', metrics.JSON_SECONDS):
+            return super().dumps(obj, **kwargs)
+
+
+class MetricsController:
+    """
+    /metrics en formato Prometheus y el desglose de tiempos de cada request:
+    TMDB, sentencias SQL, cargas de vértices, búsqueda y JSON. Con
+    'server_timing' el desglose también va en el header Server-Timing.
+    """
+    def __init__(self, server_timing: bool = False):
+        self.server_timing = server_timing
+        self.blueprint = Blueprint('metrics', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        """Registra todas las rutas del controlador"""
+        self.blueprint.add_url_rule('/metrics', 'metrics', self.get_metrics, methods=['GET'])
+
+    def register(self, app):
+        """Registra el blueprint y los hooks que miden cada request"""
+        app.json = TimedJSONProvider(app)
+        app.register_blueprint(self.blueprint)
+        app.before_request(self._antes)
+        app.after_request(self._despues)
+        app.teardown_request(self._terminar)
+
+    def get_metrics(self):
+        return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    def _antes(self):
+        g.metricas_token = metrics.iniciar_request()
+        g.metricas_inicio = time.perf_counter()
+
+    def _despues(self, response):
+        timings = metrics.request_actual()
+        if timings is None or request.endpoint == 'metrics.metrics':
+            return response
+
+        endpoint = request.endpoint or 'desconocido'
+        metrics.HTTP_SECONDS.observe(
+            time.perf_counter() - g.metricas_inicio,
+            endpoint=endpoint, method=request.method, status=response.status_code
+        )
+        metrics.HTTP_DB_ROUND_TRIPS.observe(timings.cantidad.get('db', 0), endpoint=endpoint)
+        metrics.HTTP_EXPANDED_VERTICES.observe(timings.cantidad.get('expandir', 0), endpoint=endpoint)
+        if self.server_timing:
+            valor = timings.server_timing()
+            if valor:
+                response.headers['Server-Timing'] = valor
+        return response
+
+    def _terminar(self, exception=None):
+        token = g.pop('metricas_token', None)
+        if token is not None:
+            metrics.terminar_request(token)
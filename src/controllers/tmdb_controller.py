@@ -1,10 +1,14 @@
 from flask import Blueprint, request, jsonify
 from src.views.tmdb_view import TMDBView
 from src.services.tmdb_service import TMDBService
+from src.services.actor_search_service import ActorSearchService
+from src.services.tmdb_errors import TMDBError, TMDBRateLimitError
 
 class TMDBController:
-    def __init__(self, tmdb_service: TMDBService):
+    def __init__(self, tmdb_service: TMDBService, actor_search: ActorSearchService = None):
         self.tmdb_service = tmdb_service
+        # Búsqueda local de actores con TMDB como respaldo (None = siempre TMDB)
+        self.actor_search = actor_search
         self.tmdb_view = TMDBView
         self.blueprint = Blueprint('tmdb', __name__)
         self._register_routes()
@@ -25,16 +29,24 @@ class TMDBController:
         """
         Controller para la búsqueda de actores.
         Maneja la lógica de la petición y coordina el servicio y la vista.
+        Con la búsqueda local el header X-Search-Source indica de dónde salieron
+        los resultados (local, tmdb o local+tmdb).
         """
         query = request.args.get('q', '')
 
         try:
             # 1. Obtener datos del servicio
-            result = self.tmdb_service.search_actors(query)
+            if self.actor_search is None:
+                return self.tmdb_view.format_actors_response(self.tmdb_service.search_actors(query))
+            result, source = self.actor_search.search(query)
 
             # 2. Determinar el tipo de respuesta basado en el Accept header
             # Para API: usar el view para formatear la respuesta JSON
-            return self.tmdb_view.format_actors_response(result)
+            response = self.tmdb_view.format_actors_response(result)
+            response.headers['X-Search-Source'] = source
+            return response
+        except TMDBError as e:
+            return self._tmdb_error_response(e)
         except Exception as e:
             return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
 
@@ -51,6 +63,8 @@ class TMDBController:
             # 2. Determinar el tipo de respuesta basado en el Accept header
             # Para API: usar el view para formatear la respuesta JSON
             return self.tmdb_view.format_actors_response(result)
+        except TMDBError as e:
+            return self._tmdb_error_response(e)
         except Exception as e:
             return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
     
@@ -66,5 +80,19 @@ class TMDBController:
             # 2. Determinar el tipo de respuesta basado en el Accept header
             # Para API: usar el view para formatear la respuesta JSON
             return self.tmdb_view.format_actors_response(result)
+        except TMDBError as e:
+            return self._tmdb_error_response(e)
         except Exception as e:
-            return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
\ No newline at end of file
+            return jsonify({'error': 'Internal Server Error', 'message': str(e)}), 500
+
+    def _tmdb_error_response(self, error: TMDBError):
+        """
+        Traduce un error de TMDB a la respuesta HTTP: 404 y 4xx tal cual, 429
+        con Retry-After para el frontend, y el resto (5xx, red) como 502.
+        """
+        status = error.status_code if error.status_code and error.status_code < 500 else 502
+        response = jsonify({'error': 'TMDB Error', 'message': str(error)})
+        response.status_code = status
+        if isinstance(error, TMDBRateLimitError) and error.retry_after is not None:
+            response.headers['Retry-After'] = str(int(error.retry_after + 0.999))
+        return response
\ No newline at end of file
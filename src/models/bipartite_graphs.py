@@ -0,0 +1,204 @@
+from collections import defaultdict
+from src.models.graphs import Graphs
+from src.services.actor_movie_service import ActorMovieService
+
+# Desplazamiento del ID del segundo vértice de una película (ver BipartiteGraphs)
+PELICULA_COMPLETA = 1 << 40
+
+class BipartiteGraphs(Graphs):
+    """
+    Grafo bipartito actor-película.
+
+    En lugar de proyectar cada película a un clique actor-actor (una película
+    con 80 actores son ~6.400 aristas), se guardan las filas de 'actors_movies'
+    tal cual: actor -> películas y película -> reparto. La memoria crece de
+    forma lineal con los créditos.
+
+    Las películas son vértices con ID negativo (-movie_id) para no chocar con
+    los IDs de actores, así el BFS de Graphs recorre actor -> película -> actor
+    sin cambios. Las rutas se colapsan al formato (actor, attr, actor).
+    Actores y películas cuentan igual para el presupuesto de memoria; una
+    película desalojada vuelve a cargar su reparto cuando se expande.
+
+    Dos actores son co-protagonistas si al menos uno tiene order <= 50 en la
+    película. Por eso una película con reparto secundario (order > 50 o nulo)
+    tiene dos vértices: -movie_id lleva solo al reparto principal y es el que
+    ven los secundarios; el "completo" lleva a todo el reparto y es el que ven
+    los principales. Así actor -> película -> actor son exactamente las
+    aristas del grafo de co-protagonistas, en ambos sentidos.
+    """
+    def __init__(self, actor_movie_service: ActorMovieService, max_vertices: int = None):
+        super().__init__(actor_movie_service, max_vertices)
+
+    def _inicializar_almacenamiento(self):
+        # actor -> [(vértice de la película, attr), ...] (más recientes primero)
+        self.peliculas_por_actor = {}
+        # vértice de película -> [actor_id, ...] (el reparto al que lleva)
+        self.reparto_por_pelicula = {}
+        # vértice de película -> attr de la arista {'movie_id', 'movie_title', 'poster_path'}
+        self.info_peliculas = {}
+
+    @staticmethod
+    def es_pelicula(vertice) -> bool:
+        return vertice < 0
+
+    @staticmethod
+    def _id_pelicula(vertice) -> int:
+        movie_id = -vertice
+        return movie_id - PELICULA_COMPLETA if movie_id >= PELICULA_COMPLETA else movie_id
+
+    def agregar_vertice(self, vertice):
+        # Los vértices existen implícitamente en los diccionarios de créditos
+        pass
+
+    def _cargar_aristas(self, u):
+        if self.es_pelicula(u):
+            return self.service.get_cast_of_many_movies([self._id_pelicula(u)])
+        return self.service.get_credits_of_actor_movies(u)
+
+    def _cargar_aristas_lote(self, vertices):
+        actores = [u for u in vertices if not self.es_pelicula(u)]
+        peliculas = defaultdict(list)
+        for u in vertices:
+            if self.es_pelicula(u):
+                peliculas[self._id_pelicula(u)].append(u)
+
+        credits_por_vertice = defaultdict(list)
+        if actores:
+            for id_origen, movie_id, actor_id, attr, principal in self.service.get_credits_of_many_actors_movies(actores):
+                credits_por_vertice[id_origen].append((movie_id, actor_id, attr, principal))
+        if peliculas:
+            # Los dos vértices de una película se cargan con la misma consulta
+            for movie_id, actor_id, attr, principal in self.service.get_cast_of_many_movies(list(peliculas)):
+                for u in peliculas[movie_id]:
+                    credits_por_vertice[u].append((movie_id, actor_id, attr, principal))
+        return credits_por_vertice
+
+    @staticmethod
+    def _vertices_pelicula(movie_id, reparto):
+        """
+        {vértice: reparto al que lleva} de una película, a partir de su reparto
+        [(actor_id, principal)]: el completo solo existe si hay secundarios.
+        """
+        principales = [actor_id for actor_id, principal in reparto if principal]
+        vertices = {-movie_id: principales}
+        if len(principales) < len(reparto):
+            vertices[-(movie_id + PELICULA_COMPLETA)] = [actor_id for actor_id, _ in reparto]
+        return vertices
+
+    def _agregar_aristas(self, u, credits):
+        if self.es_pelicula(u):
+            reparto = [(actor_id, principal) for _, actor_id, _, principal in credits]
+            vertices = self._vertices_pelicula(self._id_pelicula(u), reparto)
+            # Sin secundarios el vértice completo no tiene a quién llevar (nadie lo referencia)
+            self._guardar_pelicula(u, credits[0][2] if credits else None, vertices.get(u, []))
+            return
+
+        # Los créditos llegan agrupados por película (más reciente primero)
+        repartos = {}
+        for movie_id, actor_id, attr, principal in credits:
+            if movie_id not in repartos:
+                repartos[movie_id] = (attr, [])
+            repartos[movie_id][1].append((actor_id, principal))
+
+        peliculas = []
+        for movie_id, (attr, reparto) in repartos.items():
+            vertices = self._vertices_pelicula(movie_id, reparto)
+            principal = any(actor_id == u and es_principal for actor_id, es_principal in reparto)
+            vertice = -(movie_id + PELICULA_COMPLETA) if principal and len(vertices) > 1 else -movie_id
+            if vertice in self.loaded_vertices:
+                attr = self.info_peliculas.get(vertice, attr)
+            else:
+                # El reparto ya vino en la misma consulta, la película queda cargada
+                self._guardar_pelicula(vertice, attr, vertices[vertice])
+                self.loaded_vertices[vertice] = True
+            peliculas.append((vertice, attr))
+
+        if u not in self.peliculas_por_actor:
+            self.num_vertices += 1
+        self.peliculas_por_actor[u] = peliculas
+
+    def _guardar_pelicula(self, vertice, attr, reparto):
+        if vertice not in self.reparto_por_pelicula:
+            self.num_vertices += 1
+        if attr is not None:
+            self.info_peliculas[vertice] = attr
+        self.reparto_por_pelicula[vertice] = reparto
+
+    def _descargar_vertice(self, u):
+        if self.es_pelicula(u):
+            self.info_peliculas.pop(u, None)
+            liberado = self.reparto_por_pelicula.pop(u, None)
+        else:
+            liberado = self.peliculas_por_actor.pop(u, None)
+        if liberado is not None:
+            self.num_vertices -= 1
+
+    def _vertices_afectados(self, relaciones):
+        """Un crédito nuevo solo cambia las películas del actor y el reparto de la película."""
+        afectados = {r['id_actor'] for r in relaciones}
+        afectados.update(-r['id_movie'] for r in relaciones)
+        afectados.update(-(r['id_movie'] + PELICULA_COMPLETA) for r in relaciones)
+        return afectados
+
+    def _es_punto_de_encuentro(self, v):
+        """
+        Solo en actores. Una película vista desde los dos lados podría unir dos
+        actores secundarios, que no son co-protagonistas: la búsqueda sigue y
+        se encuentra en un actor del reparto.
+        """
+        return not self.es_pelicula(v)
+
+    def obtener_vecinos(self, vertice):
+        """
+        Actor -> sus películas, película -> su reparto. Ambas aristas llevan el
+        attr de la película para que la ruta no dependa de que siga en memoria.
+        """
+        if self.es_pelicula(vertice):
+            # Se usa .get porque otro hilo puede desalojar la película mientras se lee
+            attr = self.info_peliculas.get(vertice)
+            if attr is None:
+                return []
+            return [(actor_id, attr) for actor_id in self.reparto_por_pelicula.get(vertice, ())]
+        return self.peliculas_por_actor.get(vertice, [])
+
+    def grado(self, vertice):
+        if self.es_pelicula(vertice):
+            return len(self.reparto_por_pelicula.get(vertice, ()))
+        return len(self.peliculas_por_actor.get(vertice, ()))
+
+    def numero_aristas(self) -> int:
+        """Cantidad de créditos guardados (aristas del grafo bipartito)."""
+        return sum(len(p) for p in self.peliculas_por_actor.values()) + \
+            sum(len(r) for r in self.reparto_por_pelicula.values())
+
+    def _heuristica_landmarks(self, meta, landmarks):
+        """
+        Cada salto actor -> actor son dos aristas actor -> película -> actor.
+        Las películas no están en el índice: A* les aplica pathmax desde el actor padre.
+        """
+        h_actor = landmarks.heuristica_hacia(meta)
+        return lambda v: 0 if self.es_pelicula(v) else 2 * h_actor(v)
+
+    def _colapsar_ruta(self, ruta):
+        """Convierte (actor, attr, -pelicula), (-pelicula, attr, actor) en (actor, attr, actor)."""
+        colapsada = []
+        for i in range(0, len(ruta), 2):
+            actor_origen, attr, _ = ruta[i]
+            _, _, actor_destino = ruta[i + 1]
+            colapsada.append((actor_origen, attr, actor_destino))
+        return colapsada
+
+    def reconstruir_ruta(self, inicio, meta, padres):
+        ruta = super().reconstruir_ruta(inicio, meta, padres)
+        colapsada = self._colapsar_ruta([(r['anterior'], r['attr'], r['actual']) for r in ruta])
+        return [{'anterior': a, 'attr': attr, 'actual': b} for a, attr, b in colapsada]
+
+    def _reconstruir_ruta_bidireccional(self, inicio, meta, punto_encuentro, padres_a, padres_b):
+        ruta = super()._reconstruir_ruta_bidireccional(inicio, meta, punto_encuentro, padres_a, padres_b)
+        return self._colapsar_ruta(ruta)
+
+    def __str__(self):
+        return "Grafo bipartito ({} actores, {} películas, {} créditos)\n".format(
+            len(self.peliculas_por_actor), len(self.reparto_por_pelicula), self.numero_aristas()
+        )
@@ -0,0 +1,202 @@
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections import Counter
+
+# Formato del archivo (little-endian):
+#   cabecera: MAGIC, versión, watermark, cantidad de nodos (n)
+#   nodos:  n x int64 (actor = su ID, película = ~ID)
+#   raices: n x int64, la raíz del componente de cada nodo
+MAGIC = b'CCU1'
+VERSION = 1
+CABECERA = struct.Struct('<4sHxxqq')
+# Máximo de lecturas pendientes de confirmar (ver sincronizar)
+MAX_PENDIENTES = 100
+
+
+def _nodo_pelicula(movie_id: int) -> int:
+    # Complemento a uno: no choca con los IDs de actores (siempre >= 0)
+    return ~movie_id
+
+
+class ComponentIndex:
+    """
+    Componentes conexos del grafo de co-protagonistas con union-find sobre
+    los créditos (nodos actor y película, una unión por crédito), para
+    descartar en O(α(n)) los pares de actores que no tienen ruta, sin
+    recorrer (y cargar desde la DB) todo el componente de uno de ellos.
+
+    Igual que el índice de landmarks usa todos los créditos, sin el filtro
+    order <= 50 del grafo en memoria: ese grafo es un subgrafo, así que dos
+    actores en componentes distintos nunca tienen ruta. Al revés no vale:
+    el mismo componente no garantiza una ruta en el grafo filtrado.
+
+    Se mantiene con los créditos que inserta el proceso (listener de
+    ActorMovieService) y con sincronizar(), que lee los créditos con ID
+    mayor al 'watermark' (los de otros procesos, o los posteriores a
+    guardar el archivo). El watermark garantiza que todos los créditos con
+    ID <= watermark ya están en el índice.
+    """
+    def __init__(self, padres: dict = None, watermark: int = 0):
+        # nodo -> padre; las raíces apuntan a sí mismas
+        self._padres = padres if padres is not None else {}
+        # raíz -> cantidad de actores del componente
+        self._actores = Counter(raiz for nodo, raiz in self._padres.items() if nodo >= 0)
+        self.watermark = watermark
+        # (mayor ID, xmax) de lecturas con transacciones todavía en curso
+        self._pendientes = []
+        self._lock = threading.Lock()
+        self._lock_sync = threading.Lock()
+        self.rechazos = 0
+        self.sincronizaciones = 0
+
+    def _raiz(self, nodo):
+        padres = self._padres
+        while padres[nodo] != nodo:
+            # Compresión por mitades: cada nodo salta a su abuelo
+            padres[nodo] = padres[padres[nodo]]
+            nodo = padres[nodo]
+        return nodo
+
+    def _agregar(self, nodo):
+        if nodo not in self._padres:
+            self._padres[nodo] = nodo
+            if nodo >= 0:
+                self._actores[nodo] = 1
+
+    def _unir(self, a, b):
+        self._agregar(a)
+        self._agregar(b)
+        raiz_a, raiz_b = self._raiz(a), self._raiz(b)
+        if raiz_a == raiz_b:
+            return
+        # Unión por tamaño (en actores): el árbol más chico cuelga del más grande
+        if self._actores[raiz_a] < self._actores[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self._padres[raiz_b] = raiz_a
+        self._actores[raiz_a] += self._actores.pop(raiz_b, 0)
+
+    def unir_creditos(self, creditos):
+        """Agrega los créditos dados como pares (id_movie, id_actor)."""
+        with self._lock:
+            for movie_id, actor_id in creditos:
+                self._unir(actor_id, _nodo_pelicula(movie_id))
+
+    def agregar_creditos(self, relaciones):
+        """Listener de ActorMovieService: créditos recién insertados ({'id_actor', 'id_movie', ...})."""
+        self.unir_creditos((r['id_movie'], r['id_actor']) for r in relaciones)
+
+    def conectados(self, actor_a: int, actor_b: int):
+        """
+        True si están en el mismo componente, False si no hay ruta entre ellos
+        y None si alguno no tiene créditos en el índice.
+        """
+        with self._lock:
+            if actor_a not in self._padres or actor_b not in self._padres:
+                return None
+            return self._raiz(actor_a) == self._raiz(actor_b)
+
+    def registrar_rechazo(self):
+        with self._lock:
+            self.rechazos += 1
+
+    def tamano_componente(self, actor_id: int) -> int:
+        """Actores del componente del actor (0 si no está en el índice)."""
+        with self._lock:
+            if actor_id not in self._padres:
+                return 0
+            return self._actores[self._raiz(actor_id)]
+
+    def sincronizar(self, actor_movie_service) -> int:
+        """
+        Agrega los créditos con ID mayor al watermark. Un ID más bajo que el
+        máximo puede confirmarse después (transacción más lenta, o un lote
+        grande), así que el watermark solo avanza hasta un máximo leído cuando
+        ya terminaron todas las transacciones en curso en ese momento (xmin
+        posterior >= xmax de esa lectura); mientras tanto se relee desde el
+        watermark anterior. Sin créditos nuevos cuesta una consulta. Retorna
+        cuántos se leyeron.
+        """
+        with self._lock_sync:
+            maximo, xmin, xmax = actor_movie_service.get_credits_horizon()
+            if maximo > self.watermark:
+                self._pendientes.append((maximo, xmax))
+            if not self._pendientes:
+                return 0
+
+            leidos, lote = 0, []
+            for _, movie_id, actor_id in actor_movie_service.iter_credits_since(self.watermark):
+                lote.append((movie_id, actor_id))
+                leidos += 1
+                if len(lote) >= 10000:
+                    self.unir_creditos(lote)
+                    lote = []
+            self.unir_creditos(lote)
+
+            # La consulta de IDs y la de créditos leen después de 'xmin', así
+            # que lo confirmado antes ya se leyó completo
+            confirmados = [m for m, x in self._pendientes if x <= xmin]
+            self._pendientes = [(m, x) for m, x in self._pendientes if x > xmin][-MAX_PENDIENTES:]
+            with self._lock:
+                if confirmados:
+                    self.watermark = max(self.watermark, *confirmados)
+                self.sincronizaciones += 1
+            return leidos
+
+    def estadisticas(self, top: int = 5) -> dict:
+        with self._lock:
+            return {
+                'actores': sum(self._actores.values()),
+                'componentes': len(self._actores),
+                'mayores': [tamano for _, tamano in self._actores.most_common(top)],
+                'watermark': self.watermark,
+                'rechazos': self.rechazos,
+                'sincronizaciones': self.sincronizaciones
+            }
+
+    @classmethod
+    def construir(cls, creditos, watermark: int):
+        """Índice desde un iterable de (id_movie, id_actor), p. ej. iter_all_credits()."""
+        indice = cls(watermark=watermark)
+        indice.unir_creditos(creditos)
+        return indice
+
+    def guardar(self, ruta: str):
+        """Escribe el índice (cada nodo con su raíz) en formato binario (reemplazo atómico)."""
+        with self._lock:
+            nodos = array('q', self._padres)
+            raices = array('q', (self._raiz(nodo) for nodo in nodos))
+            watermark = self.watermark
+        if sys.byteorder == 'big':
+            nodos.byteswap()
+            raices.byteswap()
+
+        # Temporal propio de cada proceso: varios workers guardan al salir
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(ruta)), delete=False) as f:
+            f.write(CABECERA.pack(MAGIC, VERSION, watermark, len(nodos)))
+            nodos.tofile(f)
+            raices.tofile(f)
+        try:
+            os.replace(f.name, ruta)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+    @classmethod
+    def cargar(cls, ruta: str):
+        """Lee un índice escrito con guardar()."""
+        with open(ruta, 'rb') as f:
+            magic, version, watermark, n = CABECERA.unpack(f.read(CABECERA.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Archivo de componentes inválido o de otra versión: {ruta}")
+            nodos, raices = array('q'), array('q')
+            nodos.fromfile(f, n)
+            raices.fromfile(f, n)
+
+        if sys.byteorder == 'big':
+            nodos.byteswap()
+            raices.byteswap()
+        return cls(dict(zip(nodos, raices)), watermark)
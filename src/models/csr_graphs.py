@@ -0,0 +1,161 @@
+from array import array
+from src.models.graphs import Graphs
+from src.services.actor_movie_service import ActorMovieService
+from src.models.graph_snapshot import GraphSnapshot
+
+# Un bloque se guarda en un solo entero: (inicio << BITS_GRADO) | grado.
+# Así se publica con una única escritura y un lector nunca ve un inicio
+# nuevo con un grado viejo.
+BITS_GRADO = 24
+MASCARA_GRADO = (1 << BITS_GRADO) - 1
+SIN_CARGAR = -1
+
+class CSRGraphs(Graphs):
+    """
+    Grafo de co-protagonistas compacto (CSR por bloques).
+
+    Cada ID de TMDB se traduce a un índice denso y los vecinos de cada vértice
+    expandido se guardan como un bloque contiguo dentro de arreglos 'q' (int64).
+    Los datos de la película de cada arista se guardan una sola vez en una tabla
+    lateral, por lo que las aristas solo ocupan dos enteros.
+
+    Solo se guarda la dirección u -> v al expandir 'u': el cargador devuelve
+    las aristas no dirigidas (basta con que uno de los dos tenga order <= 50),
+    así que al expandir 'v' la DB devuelve 'u' y la adyacencia es la misma
+    que la de Graphs.
+
+    Con un GraphSnapshot (mismo formato en disco, abierto con mmap) los
+    vértices del snapshot se leen directo del archivo y los arreglos en
+    memoria solo guardan los que tienen créditos más nuevos.
+    """
+    def __init__(self, actor_movie_service: ActorMovieService, max_vertices: int = None,
+                 snapshot: GraphSnapshot = None):
+        super().__init__(actor_movie_service, max_vertices, snapshot)
+
+    def _inicializar_almacenamiento(self):
+        # Índice denso: id de TMDB -> posición en los arreglos por vértice
+        self._indice = {}
+        self._ids = array('q')
+        # (bloques, vecinos, aristas_pelicula). Se reemplaza la tupla completa al
+        # compactar, así un lector que ya la tomó sigue viendo arreglos coherentes.
+        # - bloques: bloque de cada vértice (SIN_CARGAR si no se ha expandido)
+        # - vecinos: vecino de cada arista (índice denso)
+        # - aristas_pelicula: película de cada arista (índice en la tabla lateral)
+        self._csr = (array('q'), array('q'), array('q'))
+        # Aristas de bloques desalojados o reemplazados que aún ocupan espacio
+        self._aristas_muertas = 0
+        # Tabla lateral de películas: un único dict de atributos por película
+        self._indice_peliculas = {}
+        self._peliculas = []
+
+    def agregar_vertice(self, vertice):
+        """Agrega un vértice si no existe y retorna su índice denso."""
+        indice = self._indice.get(vertice)
+        if indice is None:
+            indice = len(self._ids)
+            self._ids.append(vertice)
+            self._csr[0].append(SIN_CARGAR)
+            self._indice[vertice] = indice
+            self.num_vertices += 1
+        return indice
+
+    def _indice_pelicula(self, attr):
+        """Retorna el índice de la película en la tabla lateral, agregándola si no existe."""
+        movie_id = attr['movie_id']
+        indice = self._indice_peliculas.get(movie_id)
+        if indice is None:
+            indice = len(self._peliculas)
+            self._peliculas.append({
+                'movie_id': movie_id,
+                'movie_title': attr['movie_title'],
+                'poster_path': attr['poster_path']
+            })
+            self._indice_peliculas[movie_id] = indice
+        return indice
+
+    def _agregar_aristas(self, u, edges):
+        # Un bloque CSR no admite inserciones sueltas: las aristas de 'u' entran todas juntas
+        indice_u = self.agregar_vertice(u)
+        bloques, vecinos, aristas_pelicula = self._csr
+
+        # Un vértice que se recarga deja su bloque anterior como espacio muerto
+        self._aristas_muertas += self._grado_bloque(bloques[indice_u])
+        inicio = len(vecinos)
+        for _, destino, attr in edges:
+            vecinos.append(self.agregar_vertice(destino))
+            aristas_pelicula.append(self._indice_pelicula(attr))
+
+        # El bloque se publica al final, cuando ya está completo
+        grado = len(vecinos) - inicio
+        if grado > MASCARA_GRADO:
+            raise ValueError(f"El vértice {u} supera el máximo de vecinos por bloque")
+        bloques[indice_u] = (inicio << BITS_GRADO) | grado
+
+    @staticmethod
+    def _grado_bloque(bloque):
+        return 0 if bloque == SIN_CARGAR else bloque & MASCARA_GRADO
+
+    def _descargar_vertice(self, u):
+        bloques = self._csr[0]
+        indice = self._indice[u]
+        self._aristas_muertas += self._grado_bloque(bloques[indice])
+        bloques[indice] = SIN_CARGAR
+
+        # Compacta cuando más de la mitad de los arreglos son bloques desalojados
+        if self._aristas_muertas * 2 > len(self._csr[1]):
+            self._compactar()
+
+    def _compactar(self):
+        """Reescribe los arreglos de aristas solo con los bloques vigentes."""
+        bloques, vecinos, aristas_pelicula = self._csr
+        nuevos_bloques = array('q')
+        nuevos_vecinos = array('q')
+        nuevas_peliculas = array('q')
+        for bloque in bloques:
+            if bloque == SIN_CARGAR:
+                nuevos_bloques.append(SIN_CARGAR)
+                continue
+            inicio, grado = bloque >> BITS_GRADO, bloque & MASCARA_GRADO
+            nuevos_bloques.append((len(nuevos_vecinos) << BITS_GRADO) | grado)
+            nuevos_vecinos.extend(vecinos[inicio:inicio + grado])
+            nuevas_peliculas.extend(aristas_pelicula[inicio:inicio + grado])
+
+        self._csr = (nuevos_bloques, nuevos_vecinos, nuevas_peliculas)
+        self._aristas_muertas = 0
+
+    def obtener_vecinos(self, vertice):
+        """Retorna la lista de (vecino, attr) de un vértice expandido."""
+        if self._en_snapshot(vertice):
+            return self.snapshot.vecinos(vertice)
+
+        indice = self._indice.get(vertice)
+        if indice is None:
+            return []
+
+        bloques, vecinos, aristas_pelicula = self._csr
+        bloque = bloques[indice]
+        if bloque == SIN_CARGAR:
+            return []
+
+        inicio = bloque >> BITS_GRADO
+        fin = inicio + (bloque & MASCARA_GRADO)
+        ids, peliculas = self._ids, self._peliculas
+        return [
+            (ids[v], peliculas[p])
+            for v, p in zip(vecinos[inicio:fin], aristas_pelicula[inicio:fin])
+        ]
+
+    def grado(self, vertice):
+        if self._en_snapshot(vertice):
+            return self.snapshot.grado(vertice)
+
+        indice = self._indice.get(vertice)
+        if indice is None:
+            return 0
+        return self._grado_bloque(self._csr[0][indice])
+
+    def __str__(self):
+        """Resumen del grafo (los bloques no se imprimen completos)."""
+        return "Grafo CSR ({} Vértices, {} Aristas, {} Películas)\n".format(
+            self.num_vertices, len(self._csr[1]) - self._aristas_muertas, len(self._peliculas)
+        )
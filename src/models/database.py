@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Boolean, func, UniqueConstraint, Float
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Boolean, func, UniqueConstraint, Float, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Index
+from sqlalchemy import Index, DDL, event
 
 Base = declarative_base()
 
@@ -56,4 +56,154 @@ class ActorMovie(Base):
         Index('idx_actor_movie_actor', 'id_actor'),
         Index('idx_actor_movie_movie', 'id_movie'),
         Index('idx_actor_movie_order', 'id_movie', 'order'),  # Útil para ordenar el reparto
-    )
\ No newline at end of file
+    )
+
+class CostarEdge(Base):
+    """
+    Aristas actor -> co-protagonista ya proyectadas: una fila por par con la
+    película compartida más reciente (igual que get_all_actors_asociated_with_one,
+    co-protagonistas con order <= 50 en al menos uno de los dos, así cada par
+    está en ambas direcciones). Se mantiene al insertar créditos.
+    """
+    __tablename__ = 'costar_edges'
+
+    actor_a = Column(BigInteger, primary_key=True)
+    actor_b = Column(BigInteger, primary_key=True)
+    movie_id = Column(BigInteger, ForeignKey('movies.id'), nullable=False)
+    # Copia de movies.release_date para decidir qué película es más reciente al actualizar
+    release_date = Column(String(15))
+
+class IngestionJob(Base):
+    __tablename__ = 'ingestion_jobs'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    actor_id = Column(BigInteger, nullable=False)
+    # pending -> running -> done | failed
+    status = Column(String(20), nullable=False, server_default='pending')
+    movies_total = Column(Integer, nullable=False, server_default='0')
+    movies_fetched = Column(Integer, nullable=False, server_default='0')
+    attempts = Column(Integer, nullable=False, server_default='0')
+    error = Column(String(1000))
+    created_at = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    # Latido del worker: se actualiza con cada avance (detecta jobs huérfanos)
+    updated_at = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        # Un solo job activo por actor: los pedidos concurrentes comparten el mismo
+        Index(
+            'uix_ingestion_jobs_active_actor', 'actor_id', unique=True,
+            postgresql_where=text("status IN ('pending', 'running')")
+        ),
+        Index('idx_ingestion_jobs_status', 'status', 'id'),  # Para tomar el próximo pendiente
+    )
+
+# Búsqueda bidireccional dentro de Postgres (backend 'sql' del grafo): mismas
+# aristas que get_all_actors_asociated_with_one (co-protagonistas con
+# order <= 50 en al menos uno de los dos, la película compartida más reciente) y siempre expande el lado
+# con la frontera más chica. Retorna una fila por arista de la ruta, en orden;
+# vacía si no hay ruta dentro de 'max_saltos'. Los visitados van a tablas
+# temporales de la conexión, así no se arma el grafo en memoria.
+COSTAR_SHORTEST_PATH = DDL("""
+CREATE OR REPLACE FUNCTION costar_shortest_path(inicio bigint, meta bigint, max_saltos integer DEFAULT 12)
+RETURNS TABLE (paso integer, desde bigint, pelicula_id bigint, hacia bigint)
+LANGUAGE plpgsql AS $$
+DECLARE
+    nivel_a integer := 0;
+    nivel_b integer := 0;
+    frontera_a bigint := 1;
+    frontera_b bigint := 1;
+    encuentro bigint;
+    saltos_a integer;
+    saltos_b integer;
+BEGIN
+    CREATE TEMP TABLE IF NOT EXISTS costar_bfs_a (
+        actor bigint PRIMARY KEY, padre bigint, pelicula bigint, nivel integer NOT NULL
+    );
+    CREATE TEMP TABLE IF NOT EXISTS costar_bfs_b (
+        actor bigint PRIMARY KEY, padre bigint, pelicula bigint, nivel integer NOT NULL
+    );
+    TRUNCATE costar_bfs_a, costar_bfs_b;
+    INSERT INTO costar_bfs_a VALUES (inicio, NULL, NULL, 0);
+    INSERT INTO costar_bfs_b VALUES (meta, NULL, NULL, 0);
+
+    WHILE encuentro IS NULL AND frontera_a > 0 AND frontera_b > 0 AND nivel_a + nivel_b < max_saltos LOOP
+        IF frontera_a <= frontera_b THEN
+            INSERT INTO costar_bfs_a (actor, padre, pelicula, nivel)
+            SELECT DISTINCT ON (co.id_actor) co.id_actor, f.actor, co.id_movie, nivel_a + 1
+            FROM costar_bfs_a f
+            JOIN actors_movies am ON am.id_actor = f.actor
+            JOIN actors_movies co ON co.id_movie = am.id_movie AND co.id_actor <> f.actor
+                AND (co."order" <= 50 OR am."order" <= 50)
+            JOIN movies m ON m.id = co.id_movie
+            WHERE f.nivel = nivel_a
+              AND NOT EXISTS (SELECT 1 FROM costar_bfs_a v WHERE v.actor = co.id_actor)
+            ORDER BY co.id_actor, f.actor, m.release_date DESC, m.id DESC;
+            GET DIAGNOSTICS frontera_a = ROW_COUNT;
+            nivel_a := nivel_a + 1;
+            SELECT a.actor INTO encuentro
+            FROM costar_bfs_a a JOIN costar_bfs_b b ON b.actor = a.actor
+            WHERE a.nivel = nivel_a ORDER BY b.nivel, a.actor LIMIT 1;
+        ELSE
+            INSERT INTO costar_bfs_b (actor, padre, pelicula, nivel)
+            SELECT DISTINCT ON (co.id_actor) co.id_actor, f.actor, co.id_movie, nivel_b + 1
+            FROM costar_bfs_b f
+            JOIN actors_movies am ON am.id_actor = f.actor
+            JOIN actors_movies co ON co.id_movie = am.id_movie AND co.id_actor <> f.actor
+                AND (co."order" <= 50 OR am."order" <= 50)
+            JOIN movies m ON m.id = co.id_movie
+            WHERE f.nivel = nivel_b
+              AND NOT EXISTS (SELECT 1 FROM costar_bfs_b v WHERE v.actor = co.id_actor)
+            ORDER BY co.id_actor, f.actor, m.release_date DESC, m.id DESC;
+            GET DIAGNOSTICS frontera_b = ROW_COUNT;
+            nivel_b := nivel_b + 1;
+            SELECT b.actor INTO encuentro
+            FROM costar_bfs_b b JOIN costar_bfs_a a ON a.actor = b.actor
+            WHERE b.nivel = nivel_b ORDER BY a.nivel, b.actor LIMIT 1;
+        END IF;
+    END LOOP;
+
+    IF encuentro IS NULL THEN
+        RETURN;
+    END IF;
+    SELECT a.nivel INTO saltos_a FROM costar_bfs_a a WHERE a.actor = encuentro;
+    SELECT b.nivel INTO saltos_b FROM costar_bfs_b b WHERE b.actor = encuentro;
+
+    -- De inicio al encuentro: (padre, película, actor), el paso es el nivel del actor
+    RETURN QUERY WITH RECURSIVE camino AS (
+        SELECT a.actor, a.padre, a.pelicula, a.nivel FROM costar_bfs_a a WHERE a.actor = encuentro
+        UNION ALL
+        SELECT a.actor, a.padre, a.pelicula, a.nivel FROM costar_bfs_a a JOIN camino c ON a.actor = c.padre
+    )
+    SELECT c.nivel, c.padre, c.pelicula, c.actor FROM camino c WHERE c.padre IS NOT NULL;
+
+    -- Del encuentro a meta: (actor, película, padre), como _reconstruir_ruta_bidireccional
+    RETURN QUERY WITH RECURSIVE camino AS (
+        SELECT b.actor, b.padre, b.pelicula, b.nivel FROM costar_bfs_b b WHERE b.actor = encuentro
+        UNION ALL
+        SELECT b.actor, b.padre, b.pelicula, b.nivel FROM costar_bfs_b b JOIN camino c ON b.actor = c.padre
+    )
+    SELECT saltos_a + saltos_b - c.nivel + 1, c.actor, c.pelicula, c.padre FROM camino c WHERE c.padre IS NOT NULL;
+END;
+$$
+""")
+# create_all la (re)instala siempre, también sobre una base ya creada
+event.listen(Base.metadata, 'after_create', COSTAR_SHORTEST_PATH)
+
+# Búsqueda de actores por nombre (autocompletado local): un índice btree por
+# prefijo para las consultas cortas y, si pg_trgm está disponible, un GIN de
+# trigramas para las coincidencias en cualquier parte del nombre. Sin permisos
+# para crear la extensión solo queda el de prefijo (la búsqueda sigue andando).
+ACTOR_NAME_SEARCH_INDEXES = DDL("""
+CREATE INDEX IF NOT EXISTS idx_actors_name_prefix ON actors (lower(name) text_pattern_ops);
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS idx_actors_name_trgm ON actors USING gin (lower(name) gin_trgm_ops);
+EXCEPTION WHEN insufficient_privilege OR undefined_file OR undefined_object THEN
+    RAISE NOTICE 'pg_trgm no disponible, la busqueda de actores usa solo el indice por prefijo';
+END
+$$;
+""")
+event.listen(Base.metadata, 'after_create', ACTOR_NAME_SEARCH_INDEXES)
@@ -0,0 +1,201 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+# Formato del archivo (little-endian, cada sección alineada a 8 bytes):
+#   cabecera: MAGIC, versión, watermark, n vértices, m aristas, p películas, bytes de texto
+#   ids:              n x int64, ordenados (la posición es el índice denso)
+#   offsets:          (n + 1) x int64, aristas de ids[i] = [offsets[i], offsets[i + 1])
+#   vecinos:          m x int32 (índice denso del co-protagonista)
+#   aristas_pelicula: m x int32 (índice de la película de la arista)
+#   peliculas:        p x int64 (ID de TMDB)
+#   texto_offsets:    (p + 1) x int64 dentro del bloque de texto
+#   texto:            'título\0poster_path' en UTF-8 de cada película
+MAGIC = b'GSN1'
+VERSION = 1
+CABECERA = struct.Struct('<4sHxxqqqqq')
+ORDER_THRESHOLD = 50  # Mismo filtro que get_all_actors_asociated_with_one
+
+
+def _alinear(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class GraphSnapshot:
+    """
+    Snapshot de solo lectura del grafo de co-protagonistas, en arreglos de
+    índices densos (mismo formato lógico que CSRGraphs) y abierto con mmap.
+
+    Abrirlo no lee el archivo: las páginas se cargan bajo demanda y el sistema
+    operativo las comparte entre todos los procesos worker que abren el mismo
+    archivo. Todos los créditos con ID <= 'watermark' están incluidos, así se
+    detectan los créditos insertados después de construirlo (ver
+    ActorMovieService.get_actor_ids_with_credits_since).
+    """
+    def __init__(self, ruta: str):
+        if sys.byteorder != 'little':
+            raise ValueError("El snapshot del grafo solo se puede abrir en máquinas little-endian")
+
+        self.ruta = ruta
+        with open(ruta, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.watermark, n, m, p, bytes_texto = CABECERA.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"Snapshot del grafo inválido o de otra versión: {ruta}")
+
+        vista = memoryview(self._mmap)
+        posicion = CABECERA.size
+
+        def seccion(formato, cantidad, tamano):
+            nonlocal posicion
+            inicio, posicion = posicion, posicion + _alinear(cantidad * tamano)
+            return vista[inicio:inicio + cantidad * tamano].cast(formato)
+
+        self._ids = seccion('q', n, 8)
+        self._offsets = seccion('q', n + 1, 8)
+        self._vecinos = seccion('i', m, 4)
+        self._aristas_pelicula = seccion('i', m, 4)
+        self._peliculas = seccion('q', p, 8)
+        self._texto_offsets = seccion('q', p + 1, 8)
+        self._texto = vista[posicion:posicion + bytes_texto]
+        # Índice de película -> dict de atributos, se decodifica al primer uso
+        self._attrs = {}
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self._ids)
+
+    @property
+    def num_aristas(self) -> int:
+        return len(self._vecinos)
+
+    def _posicion(self, vertice):
+        pos = bisect_left(self._ids, vertice)
+        if pos < len(self._ids) and self._ids[pos] == vertice:
+            return pos
+        return None
+
+    def __contains__(self, vertice) -> bool:
+        return self._posicion(vertice) is not None
+
+    def grado(self, vertice) -> int:
+        pos = self._posicion(vertice)
+        if pos is None:
+            return 0
+        return self._offsets[pos + 1] - self._offsets[pos]
+
+    def vecinos(self, vertice):
+        """Retorna la lista de (vecino, attr) de un vértice (vacía si no está)."""
+        pos = self._posicion(vertice)
+        if pos is None:
+            return []
+        inicio, fin = self._offsets[pos], self._offsets[pos + 1]
+        ids = self._ids
+        return [
+            (ids[v], self._attr_pelicula(p))
+            for v, p in zip(self._vecinos[inicio:fin], self._aristas_pelicula[inicio:fin])
+        ]
+
+    def _attr_pelicula(self, indice):
+        attr = self._attrs.get(indice)
+        if attr is None:
+            texto = bytes(self._texto[self._texto_offsets[indice]:self._texto_offsets[indice + 1]])
+            titulo, poster = texto.decode('utf-8').split('\0')
+            attr = self._attrs.setdefault(indice, {
+                'movie_id': self._peliculas[indice],
+                'movie_title': titulo,
+                'poster_path': poster or None
+            })
+        return attr
+
+    def cerrar(self):
+        """Libera el mapeo (no debe haber búsquedas usando el snapshot)."""
+        for vista in (self._ids, self._offsets, self._vecinos, self._aristas_pelicula,
+                      self._peliculas, self._texto_offsets, self._texto):
+            vista.release()
+        self._mmap.close()
+
+    @staticmethod
+    def construir(peliculas, creditos, watermark: int, ruta: str):
+        """
+        Proyecta los créditos a aristas actor -> co-protagonista y escribe el
+        snapshot. Replica get_all_actors_asociated_with_one: un vecino por
+        co-protagonista (order <= 50 en al menos uno de los dos), con la
+        película compartida más reciente.
+
+        'peliculas': iterable de (id, title, poster_path, release_date)
+        'creditos': iterable de (id_movie, id_actor, order)
+        Retorna (n vértices, m aristas).
+        """
+        if sys.byteorder != 'little':
+            raise ValueError("El snapshot del grafo solo se puede construir en máquinas little-endian")
+
+        indice_pelicula = {}
+        peliculas_ids = array('q')
+        fechas = []
+        texto = bytearray()
+        texto_offsets = array('q', [0])
+        for movie_id, titulo, poster, fecha in peliculas:
+            indice_pelicula[movie_id] = len(peliculas_ids)
+            peliculas_ids.append(movie_id)
+            fechas.append(fecha)
+            texto += f"{titulo or ''}\0{poster or ''}".encode('utf-8')
+            texto_offsets.append(len(texto))
+
+        # actor -> [(película, si el actor tiene order <= 50 en ella)]
+        peliculas_por_actor = defaultdict(list)
+        # película -> reparto con order <= 50 / resto del reparto
+        reparto = defaultdict(list)
+        resto = defaultdict(list)
+        for movie_id, actor_id, order in creditos:
+            p = indice_pelicula.get(movie_id)
+            if p is None:
+                continue
+            # Como en SQL, 'order <= 50' descarta los order nulos
+            principal = order is not None and order <= ORDER_THRESHOLD
+            peliculas_por_actor[actor_id].append((p, principal))
+            (reparto if principal else resto)[p].append(actor_id)
+
+        ids = array('q', sorted(peliculas_por_actor))
+        posicion = {actor_id: i for i, actor_id in enumerate(ids)}
+        offsets = array('q', [0])
+        vecinos = array('i')
+        aristas_pelicula = array('i')
+        for actor_id in ids:
+            # Más recientes primero; como en Postgres, las fechas nulas van primero en DESC
+            peliculas_actor = sorted(
+                peliculas_por_actor[actor_id],
+                key=lambda pp: (fechas[pp[0]] is None, fechas[pp[0]] or ''), reverse=True
+            )
+            vistos = {actor_id}
+            for p, principal in peliculas_actor:
+                # Si el actor tiene order <= 50, todo el reparto es vecino (arista no dirigida)
+                for co_actor in (reparto[p] + resto[p] if principal else reparto[p]):
+                    if co_actor not in vistos:
+                        vistos.add(co_actor)
+                        vecinos.append(posicion[co_actor])
+                        aristas_pelicula.append(p)
+            offsets.append(len(vecinos))
+
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(ruta)), delete=False) as f:
+            f.write(CABECERA.pack(
+                MAGIC, VERSION, watermark, len(ids), len(vecinos), len(peliculas_ids), len(texto)
+            ))
+            for seccion in (ids, offsets, vecinos, aristas_pelicula, peliculas_ids, texto_offsets):
+                datos = seccion.tobytes()
+                f.write(datos + b'\0' * (_alinear(len(datos)) - len(datos)))
+            f.write(texto)
+        # Reemplazo atómico: los procesos que ya lo tenían abierto siguen con el anterior
+        try:
+            os.replace(f.name, ruta)
+        except OSError:
+            os.unlink(f.name)
+            raise
+        return len(ids), len(vecinos)
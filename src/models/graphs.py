@@ -1,28 +1,61 @@
-from collections import deque, defaultdict
+import heapq
+import itertools
+import threading
+import time
+from collections import deque, defaultdict, OrderedDict, Counter
+from contextlib import contextmanager
 from src.services.actor_movie_service import ActorMovieService
+from src.models.graph_snapshot import GraphSnapshot
+from src.services import metrics
 
 class Graphs:
     """
     Representación de un Grafo No Dirigido usando Lista de Adyacencia.
     """
-    def __init__(self, actor_movie_service: ActorMovieService):
+    def __init__(self, actor_movie_service: ActorMovieService, max_vertices: int = None,
+                 snapshot: GraphSnapshot = None):
+        self.num_vertices = 0
+        self.service = actor_movie_service # Referencia al servicio DB
+        # IDs que ya tienen sus vecinos cargados, en orden LRU (el más antiguo primero)
+        self.loaded_vertices = OrderedDict()
+        # Presupuesto de vértices expandidos en memoria (None = sin límite)
+        self.max_vertices = max_vertices
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        # Lock para escrituras del grafo; las lecturas de vecinos no lo toman.
+        self._lock = threading.Lock()
+        # Vértice -> Event de la carga en curso (para no repetir la misma consulta)
+        self._cargas_en_curso = {}
+        # Vértice -> cantidad de búsquedas que lo están recorriendo
+        self._fijados = Counter()
+        # Snapshot en disco (mmap) que sirve los vértices sin consultar la DB.
+        # Los vértices con créditos más nuevos que el snapshot quedan en '_sucios'
+        # y se cargan desde la DB como siempre.
+        self.snapshot = snapshot
+        self._sucios = set()
+        self.snapshot_hits = 0
+        # Vértices invalidados mientras se consultaban (la respuesta ya está vieja)
+        self._invalidados_en_carga = set()
+        self._inicializar_almacenamiento()
+
+    def _inicializar_almacenamiento(self):
+        """Crea las estructuras donde se guardan las aristas (las subclases usan otras)."""
         # El diccionario almacena la lista de adyacencia.
         # {vertice: [vecino1, vecino2, ...]}
         # defaultdict facilita agregar nuevos vértices sin inicialización manual.
         self.lista_adyacencia = defaultdict(list)
-        self.num_vertices = 0
-        self.service = actor_movie_service # Referencia al servicio DB
-        self.loaded_vertices = set() # Conjunto para rastrear qué IDs ya tienen sus vecinos cargados
-        
+
     def agregar_vertice(self, vertice):
         """Agrega un vértice si no existe. (Nodo) id"""
         if vertice not in self.lista_adyacencia:
             self.lista_adyacencia[vertice] = []
             self.num_vertices += 1
 
-    def agregar_arista(self, u, v, attr):
+    def _agregar_arista(self, u, v, attr):
         """
-        Agrega una arista entre u y v.
+        Agrega una arista entre u y v (propio de la lista de adyacencia: las
+        subclases guardan las aristas por bloque en _agregar_aristas).
         Asume un grafo NO DIRIGIDO, por lo que agrega la conexión en ambas direcciones.
         """
         # Asegura que ambos vértices existan en el grafo
@@ -41,29 +74,228 @@ class Graphs:
 
     def obtener_vecinos(self, vertice):
         """Retorna la lista de vecinos de un vértice."""
+        if self._en_snapshot(vertice):
+            return self.snapshot.vecinos(vertice)
         return self.lista_adyacencia.get(vertice, [])
+
+    def grado(self, vertice):
+        """Cantidad de vecinos de un vértice que ya están en memoria."""
+        if self._en_snapshot(vertice):
+            return self.snapshot.grado(vertice)
+        return len(self.lista_adyacencia.get(vertice, ()))
     
     def __str__(self):
         """Representación legible del grafo."""
-        output = "Grafo ({} Vértices):\n".format(self.num_vertices)
-        for u, vecinos in self.lista_adyacencia.items():
-            output += f"  {u}: {vecinos}\n"
+        with self._lock:
+            output = "Grafo ({} Vértices):\n".format(self.num_vertices)
+            for u, vecinos in self.lista_adyacencia.items():
+                output += f"  {u}: {vecinos}\n"
         return output
 
+    def _en_snapshot(self, u):
+        """Indica si los vecinos de 'u' se leen del snapshot (y no de la memoria)."""
+        return (
+            self.snapshot is not None and u not in self.loaded_vertices
+            and u not in self._sucios and u in self.snapshot
+        )
+
+    def _necesita_carga(self, u):
+        """Indica si los vecinos de 'u' aún no están en memoria."""
+        return u not in self.loaded_vertices and not self._en_snapshot(u)
+
     def expandir_vertice(self, u):
         """Carga los vecinos de 'u' desde la DB si aún no se han cargado."""
-        if u not in self.loaded_vertices:
-            # 1. Obtener las aristas (u, v, attr) desde la DB
-            edges = self.service.get_all_actors_asociated_with_one(u)
-            
-            # 2. Agregar las aristas al grafo
-            for origen, destino, attr in edges:
-                self.agregar_arista(origen, destino, attr)
-            
-            # 3. Marcar el vértice como cargado para no consultarlo de nuevo.
-            self.loaded_vertices.add(u)
-            return True
-        return False
+        return self.expandir_vertices([u]) == 1
+
+    def expandir_vertices(self, vertices):
+        """
+        Carga en una sola consulta (por bloques) los vecinos de todos los vértices
+        que aún no estén cargados. Retorna cuántos vértices se cargaron desde la DB.
+
+        Es seguro llamarlo desde varios hilos: si otro hilo ya está cargando un
+        vértice, se espera su resultado en lugar de repetir la consulta.
+        """
+        vertices = list(dict.fromkeys(vertices))
+        propios, ajenos, recargar = [], [], []
+        with self._lock:
+            for u in vertices:
+                if self._en_snapshot(u):
+                    self.snapshot_hits += 1
+                elif not self._necesita_carga(u):
+                    self._tocar(u)
+                elif u in self._cargas_en_curso:
+                    ajenos.append(u)
+                else:
+                    self._cargas_en_curso[u] = threading.Event()
+                    propios.append(u)
+
+        if propios:
+            try:
+                # 1. La consulta a la DB se hace fuera del lock
+                inicio = time.perf_counter()
+                if len(propios) == 1:
+                    aristas_por_vertice = {propios[0]: self._cargar_aristas(propios[0])}
+                else:
+                    aristas_por_vertice = self._cargar_aristas_lote(propios)
+                self._registrar_carga(time.perf_counter() - inicio, len(propios))
+
+                with self._lock:
+                    # 2. Agregar las aristas; los vértices sin aristas también quedan cargados
+                    for u in propios:
+                        self._agregar_aristas(u, aristas_por_vertice.get(u, []))
+                        if u in self._invalidados_en_carga:
+                            # Llegaron créditos nuevos durante la consulta: se descarta y se repite
+                            self._invalidados_en_carga.discard(u)
+                            self._descargar_vertice(u)
+                            recargar.append(u)
+                            continue
+                        self.loaded_vertices[u] = True
+                    self.cache_misses += len(propios)
+
+                    # El nivel que se está expandiendo no se desaloja aunque supere el presupuesto
+                    self._aplicar_presupuesto(vertices)
+            finally:
+                with self._lock:
+                    for u in propios:
+                        self._cargas_en_curso.pop(u).set()
+
+        if recargar:
+            self.expandir_vertices(recargar)
+
+        if ajenos:
+            for u in ajenos:
+                evento = self._cargas_en_curso.get(u)
+                if evento is not None:
+                    evento.wait()
+            # Si la carga del otro hilo falló (o ya se desalojó), se reintenta aquí
+            faltantes = [u for u in ajenos if self._necesita_carga(u)]
+            if faltantes:
+                return len(propios) + self.expandir_vertices(faltantes)
+
+        return len(propios)
+
+    @staticmethod
+    def _registrar_carga(segundos, cantidad):
+        """Métricas de una carga de vértices (en el request, 'expandir' cuenta vértices, no consultas)."""
+        metrics.GRAPH_EXPAND_SECONDS.observe(segundos)
+        metrics.GRAPH_EXPANDED_VERTICES.inc(cantidad)
+        metrics.sumar_al_request('expandir', segundos, cantidad)
+
+    @contextmanager
+    def fijar(self, vertices):
+        """Evita que los vértices dados se desalojen mientras se recorren."""
+        vertices = list(vertices)
+        with self._lock:
+            for u in vertices:
+                self._fijados[u] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                for u in vertices:
+                    self._fijados[u] -= 1
+                    if not self._fijados[u]:
+                        del self._fijados[u]
+
+    def _tocar(self, u):
+        """Registra un acierto y mueve 'u' al final de la cola LRU."""
+        if u in self.loaded_vertices:
+            self.loaded_vertices.move_to_end(u)
+            self.cache_hits += 1
+
+    def _aplicar_presupuesto(self, protegidos):
+        """Desaloja los vértices menos usados hasta respetar max_vertices."""
+        if self.max_vertices is None:
+            return
+        protegidos = set(protegidos)
+        revisados = 0
+        while len(self.loaded_vertices) > self.max_vertices and revisados < len(self.loaded_vertices):
+            u = next(iter(self.loaded_vertices))
+            if u in protegidos or u in self._fijados:
+                # Lo está recorriendo una búsqueda, se desalojará más adelante
+                self.loaded_vertices.move_to_end(u)
+                revisados += 1
+                continue
+            del self.loaded_vertices[u]
+            self._descargar_vertice(u)
+            self.cache_evictions += 1
+
+    def _descargar_vertice(self, u):
+        """
+        Libera los vecinos de 'u'. Volverá a cargarse desde la DB la próxima vez
+        que se expanda. También se liberan las listas parciales (solo aristas
+        inversas) de sus vecinos que no están cargados.
+        """
+        vecinos = self.lista_adyacencia.pop(u, None)
+        if vecinos is None:
+            return
+        self.num_vertices -= 1
+        for v, _ in vecinos:
+            if v not in self.loaded_vertices and self.lista_adyacencia.pop(v, None) is not None:
+                self.num_vertices -= 1
+
+    def invalidar_creditos(self, relaciones):
+        """
+        Se llama al insertar créditos nuevos ({'id_actor', 'id_movie'}): los
+        vértices afectados se vuelven a cargar desde la DB la próxima vez.
+        """
+        if relaciones:
+            self.invalidar_vertices(self._vertices_afectados(relaciones))
+
+    def _vertices_afectados(self, relaciones):
+        """
+        Un crédito nuevo (actor, película) agrega aristas entre el actor y todo
+        el reparto de la película, así que cambian los vecinos de todos ellos.
+        """
+        movie_ids = list({r['id_movie'] for r in relaciones})
+        afectados = set(self.service.get_actor_ids_by_movies(movie_ids))
+        afectados.update(r['id_actor'] for r in relaciones)
+        return afectados
+
+    def invalidar_vertices(self, vertices):
+        """Descarta los vecinos en memoria (o en el snapshot) de los vértices dados."""
+        with self._lock:
+            for u in vertices:
+                if self.snapshot is not None and u in self.snapshot:
+                    self._sucios.add(u)
+                if u in self._cargas_en_curso:
+                    self._invalidados_en_carga.add(u)
+                if u in self.loaded_vertices:
+                    del self.loaded_vertices[u]
+                    self._descargar_vertice(u)
+
+    def estadisticas_cache(self):
+        """Contadores de la caché de vértices expandidos."""
+        with self._lock:
+            return {
+                'vertices_cargados': len(self.loaded_vertices),
+                'max_vertices': self.max_vertices,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'evictions': self.cache_evictions,
+                'snapshot': None if self.snapshot is None else {
+                    'vertices': self.snapshot.num_vertices,
+                    'watermark': self.snapshot.watermark,
+                    'hits': self.snapshot_hits,
+                    'sucios': len(self._sucios)
+                }
+            }
+
+    def _cargar_aristas(self, u):
+        """Consulta en la DB las aristas de 'u' (las subclases pueden cargar otro formato)."""
+        return self.service.get_all_actors_asociated_with_one(u)
+
+    def _cargar_aristas_lote(self, vertices):
+        """Consulta las aristas de varios vértices y las agrupa por vértice de origen."""
+        aristas_por_vertice = defaultdict(list)
+        for origen, destino, attr in self.service.get_all_actors_asociated_with_many(vertices):
+            aristas_por_vertice[origen].append((origen, destino, attr))
+        return aristas_por_vertice
+
+    def _agregar_aristas(self, u, edges):
+        """Agrega al grafo las aristas (u, v, attr) cargadas desde la DB para 'u'."""
+        for origen, destino, attr in edges:
+            self._agregar_arista(origen, destino, attr)
 
     # Unidireccional O(b^d) (lento para listas grande)
     def bfs(self, inicio, meta):
@@ -79,21 +311,24 @@ class Graphs:
 
         while cola:
             u = cola.popleft()
-            
-            # 2. Iterar sobre los vecinos de u que ya están en el grafo
-            for v, attr in self.lista_adyacencia.get(u, []):
-                if v not in visitados:
-                    visitados.add(v)
-                    padres[v] = (u, attr)
-                    
-                    if v == meta:
-                        return self.reconstruir_ruta(inicio, meta, padres)
-                    
-                    cola.append(v)
-                    
-                    # 3. ¡EXPANDIR EL NODO RECIÉN AÑADIDO!
-                    # Para que en la siguiente iteración el BFS pueda explorar más profundo.
-                    self.expandir_vertice(v) # Esto podría consultar la DB si 'v' no estaba cargado
+            with self.fijar((u,)):
+                # Si 'u' fue desalojado por el presupuesto de memoria, se vuelve a cargar
+                self.expandir_vertice(u)
+
+                # 2. Iterar sobre los vecinos de u que ya están en el grafo
+                for v, attr in self.obtener_vecinos(u):
+                    if v not in visitados:
+                        visitados.add(v)
+                        padres[v] = (u, attr)
+
+                        if v == meta:
+                            return self.reconstruir_ruta(inicio, meta, padres)
+
+                        cola.append(v)
+
+                        # 3. ¡EXPANDIR EL NODO RECIÉN AÑADIDO!
+                        # Para que en la siguiente iteración el BFS pueda explorar más profundo.
+                        self.expandir_vertice(v) # Esto podría consultar la DB si 'v' no estaba cargado
         
         return None # No se encontró la ruta
     
@@ -116,12 +351,26 @@ class Graphs:
     
 
     # Bidireccional O(2 b^d/2) (mucho más rápido)
-    def bfs_bidireccional(self, inicio, meta):
-        # 1. Expansión inicial de ambos nodos
-        self.expandir_vertice(inicio)
-        self.expandir_vertice(meta)
+    def bfs_bidireccional(self, inicio, meta, estadisticas=None):
+        """
+        BFS desde ambos extremos, un nivel por lado a la vez, hasta que las
+        fronteras se tocan.
+
+        Si se pasa 'estadisticas' (dict) se llena con los vértices expandidos
+        y el tamaño de la frontera de cada nivel por lado, las cargas desde la
+        DB, los aciertos en memoria y el tiempo de cada fase.
+        """
+        if estadisticas is not None:
+            self._iniciar_estadisticas(
+                estadisticas, expandidos_a=0, expandidos_b=0, fronteras_a=[], fronteras_b=[]
+            )
+        inicio_busqueda = time.perf_counter()
+
+        # 1. Expansión inicial de ambos nodos (una sola consulta)
+        self._cargar_nivel([inicio, meta], estadisticas)
 
         if inicio == meta:
+            self._cerrar_estadisticas(estadisticas, inicio_busqueda)
             return [(inicio, None, meta)]
 
         # --- Estructuras para la búsqueda desde A (adelante) ---
@@ -138,41 +387,260 @@ class Graphs:
 
         while cola_a and cola_b:
             # --- Expandir un nivel desde A ---
-            punto_encuentro = self._expandir_nivel(cola_a, visitados_a, padres_a, visitados_b)
+            punto_encuentro = self._expandir_nivel(cola_a, visitados_a, padres_a, visitados_b, estadisticas, 'a')
             if punto_encuentro:
                 break
 
             # --- Paso 2: Expandir un nivel desde B ---
-            punto_encuentro = self._expandir_nivel(cola_b, visitados_b, padres_b, visitados_a)
+            punto_encuentro = self._expandir_nivel(cola_b, visitados_b, padres_b, visitados_a, estadisticas, 'b')
             if punto_encuentro:
                 break
         
+        self._cerrar_estadisticas(estadisticas, inicio_busqueda)
         if punto_encuentro:
             return self._reconstruir_ruta_bidireccional(inicio, meta, punto_encuentro, padres_a, padres_b)
         
         return None # No se encontró la ruta
 
-    def _expandir_nivel(self, cola, visitados_propios, padres_propios, visitados_oponente):
-        # Procesa todos los nodos del nivel actual en la cola
-        nodos_en_nivel = len(cola)
-        for _ in range(nodos_en_nivel):
-            u = cola.popleft()
+    def _expandir_nivel(self, cola, visitados_propios, padres_propios, visitados_oponente, estadisticas=None, lado=None):
+        nivel = list(cola)
+        if estadisticas is not None:
+            estadisticas[f'expandidos_{lado}'] += len(nivel)
+            estadisticas[f'fronteras_{lado}'].append(len(nivel))
+        with self.fijar(nivel):
+            # Carga desde la DB todo el nivel de una vez en lugar de un nodo a la vez
+            self._cargar_nivel(nivel, estadisticas)
+
+            # Procesa todos los nodos del nivel actual en la cola
+            for _ in range(len(nivel)):
+                u = cola.popleft()
 
-            # Expande el nodo si es necesario (carga desde DB)
-            self.expandir_vertice(u)
-
-            for v, attr in self.lista_adyacencia.get(u, []):
-                if v not in visitados_propios:
-                    visitados_propios.add(v)
-                    padres_propios[v] = (u, attr)
-                    cola.append(v)
-                    
-                    # CONDICIÓN DE ENCUENTRO
-                    if v in visitados_oponente:
-                        # Hemos encontrado un nodo visitado por la otra búsqueda
-                        return v # ¡Ruta encontrada!
+                for v, attr in self.obtener_vecinos(u):
+                    if v not in visitados_propios:
+                        visitados_propios.add(v)
+                        padres_propios[v] = (u, attr)
+                        cola.append(v)
+
+                        # CONDICIÓN DE ENCUENTRO
+                        if v in visitados_oponente and self._es_punto_de_encuentro(v):
+                            # Hemos encontrado un nodo visitado por la otra búsqueda
+                            return v # ¡Ruta encontrada!
         return None
 
+    @staticmethod
+    def _iniciar_estadisticas(estadisticas, **propias):
+        """Campos comunes de las estadísticas de búsqueda, más los propios del algoritmo."""
+        estadisticas.update({
+            'cargas_db': 0, 'lotes_db': 0, 'aciertos_cache': 0,
+            'tiempos_ms': {'carga': 0.0, 'recorrido': 0.0, 'total': 0.0},
+            **propias
+        })
+
+    def _cargar_nivel(self, nivel, estadisticas=None):
+        """
+        expandir_vertices(nivel) contando, si hay 'estadisticas', los vértices
+        cargados desde la DB, los que ya estaban en memoria (o en el snapshot)
+        y el tiempo de la carga.
+        """
+        if estadisticas is None:
+            return self.expandir_vertices(nivel)
+        inicio = time.perf_counter()
+        cargados = self.expandir_vertices(nivel)
+        estadisticas['tiempos_ms']['carga'] += (time.perf_counter() - inicio) * 1000
+        estadisticas['cargas_db'] += cargados
+        estadisticas['lotes_db'] += 1 if cargados else 0
+        # Una recarga por invalidación cuenta dos veces como carga, nunca como acierto
+        estadisticas['aciertos_cache'] += max(0, len(set(nivel)) - cargados)
+        return cargados
+
+    @staticmethod
+    def _cerrar_estadisticas(estadisticas, inicio):
+        """Tiempo total de la búsqueda; el recorrido es lo que no fue carga de vértices."""
+        if estadisticas is None:
+            return
+        tiempos = estadisticas['tiempos_ms']
+        tiempos['total'] = (time.perf_counter() - inicio) * 1000
+        tiempos['recorrido'] = max(0.0, tiempos['total'] - tiempos['carga'])
+        for fase in tiempos:
+            tiempos[fase] = round(tiempos[fase], 3)
+
+    # Bidireccional balanceada: expande siempre la frontera más barata
+    def bfs_bidireccional_balanceada(self, inicio, meta, estadisticas=None):
+        """
+        Igual que bfs_bidireccional, pero en cada paso expande el lado cuya
+        frontera es más barata (suma de grados estimados), así un actor con
+        miles de co-protagonistas no dispara la búsqueda. El nivel donde se
+        encuentran las fronteras se termina completo y se elige el punto de
+        encuentro con menor distancia total.
+
+        Si se pasa 'estadisticas' (dict) se llena con los vértices expandidos
+        y niveles recorridos por cada lado, además de los campos de
+        bfs_bidireccional (fronteras, cargas desde la DB y tiempos).
+        """
+        if estadisticas is not None:
+            self._iniciar_estadisticas(
+                estadisticas, expandidos_a=0, expandidos_b=0, niveles_a=0, niveles_b=0,
+                fronteras_a=[], fronteras_b=[]
+            )
+        inicio_busqueda = time.perf_counter()
+
+        self._cargar_nivel([inicio, meta], estadisticas)
+
+        if inicio == meta:
+            self._cerrar_estadisticas(estadisticas, inicio_busqueda)
+            return [(inicio, None, meta)]
+
+        cola_a, distancia_a, padres_a = deque([inicio]), {inicio: 0}, {inicio: None}
+        cola_b, distancia_b, padres_b = deque([meta]), {meta: 0}, {meta: None}
+
+        # Grado promedio observado, para estimar vértices de la frontera aún sin cargar
+        grado_total = self.grado(inicio) + self.grado(meta)
+        expandidos = 2
+
+        encuentros = []
+        while cola_a and cola_b and not encuentros:
+            promedio = grado_total / expandidos
+            if self._costo_frontera(cola_a, promedio) <= self._costo_frontera(cola_b, promedio):
+                lado, cola, distancia, padres, distancia_oponente = 'a', cola_a, distancia_a, padres_a, distancia_b
+            else:
+                lado, cola, distancia, padres, distancia_oponente = 'b', cola_b, distancia_b, padres_b, distancia_a
+
+            nodos_en_nivel = len(cola)
+            grado_total += self._expandir_nivel_completo(
+                cola, distancia, padres, distancia_oponente, encuentros, estadisticas
+            )
+            expandidos += nodos_en_nivel
+
+            if estadisticas is not None:
+                estadisticas[f'expandidos_{lado}'] += nodos_en_nivel
+                estadisticas[f'niveles_{lado}'] += 1
+                estadisticas[f'fronteras_{lado}'].append(nodos_en_nivel)
+
+        self._cerrar_estadisticas(estadisticas, inicio_busqueda)
+        if not encuentros:
+            return None # No se encontró la ruta
+
+        punto_encuentro = min(encuentros, key=lambda v: distancia_a[v] + distancia_b[v])
+        return self._reconstruir_ruta_bidireccional(inicio, meta, punto_encuentro, padres_a, padres_b)
+
+    def _costo_frontera(self, cola, grado_promedio):
+        """Estima cuántas aristas habrá que recorrer para expandir la frontera."""
+        return sum(
+            grado_promedio if self._necesita_carga(u) else self.grado(u)
+            for u in cola
+        )
+
+    def _expandir_nivel_completo(self, cola, distancia_propia, padres_propios, distancia_oponente, encuentros,
+                                 estadisticas=None):
+        """
+        Expande todo el nivel actual sin cortar en el primer encuentro; agrega a
+        'encuentros' cada vértice que ya había visitado el otro lado.
+        Retorna la suma de grados de los vértices expandidos.
+        """
+        nivel = list(cola)
+        grados = 0
+        with self.fijar(nivel):
+            self._cargar_nivel(nivel, estadisticas)
+
+            for _ in range(len(nivel)):
+                u = cola.popleft()
+                grados += self.grado(u)
+
+                for v, attr in self.obtener_vecinos(u):
+                    if v not in distancia_propia:
+                        distancia_propia[v] = distancia_propia[u] + 1
+                        padres_propios[v] = (u, attr)
+                        cola.append(v)
+
+                        if v in distancia_oponente and self._es_punto_de_encuentro(v):
+                            encuentros.append(v)
+        return grados
+
+    def _es_punto_de_encuentro(self, v):
+        """Indica si las dos búsquedas pueden unirse en 'v' (las subclases restringen)."""
+        return True
+
+    # A* guiado por landmarks (ALT): expande hacia la meta en lugar de en todas direcciones
+    def a_estrella(self, inicio, meta, landmarks, estadisticas=None):
+        """
+        Búsqueda A* con la cota inferior del índice de landmarks como
+        heurística. Con aristas de costo 1, f(v) = g(v) + h(v) prioriza los
+        vértices que la desigualdad triangular ubica cerca de la meta, así se
+        expanden muchos menos vértices que con BFS.
+
+        Es una búsqueda desde un solo lado: depende de que obtener_vecinos de
+        un vértice recién cargado devuelva todas sus aristas, en ambos
+        sentidos. Los cargadores devuelven las aristas no dirigidas (ver
+        get_all_actors_asociated_with_one), así que no importa el orden de
+        carga ni qué vértices se desalojaron (benchmarks/paridad_grafos.py
+        la compara con la distancia real en todos los backends).
+
+        Si el índice está desactualizado (aristas nuevas) la heurística puede
+        dejar de ser consistente: un vértice se reabre cuando aparece un
+        camino más corto hacia él.
+
+        Si se pasa 'estadisticas' (dict) se llena con los vértices expandidos
+        y reabiertos, las cargas desde la DB y los tiempos.
+        """
+        if estadisticas is not None:
+            self._iniciar_estadisticas(estadisticas, expandidos=0, reabiertos=0)
+        inicio_busqueda = time.perf_counter()
+
+        self._cargar_nivel([inicio, meta], estadisticas)
+
+        if inicio == meta:
+            self._cerrar_estadisticas(estadisticas, inicio_busqueda)
+            return [(inicio, None, meta)]
+
+        heuristica = self._heuristica_landmarks(meta, landmarks)
+        g = {inicio: 0}
+        h = {inicio: heuristica(inicio)}
+        padres = {inicio: None}
+        cerrados = set()
+        # (f, -g, orden, vértice): a igual f se prefiere el más profundo
+        desempate = itertools.count()
+        abiertos = [(h[inicio], 0, next(desempate), inicio)]
+
+        while abiertos:
+            # Se sacan juntos todos los vértices con la prioridad (f, g) mínima:
+            # A* los expandiría igual antes que a cualquier otro, y así se
+            # cargan desde la DB en una sola consulta.
+            prioridad = abiertos[0][:2]
+            grupo = []
+            while abiertos and abiertos[0][:2] == prioridad:
+                _, menos_g, _, u = heapq.heappop(abiertos)
+                # Se descartan entradas viejas (ya hay un camino más corto) y repetidas
+                if -menos_g == g[u] and u not in grupo:
+                    grupo.append(u)
+            if meta in grupo:
+                self._cerrar_estadisticas(estadisticas, inicio_busqueda)
+                return self._reconstruir_ruta_bidireccional(inicio, meta, meta, padres, {meta: None})
+
+            if estadisticas is not None:
+                estadisticas['expandidos'] += len(grupo)
+                estadisticas['reabiertos'] += sum(1 for u in grupo if u in cerrados)
+            cerrados.update(grupo)
+
+            with self.fijar(grupo):
+                self._cargar_nivel(grupo, estadisticas)
+
+                for u in grupo:
+                    g_v = g[u] + 1
+                    for v, attr in self.obtener_vecinos(u):
+                        if g_v < g.get(v, g_v + 1):
+                            g[v] = g_v
+                            padres[v] = (u, attr)
+                            # Pathmax: d(v) >= d(u) - 1, corrige vértices sin cota en el índice
+                            h[v] = max(h.get(v, 0), heuristica(v), h[u] - 1)
+                            heapq.heappush(abiertos, (g_v + h[v], -g_v, next(desempate), v))
+
+        self._cerrar_estadisticas(estadisticas, inicio_busqueda)
+        return None # No se encontró la ruta
+
+    def _heuristica_landmarks(self, meta, landmarks):
+        """Cota inferior de saltos hasta 'meta' (las subclases ajustan la escala)."""
+        return landmarks.heuristica_hacia(meta)
+
     def _reconstruir_ruta_bidireccional(self, inicio, meta, punto_encuentro, padres_a, padres_b):
         # Reconstruye desde A hasta el punto de encuentro
         camino_a = []
@@ -0,0 +1,239 @@
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+# Formato del archivo (little-endian):
+#   cabecera: MAGIC, versión, cantidad de actores (n), cantidad de landmarks (k)
+#   ids:        n x int64, ordenados (la posición es el índice denso del actor)
+#   landmarks:  k x int64
+#   distancias: k x n x uint8, una fila por landmark
+MAGIC = b'ALT1'
+# v2: mismas aristas que el grafo en memoria (order <= 50 en al menos uno de los dos)
+VERSION = 2
+CABECERA = struct.Struct('<4sHII')
+# Las distancias se guardan en un byte; 255 = el landmark no llega al actor
+INALCANZABLE = 255
+MAX_DISTANCIA = INALCANZABLE - 1
+ORDER_THRESHOLD = 50  # Mismo filtro que get_all_actors_asociated_with_one
+
+
+class LandmarkIndex:
+    """
+    Índice de landmarks (ALT) para estimar la separación entre dos actores.
+
+    Se eligen K actores populares (landmarks) y se guarda la distancia, en
+    saltos actor -> actor, desde cada landmark a todos los actores. Por la
+    desigualdad triangular, para cualquier par (a, b):
+
+        max_L |d(L, a) - d(L, b)|  <=  d(a, b)  <=  min_L d(L, a) + d(L, b)
+
+    Ambas cotas cuestan O(K) y la inferior sirve como heurística admisible
+    para A* (Graphs.a_estrella).
+
+    El índice usa las mismas aristas que el grafo en memoria: dos actores son
+    co-protagonistas si comparten una película donde al menos uno tiene
+    order <= 50. Así ambas cotas valen para las distancias de la búsqueda.
+
+    El índice refleja la tabla 'actors_movies' al momento de construirlo: los
+    actores agregados después no tienen cotas y las películas nuevas pueden
+    acortar distancias, por eso conviene reconstruirlo periódicamente.
+    """
+    def __init__(self, ids: array, landmarks: array, distancias: array):
+        self.ids = ids
+        self.landmarks = landmarks
+        self.distancias = distancias
+
+    @property
+    def k(self) -> int:
+        return len(self.landmarks)
+
+    @property
+    def num_actores(self) -> int:
+        return len(self.ids)
+
+    def _posicion(self, actor_id):
+        """Índice denso del actor (búsqueda binaria sobre los IDs ordenados) o None."""
+        pos = bisect_left(self.ids, actor_id)
+        if pos < len(self.ids) and self.ids[pos] == actor_id:
+            return pos
+        return None
+
+    def distancias_de(self, actor_id):
+        """Distancias desde cada landmark al actor, o None si no está en el índice."""
+        pos = self._posicion(actor_id)
+        if pos is None:
+            return None
+        # Columna 'pos' de la matriz k x n (un slice con paso, sin recorrer en Python)
+        return self.distancias[pos::len(self.ids)]
+
+    def estimar(self, actor_a: int, actor_b: int):
+        """
+        Cotas de la separación entre dos actores:
+        {'inferior', 'superior', 'conectados'}, o None si alguno no está en el índice.
+        'superior' es None si ningún landmark llega a ambos.
+        """
+        fila_a = self.distancias_de(actor_a)
+        fila_b = self.distancias_de(actor_b)
+        if fila_a is None or fila_b is None:
+            return None
+        if actor_a == actor_b:
+            return {'inferior': 0, 'superior': 0, 'conectados': True}
+
+        inferior, superior = 1, None
+        for da, db in zip(fila_a, fila_b):
+            if (da == INALCANZABLE) != (db == INALCANZABLE):
+                # Un landmark llega a uno solo: están en componentes distintas
+                return {'inferior': None, 'superior': None, 'conectados': False}
+            if da == INALCANZABLE:
+                continue
+            inferior = max(inferior, abs(da - db))
+            if superior is None or da + db < superior:
+                superior = da + db
+        return {'inferior': inferior, 'superior': superior, 'conectados': True}
+
+    def heuristica_hacia(self, meta: int):
+        """
+        Retorna h(v), la cota inferior de d(v, meta) en saltos actor -> actor.
+        La fila de 'meta' se lee una sola vez; los actores fuera del índice
+        (o landmarks que no llegan a ambos) aportan 0, así h sigue siendo admisible.
+        """
+        fila_meta = self.distancias_de(meta)
+        if fila_meta is None:
+            return lambda v: 0
+
+        def h(v):
+            fila_v = self.distancias_de(v)
+            if fila_v is None:
+                return 0
+            cota = 0
+            for dv, dm in zip(fila_v, fila_meta):
+                if dv != INALCANZABLE and dm != INALCANZABLE:
+                    cota = max(cota, abs(dv - dm))
+            return cota
+        return h
+
+    @classmethod
+    def construir(cls, creditos, candidatos, k: int = 16):
+        """
+        Construye el índice a partir de los créditos (id_movie, id_actor, order).
+        'candidatos' son IDs de actores ordenados por popularidad descendente;
+        se toman los primeros K que estén en el grafo y que no sean
+        co-protagonistas directos de un landmark ya elegido (aportarían casi
+        la misma información).
+
+        El BFS recorre el grafo bipartito actor -> película -> actor, sin
+        proyectar cada reparto a un clique.
+        """
+        creditos_por_actor_id = defaultdict(list)
+        for id_movie, id_actor, order in creditos:
+            # Como en SQL, 'order <= 50' descarta los order nulos
+            creditos_por_actor_id[id_actor].append((id_movie, order is not None and order <= ORDER_THRESHOLD))
+
+        ids = array('q', sorted(creditos_por_actor_id))
+        posicion = {actor_id: i for i, actor_id in enumerate(ids)}
+        indice_pelicula = {}
+        # Por actor: (película << 1) | 1 si el actor tiene order <= 50 en ella
+        peliculas_por_actor = []
+        # Por película: reparto con order <= 50 y el resto
+        principales_por_pelicula = []
+        secundarios_por_pelicula = []
+        for actor_id in ids:
+            peliculas = []
+            for id_movie, principal in creditos_por_actor_id[actor_id]:
+                m = indice_pelicula.get(id_movie)
+                if m is None:
+                    m = indice_pelicula[id_movie] = len(principales_por_pelicula)
+                    principales_por_pelicula.append([])
+                    secundarios_por_pelicula.append([])
+                (principales_por_pelicula if principal else secundarios_por_pelicula)[m].append(posicion[actor_id])
+                peliculas.append((m << 1) | principal)
+            peliculas_por_actor.append(peliculas)
+        del creditos_por_actor_id
+
+        landmarks = array('q')
+        distancias = array('B')
+        filas = []
+        for actor_id in candidatos:
+            if len(landmarks) >= k:
+                break
+            origen = posicion.get(actor_id)
+            if origen is None:
+                continue
+            if any(fila[origen] <= 1 for fila in filas):
+                continue
+            fila = cls._bfs(origen, peliculas_por_actor, principales_por_pelicula, secundarios_por_pelicula)
+            filas.append(fila)
+            landmarks.append(actor_id)
+            distancias.extend(fila)
+
+        return cls(ids, landmarks, distancias)
+
+    @staticmethod
+    def _bfs(origen, peliculas_por_actor, principales_por_pelicula, secundarios_por_pelicula):
+        """
+        Distancias (en saltos actor -> actor) desde 'origen' a todos los actores.
+        Desde una película un actor principal llega a todo el reparto y uno
+        secundario solo a los principales.
+        """
+        distancia = array('B', [INALCANZABLE]) * len(peliculas_por_actor)
+        # Por película: 1 = ya se recorrieron los principales, 2 = todo el reparto
+        pelicula_vista = bytearray(len(principales_por_pelicula))
+        distancia[origen] = 0
+        frontera = [origen]
+        d = 0
+        while frontera and d < MAX_DISTANCIA:
+            d += 1
+            siguiente = []
+            for a in frontera:
+                for pelicula in peliculas_por_actor[a]:
+                    m, principal = pelicula >> 1, pelicula & 1
+                    vista = pelicula_vista[m]
+                    if vista == 2 or (vista == 1 and not principal):
+                        continue
+                    repartos = [secundarios_por_pelicula[m]] if principal else []
+                    if not vista:
+                        repartos.append(principales_por_pelicula[m])
+                    pelicula_vista[m] = 2 if principal else 1
+                    for reparto in repartos:
+                        for b in reparto:
+                            if distancia[b] == INALCANZABLE:
+                                distancia[b] = d
+                                siguiente.append(b)
+            frontera = siguiente
+        return distancia
+
+    def guardar(self, ruta: str):
+        """Escribe el índice en formato binario compacto (reemplazo atómico)."""
+        ids, landmarks = self.ids, self.landmarks
+        if sys.byteorder == 'big':
+            ids, landmarks = array('q', ids), array('q', landmarks)
+            ids.byteswap()
+            landmarks.byteswap()
+
+        temporal = ruta + '.tmp'
+        with open(temporal, 'wb') as f:
+            f.write(CABECERA.pack(MAGIC, VERSION, len(self.ids), self.k))
+            ids.tofile(f)
+            landmarks.tofile(f)
+            self.distancias.tofile(f)
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta: str):
+        """Lee un índice escrito con guardar()."""
+        with open(ruta, 'rb') as f:
+            magic, version, n, k = CABECERA.unpack(f.read(CABECERA.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Archivo de landmarks inválido o de otra versión: {ruta}")
+            ids, landmarks, distancias = array('q'), array('q'), array('B')
+            ids.fromfile(f, n)
+            landmarks.fromfile(f, k)
+            distancias.fromfile(f, n * k)
+
+        if sys.byteorder == 'big':
+            ids.byteswap()
+            landmarks.byteswap()
+        return cls(ids, landmarks, distancias)
@@ -0,0 +1,64 @@
+import time
+from src.models.graphs import Graphs
+from src.services.actor_movie_service import ActorMovieService
+
+class SQLGraphs(Graphs):
+    """
+    Grafo sin almacenamiento en memoria: la búsqueda bidireccional corre
+    dentro de Postgres (función costar_shortest_path, instalada junto con las
+    tablas) y solo viaja la ruta encontrada.
+
+    Pensado para workers que no pueden mantener un grafo grande en memoria;
+    cada búsqueda cuesta consultas en la DB en vez de memoria del proceso.
+    Todas las estrategias de búsqueda usan el mismo motor (los landmarks no
+    aplican) y las rutas tienen el mismo formato que
+    _reconstruir_ruta_bidireccional: [(actor, attr, actor), ...].
+    """
+    def __init__(self, actor_movie_service: ActorMovieService, max_saltos: int = 12):
+        super().__init__(actor_movie_service)
+        self.max_saltos = max_saltos
+        self.busquedas = 0
+        self.sin_ruta = 0
+
+    def bfs_bidireccional(self, inicio, meta, estadisticas=None):
+        """
+        Con 'estadisticas' solo se informa el motor y el tiempo total: la
+        expansión ocurre dentro de Postgres y no vuelve al proceso.
+        """
+        if inicio == meta:
+            return [(inicio, None, meta)]
+
+        comienzo = time.perf_counter()
+        ruta = self.service.find_path_in_db(inicio, meta, self.max_saltos)
+        if estadisticas is not None:
+            estadisticas.update({
+                'motor': 'postgres', 'max_saltos': self.max_saltos, 'lotes_db': 1,
+                'tiempos_ms': {'total': round((time.perf_counter() - comienzo) * 1000, 3)}
+            })
+        with self._lock:
+            self.busquedas += 1
+            if not ruta:
+                self.sin_ruta += 1
+        return ruta or None
+
+    def bfs(self, inicio, meta):
+        return self.bfs_bidireccional(inicio, meta)
+
+    def bfs_bidireccional_balanceada(self, inicio, meta, estadisticas=None):
+        # La función ya expande siempre la frontera más chica
+        return self.bfs_bidireccional(inicio, meta, estadisticas)
+
+    def a_estrella(self, inicio, meta, landmarks, estadisticas=None):
+        return self.bfs_bidireccional(inicio, meta, estadisticas)
+
+    def invalidar_creditos(self, relaciones):
+        """No hay vértices en memoria: la función lee siempre los créditos actuales."""
+
+    def estadisticas_cache(self):
+        with self._lock:
+            return {
+                'motor': 'postgres',
+                'max_saltos': self.max_saltos,
+                'busquedas': self.busquedas,
+                'sin_ruta': self.sin_ruta
+            }
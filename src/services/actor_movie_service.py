@@ -1,13 +1,42 @@
-from src.models.database import ActorMovie, Movie, Actor
+from src.models.database import ActorMovie, Movie, Actor, CostarEdge
 from src.interfaces.models_interface import MovieInterface, ActorInteface
-from sqlalchemy import and_, tuple_, func, distinct
+from sqlalchemy import and_, or_, tuple_, func, distinct, text
 from typing import List
+import time
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+from src.services.copy_bulk_loader import CopyBulkLoader
+
+# Cantidad de IDs por consulta en las cargas por lote (evita IN gigantes)
+BATCH_CHUNK_SIZE = 500
 
 class ActorMovieService:
-    def __init__(self, db_session):
+    def __init__(self, db_session, bulk_loader: CopyBulkLoader = None, use_costar_edges: bool = False):
         self.db_session = db_session
+        # Carga con COPY + staging para add_actor_to_movies_bulk (None = INSERT ... VALUES)
+        self.bulk_loader = bulk_loader
+        # Leer las aristas de 'costar_edges' en lugar de proyectarlas en cada consulta.
+        # La tabla se mantiene siempre; leerla requiere haberla llenado con 'flask backfill-costar-edges'
+        self.use_costar_edges = use_costar_edges
+        # Funciones a llamar cuando se insertan créditos nuevos (p. ej. invalidar el grafo)
+        self._listeners = []
+
+    def suscribir(self, callback):
+        """
+        Registra 'callback(relaciones)' para cada inserción de créditos, con la
+        lista de {'id_actor', 'id_movie', ...} que se agregaron (tras el commit).
+        """
+        self._listeners.append(callback)
+
+    def _notificar(self, relaciones: List[dict]):
+        for callback in self._listeners:
+            try:
+                callback(relaciones)
+            except Exception as e:
+                # Un listener con error no debe deshacer una inserción ya confirmada
+                print(f"Error notificando créditos nuevos: {e}")
 
     def get_actor_movie_by_id(self, actor_movie_id):
         """ Traer una relación actor-película por su ID """
@@ -73,30 +102,119 @@ class ActorMovieService:
         
         self.db_session.add(nueva_relacion)
         self.db_session.commit()
+        self.__refresh_costar_edges__([id_movie])
+        self._notificar([{'id_actor': id_actor, 'id_movie': id_movie}])
         return nueva_relacion
     
     def add_actor_to_movies_bulk(self, relations: List[dict]):
-        """Agrega múltiples relaciones actor-película en una sola transacción"""
-        existing = set(
-            (r.id_actor, r.id_movie)
-            for r in self.db_session.query(ActorMovie.id_actor, ActorMovie.id_movie)
-            .filter(
-                tuple_(ActorMovie.id_actor, ActorMovie.id_movie).in_(
-                    [(r['id_actor'], r['id_movie']) for r in relations]
-                )
-            )
-            .all()
-        )
-        
-        # Filtrar solo las relaciones que no existen
+        """
+        Agrega múltiples relaciones actor-película en una sola transacción.
+        Usa INSERT ... ON CONFLICT DO NOTHING: si otra ingesta concurrente ya
+        insertó el mismo par no falla, y RETURNING indica cuáles eran nuevas.
+        Con 'bulk_loader' las filas van por COPY y un solo merge.
+        """
+        if self.bulk_loader is not None:
+            new_pairs = self.bulk_loader.load_actor_movies(relations)
+        else:
+            self.__assign_xid__()
+            new_pairs = set()
+            for i in range(0, len(relations), BATCH_CHUNK_SIZE):
+                stmt = insert(ActorMovie).values(relations[i:i + BATCH_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_nothing(constraint='uix_actor_movie')\
+                    .returning(ActorMovie.id_actor, ActorMovie.id_movie)
+                new_pairs.update((row.id_actor, row.id_movie) for row in self.db_session.execute(stmt))
+            self.db_session.commit()
+
         new_relations = [
             r for r in relations
-            if (r['id_actor'], r['id_movie']) not in existing
+            if (r['id_actor'], r['id_movie']) in new_pairs
         ]
-        
         if new_relations:
-            self.db_session.bulk_insert_mappings(ActorMovie, new_relations)
-            self.db_session.commit()
+            self.__refresh_costar_edges__(sorted({r['id_movie'] for r in new_relations}))
+            self._notificar(new_relations)
+
+    def __assign_xid__(self):
+        """
+        Asigna el xid de la transacción antes de insertar créditos. Sin esto,
+        un INSERT ... ON CONFLICT puede tomar un ID y quedar esperando a otra
+        transacción antes de tener xid, y get_credits_horizon no lo vería en
+        curso. (El COPY ya escribe la staging antes del merge.)
+        """
+        self.db_session.execute(text("SELECT pg_current_xact_id()"))
+
+    def update_costar_edges(self, movie_ids: List[int]):
+        """
+        Recalcula las aristas de 'costar_edges' que salen de los repartos de
+        las películas dadas. Cada par se queda con la película compartida más
+        reciente entre la que ya tenía y las nuevas, así que es idempotente y
+        sirve tanto para créditos nuevos como para el backfill.
+        """
+        for i in range(0, len(movie_ids), BATCH_CHUNK_SIZE):
+            chunk = movie_ids[i:i + BATCH_CHUNK_SIZE]
+
+            origen = aliased(ActorMovie)
+            co_actor = aliased(ActorMovie)
+            # Un candidato por par: el más reciente (fechas nulas primero, como el DESC de Postgres)
+            candidatos = select(
+                origen.id_actor, co_actor.id_actor, Movie.id, Movie.release_date
+            ).select_from(origen)\
+            .join(co_actor, co_actor.id_movie == origen.id_movie)\
+            .join(Movie, Movie.id == origen.id_movie)\
+            .where(
+                origen.id_movie.in_(chunk),
+                co_actor.id_actor != origen.id_actor,
+                or_(co_actor.order <= 50, origen.order <= 50)
+            ).distinct(origen.id_actor, co_actor.id_actor)\
+            .order_by(
+                origen.id_actor, co_actor.id_actor,
+                Movie.release_date.is_(None).desc(), Movie.release_date.desc(), Movie.id.desc()
+            )
+
+            stmt = insert(CostarEdge).from_select(
+                ['actor_a', 'actor_b', 'movie_id', 'release_date'], candidatos
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['actor_a', 'actor_b'],
+                set_={'movie_id': stmt.excluded.movie_id, 'release_date': stmt.excluded.release_date},
+                where=tuple_(
+                    stmt.excluded.release_date.is_(None),
+                    func.coalesce(stmt.excluded.release_date, ''),
+                    stmt.excluded.movie_id
+                ) > tuple_(
+                    CostarEdge.release_date.is_(None),
+                    func.coalesce(CostarEdge.release_date, ''),
+                    CostarEdge.movie_id
+                )
+            )
+            self.db_session.execute(stmt)
+        self.db_session.commit()
+
+    def __refresh_costar_edges__(self, movie_ids: List[int]):
+        """
+        Igual que un listener: los créditos ya están confirmados, así que un
+        error aquí solo se informa (el backfill reconstruye lo que falte).
+        """
+        try:
+            self.update_costar_edges(movie_ids)
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error actualizando costar_edges: {e}")
+
+    def rebuild_costar_edges(self, batch_size: int = BATCH_CHUNK_SIZE, progress=None) -> int:
+        """
+        Backfill de 'costar_edges' desde todos los créditos, por bloques de
+        películas con un commit por bloque (se puede cortar y repetir).
+        'progress(movies_done, movies_total)' se llama tras cada bloque.
+        Retorna la cantidad de aristas al terminar.
+        """
+        movie_ids = list(self.db_session.execute(
+            select(ActorMovie.id_movie).distinct().order_by(ActorMovie.id_movie)
+        ).scalars())
+        for i in range(0, len(movie_ids), batch_size):
+            self.update_costar_edges(movie_ids[i:i + batch_size])
+            if progress is not None:
+                progress(min(i + batch_size, len(movie_ids)), len(movie_ids))
+        return self.db_session.execute(select(func.count()).select_from(CostarEdge)).scalar()
 
     def shared_movies(self, actor_a: int, actor_b: int) -> bool:
         # Traer todas las peliculas en donde 2 actores compartieron pantalla
@@ -120,10 +238,19 @@ class ActorMovieService:
         return movies
 
     def get_all_actors_asociated_with_one(self, id_actor: int) -> list:
-        """ Traer la conexión más reciente para cada co-protagonista único. """
-        
+        """
+        Traer la conexión más reciente para cada co-protagonista único. Dos
+        actores son co-protagonistas si comparten una película donde al menos
+        uno de ellos tiene order <= 50, así la arista es la misma vista desde
+        cualquiera de los dos extremos.
+        """
+        if self.use_costar_edges:
+            return self.__get_costar_edges__([id_actor])
+
         # 1. CTE/Subconsulta para encontrar y numerar las películas compartidas
         movie_ids_query = select(ActorMovie.id_movie).where(ActorMovie.id_actor == id_actor)
+        # Películas donde el propio actor tiene order <= 50: ahí todo el reparto es vecino
+        main_movie_ids_query = movie_ids_query.where(ActorMovie.order <= 50)
 
         subquery = select(
             Actor.id.label('id_co_actor'),
@@ -141,7 +268,8 @@ class ActorMovieService:
         .where(
             Movie.id.in_(movie_ids_query),
             Actor.id != id_actor,
-            ActorMovie.order <= 50
+            # Arista no dirigida: basta con que uno de los dos tenga order <= 50
+            or_(ActorMovie.order <= 50, Movie.id.in_(main_movie_ids_query))
         ).subquery('ranked_movies')
 
         # 2. Consulta final para seleccionar solo la fila número 1 de cada actor
@@ -161,4 +289,269 @@ class ActorMovieService:
             edge = (id_actor, row['id_co_actor'], attr)
             edges_for_graph.append(edge)
 
-        return edges_for_graph
\ No newline at end of file
+        return edges_for_graph
+
+    def get_all_actors_asociated_with_many(self, ids_actors: List[int]) -> list:
+        """
+        Versión por lote de get_all_actors_asociated_with_one: trae las aristas
+        (actor, co_actor, attr) de todos los actores dados con una consulta por
+        cada bloque de BATCH_CHUNK_SIZE IDs.
+        """
+        if self.use_costar_edges:
+            return self.__get_costar_edges__(ids_actors)
+
+        edges_for_graph = []
+        for i in range(0, len(ids_actors), BATCH_CHUNK_SIZE):
+            chunk = ids_actors[i:i + BATCH_CHUNK_SIZE]
+
+            origen = aliased(ActorMovie)
+            co_actor = aliased(ActorMovie)
+
+            # Misma numeración que en la versión individual, pero por par (actor, co_actor)
+            subquery = select(
+                origen.id_actor.label('id_actor'),
+                co_actor.id_actor.label('id_co_actor'),
+                Movie.id.label('movie_id'),
+                Movie.title,
+                Movie.poster_path,
+                func.row_number().over(
+                    partition_by=(origen.id_actor, co_actor.id_actor),
+                    order_by=Movie.release_date.desc()
+                ).label('row_num')
+            ).select_from(origen)\
+            .join(co_actor, co_actor.id_movie == origen.id_movie)\
+            .join(Movie, Movie.id == origen.id_movie)\
+            .where(
+                origen.id_actor.in_(chunk),
+                co_actor.id_actor != origen.id_actor,
+                or_(co_actor.order <= 50, origen.order <= 50)
+            ).subquery('ranked_movies')
+
+            stmt = select(
+                subquery.c.id_actor,
+                subquery.c.id_co_actor,
+                subquery.c.movie_id,
+                subquery.c.title,
+                subquery.c.poster_path,
+            ).where(subquery.c.row_num == 1)
+
+            for row in self.db_session.execute(stmt).mappings().all():
+                attr = {'movie_id': row['movie_id'], 'movie_title': row['title'], 'poster_path': row['poster_path']}
+                edges_for_graph.append((row['id_actor'], row['id_co_actor'], attr))
+
+        return edges_for_graph
+
+    def __get_costar_edges__(self, ids_actors: List[int]) -> list:
+        """Aristas (actor, co_actor, attr) leídas de 'costar_edges': un rango de la PK por actor."""
+        edges_for_graph = []
+        for i in range(0, len(ids_actors), BATCH_CHUNK_SIZE):
+            chunk = ids_actors[i:i + BATCH_CHUNK_SIZE]
+
+            stmt = select(
+                CostarEdge.actor_a,
+                CostarEdge.actor_b,
+                CostarEdge.movie_id,
+                Movie.title,
+                Movie.poster_path
+            ).join(Movie, Movie.id == CostarEdge.movie_id)\
+            .where(CostarEdge.actor_a.in_(chunk))
+
+            for row in self.db_session.execute(stmt).mappings().all():
+                attr = {'movie_id': row['movie_id'], 'movie_title': row['title'], 'poster_path': row['poster_path']}
+                edges_for_graph.append((row['actor_a'], row['actor_b'], attr))
+
+        return edges_for_graph
+
+    def find_path_in_db(self, inicio: int, meta: int, max_saltos: int = 12) -> list:
+        """
+        Ruta más corta entre dos actores calculada en Postgres con la función
+        costar_shortest_path (ver database.py). Retorna [(desde, attr, hacia), ...]
+        en orden, o lista vacía si no hay ruta dentro de 'max_saltos'.
+        """
+        stmt = text("""
+            SELECT p.paso, p.desde, p.hacia, m.id AS movie_id, m.title, m.poster_path
+            FROM costar_shortest_path(:inicio, :meta, :max_saltos) AS p
+            JOIN movies m ON m.id = p.pelicula_id
+            ORDER BY p.paso
+        """)
+        rows = self.db_session.execute(
+            stmt, {'inicio': inicio, 'meta': meta, 'max_saltos': max_saltos}
+        ).mappings().all()
+
+        return [
+            (row['desde'], {'movie_id': row['movie_id'], 'movie_title': row['title'], 'poster_path': row['poster_path']}, row['hacia'])
+            for row in rows
+        ]
+
+    def get_credits_of_actor_movies(self, id_actor: int) -> list:
+        """
+        Traer el reparto completo de todas las películas de un actor, sin
+        proyectarlo a pares actor-actor. Una fila por crédito:
+        (movie_id, id_actor, attr, principal), donde 'principal' indica
+        order <= 50 (los order nulos no lo son). Las películas más recientes
+        van primero y dentro de cada una los principales.
+        """
+        movie_ids_query = select(ActorMovie.id_movie).where(ActorMovie.id_actor == id_actor)
+
+        stmt = select(
+            ActorMovie.id_movie,
+            ActorMovie.id_actor,
+            Movie.title,
+            Movie.poster_path,
+            func.coalesce(ActorMovie.order <= 50, False).label('principal')
+        ).join(Movie, Movie.id == ActorMovie.id_movie)\
+        .where(
+            ActorMovie.id_movie.in_(movie_ids_query)
+        ).order_by(Movie.release_date.desc(), ActorMovie.id_movie, ActorMovie.order)
+
+        rows = self.db_session.execute(stmt).mappings().all()
+
+        credits = []
+        for row in rows:
+            attr = {'movie_id': row['id_movie'], 'movie_title': row['title'], 'poster_path': row['poster_path']}
+            credits.append((row['id_movie'], row['id_actor'], attr, row['principal']))
+
+        return credits
+
+    def get_credits_of_many_actors_movies(self, ids_actors: List[int]) -> list:
+        """
+        Versión por lote de get_credits_of_actor_movies. Cada fila indica a qué
+        actor consultado pertenece: (id_actor_origen, movie_id, id_actor, attr, principal).
+        """
+        credits = []
+        for i in range(0, len(ids_actors), BATCH_CHUNK_SIZE):
+            chunk = ids_actors[i:i + BATCH_CHUNK_SIZE]
+
+            origen = aliased(ActorMovie)
+            reparto = aliased(ActorMovie)
+
+            stmt = select(
+                origen.id_actor.label('id_origen'),
+                reparto.id_movie,
+                reparto.id_actor,
+                Movie.title,
+                Movie.poster_path,
+                func.coalesce(reparto.order <= 50, False).label('principal')
+            ).select_from(origen)\
+            .join(reparto, reparto.id_movie == origen.id_movie)\
+            .join(Movie, Movie.id == origen.id_movie)\
+            .where(
+                origen.id_actor.in_(chunk)
+            ).order_by(origen.id_actor, Movie.release_date.desc(), reparto.id_movie, reparto.order)
+
+            for row in self.db_session.execute(stmt).mappings().all():
+                attr = {'movie_id': row['id_movie'], 'movie_title': row['title'], 'poster_path': row['poster_path']}
+                credits.append((row['id_origen'], row['id_movie'], row['id_actor'], attr, row['principal']))
+
+        return credits
+
+    def get_cast_of_many_movies(self, movie_ids: List[int]) -> list:
+        """
+        Traer el reparto completo de varias películas, una fila por crédito:
+        (movie_id, id_actor, attr, principal).
+        """
+        credits = []
+        for i in range(0, len(movie_ids), BATCH_CHUNK_SIZE):
+            chunk = movie_ids[i:i + BATCH_CHUNK_SIZE]
+
+            stmt = select(
+                ActorMovie.id_movie,
+                ActorMovie.id_actor,
+                Movie.title,
+                Movie.poster_path,
+                func.coalesce(ActorMovie.order <= 50, False).label('principal')
+            ).join(Movie, Movie.id == ActorMovie.id_movie)\
+            .where(
+                ActorMovie.id_movie.in_(chunk)
+            ).order_by(ActorMovie.id_movie, ActorMovie.order)
+
+            for row in self.db_session.execute(stmt).mappings().all():
+                attr = {'movie_id': row['id_movie'], 'movie_title': row['title'], 'poster_path': row['poster_path']}
+                credits.append((row['id_movie'], row['id_actor'], attr, row['principal']))
+
+        return credits
+
+    def iter_all_credits(self, batch_size: int = 10000):
+        """
+        Recorre toda la tabla 'actors_movies' como pares (id_movie, id_actor),
+        trayendo las filas por bloques para no cargarla completa en memoria.
+        Se usa en procesos offline (p. ej. construir el índice de componentes).
+        """
+        stmt = select(ActorMovie.id_movie, ActorMovie.id_actor)\
+            .execution_options(yield_per=batch_size)
+
+        for row in self.db_session.execute(stmt):
+            yield row.id_movie, row.id_actor
+
+    def iter_all_credits_with_order(self, batch_size: int = 10000):
+        """Igual que iter_all_credits, pero con el 'order': (id_movie, id_actor, order)."""
+        stmt = select(ActorMovie.id_movie, ActorMovie.id_actor, ActorMovie.order)\
+            .execution_options(yield_per=batch_size)
+
+        for row in self.db_session.execute(stmt):
+            yield row.id_movie, row.id_actor, row.order
+
+    def iter_credits_since(self, watermark: int, batch_size: int = 10000):
+        """Créditos con ID mayor al watermark como (id, id_movie, id_actor), por bloques."""
+        stmt = select(ActorMovie.id, ActorMovie.id_movie, ActorMovie.id_actor)\
+            .where(ActorMovie.id > watermark)\
+            .execution_options(yield_per=batch_size)
+
+        for row in self.db_session.execute(stmt):
+            yield row.id, row.id_movie, row.id_actor
+
+    def get_actor_ids_by_movies(self, movie_ids: List[int]) -> List[int]:
+        """IDs de todos los actores del reparto de las películas dadas"""
+        actor_ids = set()
+        for i in range(0, len(movie_ids), BATCH_CHUNK_SIZE):
+            chunk = movie_ids[i:i + BATCH_CHUNK_SIZE]
+            stmt = select(ActorMovie.id_actor).where(ActorMovie.id_movie.in_(chunk)).distinct()
+            actor_ids.update(self.db_session.execute(stmt).scalars().all())
+        return list(actor_ids)
+
+    def get_credits_watermark(self) -> int:
+        """Mayor ID de 'actors_movies' (0 si está vacía)."""
+        return self.db_session.execute(select(func.max(ActorMovie.id))).scalar() or 0
+
+    def get_credits_horizon(self):
+        """
+        (mayor ID de 'actors_movies', xmin, xmax) con un mismo snapshot: las
+        transacciones con xid < xmin ya terminaron y las de xid >= xmax aún no
+        empezaban. Un ID menor al máximo puede ser de una transacción todavía
+        en curso (se confirma después, con un ID "viejo"); como las inserciones
+        de créditos toman su xid antes de pedir IDs (ver __assign_xid__), todos
+        los IDs <= máximo son de transacciones con xid < xmax.
+        """
+        row = self.db_session.execute(text(
+            "SELECT (SELECT max(id) FROM actors_movies) AS maximo, "
+            "pg_snapshot_xmin(s)::text::bigint AS xmin, pg_snapshot_xmax(s)::text::bigint AS xmax "
+            "FROM pg_current_snapshot() s"
+        )).one()
+        return row.maximo or 0, row.xmin, row.xmax
+
+    def wait_credits_safe_watermark(self, timeout: float = 60.0, poll: float = 0.1) -> int:
+        """
+        Watermark seguro para procesos offline (snapshot, componentes): espera a
+        que terminen las transacciones en curso al leer el mayor ID, así todos
+        los créditos con ID <= watermark ya son visibles para la lectura que
+        sigue. No llamarlo dentro de una transacción con escrituras (se esperaría
+        a sí mismo).
+        """
+        maximo, _, xmax = self.get_credits_horizon()
+        limite = time.monotonic() + timeout
+        while self.get_credits_horizon()[1] < xmax:
+            if time.monotonic() > limite:
+                raise RuntimeError(
+                    f"Hay transacciones abiertas hace más de {timeout:.0f}s; no se puede fijar el watermark de créditos"
+                )
+            time.sleep(poll)
+        return maximo
+
+    def get_actor_ids_with_credits_since(self, watermark: int) -> List[int]:
+        """
+        Actores cuyos co-protagonistas cambiaron después del watermark: todo el
+        reparto de las películas que recibieron créditos con ID > watermark.
+        """
+        movies_query = select(ActorMovie.id_movie).where(ActorMovie.id > watermark)
+        stmt = select(ActorMovie.id_actor).where(ActorMovie.id_movie.in_(movies_query)).distinct()
+        return list(self.db_session.execute(stmt).scalars().all())
\ No newline at end of file
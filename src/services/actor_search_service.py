@@ -0,0 +1,47 @@
+from typing import List, Dict, Any, Tuple
+
+from src.services import metrics
+from src.services.actors_service import ActorService
+from src.services.tmdb_service import TMDBService
+from src.services.tmdb_errors import TMDBError
+
+
+class ActorSearchService:
+    """
+    Autocompletado de actores sobre la tabla 'actors' (que ya llenan las
+    ingestas) en lugar de un GET a /search/person de TMDB por cada tecla.
+
+    Solo si la búsqueda local trae menos de 'min_results' actores se consulta
+    TMDB y se completan los resultados con los que no estaban; si TMDB falla
+    se responde con lo local (si hay algo).
+    """
+    def __init__(self, actor_service: ActorService, tmdb_service: TMDBService,
+                 min_results: int = 5, limit: int = 20):
+        self.actor_service = actor_service
+        self.tmdb_service = tmdb_service
+        self.min_results = min_results
+        self.limit = limit
+
+    def search(self, query: str) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Retorna (actores, origen) con origen 'local', 'tmdb' o 'local+tmdb'.
+        Los actores tienen el mismo formato que TMDBService.search_actors.
+        """
+        locales = self.actor_service.search_actors_by_name(query, self.limit)
+        if len(locales) >= self.min_results:
+            metrics.ACTOR_SEARCHES.inc(source='local')
+            return locales, 'local'
+
+        try:
+            remotos = self.tmdb_service.search_actors(query)
+        except TMDBError:
+            if not locales:
+                raise
+            metrics.ACTOR_SEARCHES.inc(source='local')
+            return locales, 'local'
+
+        vistos = {actor['id'] for actor in locales}
+        extra = [actor for actor in remotos if actor['id'] not in vistos]
+        origen = 'local+tmdb' if locales and extra else ('tmdb' if extra else 'local')
+        metrics.ACTOR_SEARCHES.inc(source=origen)
+        return (locales + extra)[:self.limit], origen
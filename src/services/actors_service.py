@@ -1,17 +1,25 @@
+import threading
+from collections import OrderedDict
 from src.models.database import Actor
-from typing import List
+from typing import List, Dict, Any
+from sqlalchemy import func, or_, case
 from sqlalchemy.dialects.postgresql import insert
+from src.services.copy_bulk_loader import CopyBulkLoader
 
 class ActorService:
-    def __init__(self, db_session):
+    def __init__(self, db_session, cache_size: int = 2048, bulk_loader: CopyBulkLoader = None):
         self.db_session = db_session
+        # Carga con COPY + staging para los *_bulk (None = INSERT ... VALUES)
+        self.bulk_loader = bulk_loader
+        # Caché LRU de registros de actores para hidratar rutas (id -> dict)
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
-    def get_actor_by_id(self, actor_id):
-        actor = self.db_session.query(Actor).filter(Actor.id == actor_id).first()
-        # Si no existe, devolver None para que el llamador lo gestione
-        if not actor:
-            return None
-
+    @staticmethod
+    def _to_dict(actor) -> Dict[str, Any]:
         return {
             'id': actor.id,
             'name': actor.name,
@@ -20,6 +28,52 @@ class ActorService:
             'popularity': actor.popularity
         }
 
+    def get_actor_by_id(self, actor_id):
+        actor = self.db_session.query(Actor).filter(Actor.id == actor_id).first()
+        # Si no existe, devolver None para que el llamador lo gestione
+        if not actor:
+            return None
+
+        return self._to_dict(actor)
+
+    def get_actors_map_by_ids(self, actor_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Retorna {id: actor} de los actores dados con una sola consulta IN para
+        los que no estén en la caché. Los IDs que no existen no aparecen.
+        """
+        result = {}
+        missing = []
+        with self._cache_lock:
+            for actor_id in dict.fromkeys(actor_ids):
+                actor = self._cache.get(actor_id)
+                if actor is None:
+                    missing.append(actor_id)
+                else:
+                    self._cache.move_to_end(actor_id)
+                    result[actor_id] = actor
+            self.cache_hits += len(result)
+            self.cache_misses += len(missing)
+
+        if missing:
+            rows = self.db_session.query(Actor).filter(Actor.id.in_(missing)).all()
+            with self._cache_lock:
+                for actor in rows:
+                    result[actor.id] = self._cache[actor.id] = self._to_dict(actor)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        return result
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Contadores de la caché de actores."""
+        with self._cache_lock:
+            return {
+                'entries': len(self._cache),
+                'max_entries': self._cache_size,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses
+            }
+
     def create_actor(self, id_person, name, profile_path, popularity):
         new_actor = Actor(name=name, id=id_person, profile_path=profile_path, popularity=popularity)
         self.db_session.add(new_actor)
@@ -36,6 +90,10 @@ class ActorService:
         actor_obj.all_movies_saved = movie_saved
         self.db_session.commit()
 
+        # El registro en caché quedó desactualizado
+        with self._cache_lock:
+            self._cache.pop(actor_id, None)
+
         # Devolver la representación en dict como hace get_actor_by_id
         return actor_obj
 
@@ -48,6 +106,51 @@ class ActorService:
             .all()
         ]
 
+    def get_actor_ids_by_popularity(self, limit: int) -> List[int]:
+        """Retorna los IDs de los actores más populares (mayor popularidad primero)"""
+        return [
+            actor.id for actor in
+            self.db_session.query(Actor.id)
+            .order_by(Actor.popularity.desc(), Actor.id)
+            .limit(limit)
+            .all()
+        ]
+
+    @staticmethod
+    def _patron_like(texto: str) -> str:
+        """Escapa los comodines de LIKE para buscar el texto literal."""
+        return texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    def search_actors_by_name(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Busca actores guardados por nombre, sin distinguir mayúsculas. Primero
+        los que empiezan con el texto (el nombre o cualquier palabra), luego el
+        resto, y dentro de cada grupo por popularidad.
+
+        Con menos de 3 caracteres solo busca por prefijo (índice btree de
+        lower(name)); desde 3 también en cualquier parte del nombre (índice
+        de trigramas de pg_trgm).
+        """
+        texto = ' '.join(query.lower().split())
+        if not texto:
+            return []
+        patron = self._patron_like(texto)
+        nombre = func.lower(Actor.name)
+        prefijo = or_(nombre.like(f'{patron}%'), nombre.like(f'% {patron}%'))
+        if len(texto) < 3:
+            filtro, primero = nombre.like(f'{patron}%'), None
+        else:
+            filtro, primero = nombre.like(f'%{patron}%'), case((prefijo, 0), else_=1)
+
+        consulta = self.db_session.query(Actor.id, Actor.name, Actor.profile_path, Actor.popularity).filter(filtro)
+        orden = [Actor.popularity.desc().nulls_last(), Actor.id]
+        if primero is not None:
+            orden.insert(0, primero)
+        return [
+            {'id': row.id, 'name': row.name, 'profile_path': row.profile_path, 'popularity': row.popularity}
+            for row in consulta.order_by(*orden).limit(limit).all()
+        ]
+
     def create_actors_bulk(self, actors: List[dict]):
         """
         Crea múltiples actores en una sola transacción.
@@ -57,6 +160,10 @@ class ActorService:
         if not actors:
             return
 
+        if self.bulk_loader is not None:
+            self.bulk_loader.load_actors(actors)
+            return
+
         # Usar INSERT ... ON CONFLICT DO NOTHING para ser robusto ante condiciones de carrera
         # Construimos la sentencia con SQLAlchemy core y la ejecutamos en la sesión
         stmt = insert(Actor).values(actors)
@@ -0,0 +1,136 @@
+from typing import List, Dict, Any, Iterable, Tuple
+
+from sqlalchemy import text
+
+# Filas por COPY (acota la memoria del buffer, no la cantidad de statements de merge)
+COPY_CHUNK_ROWS = 50000
+
+# Tabla de staging de cada tabla destino: columnas (en orden del COPY) y el merge.
+# Son TEMP: no escriben WAL (como UNLOGGED) y son privadas de cada conexión, así
+# dos ingestas concurrentes no se pisan. ON COMMIT DELETE ROWS las vacía solas.
+STAGING = {
+    'actors': {
+        'columnas': ('id', 'name', 'profile_path', 'popularity'),
+        'tipos': 'id bigint, name varchar(255), profile_path varchar(255), popularity double precision',
+        'merge': """
+            INSERT INTO actors (id, name, profile_path, popularity)
+            SELECT id, name, profile_path, popularity FROM staging_actors ORDER BY id
+            ON CONFLICT (id) DO NOTHING
+            RETURNING id
+        """,
+    },
+    'movies': {
+        'columnas': ('id', 'title', 'release_date', 'poster_path', 'vote_average'),
+        'tipos': 'id bigint, title varchar(500), release_date varchar(15), '
+                 'poster_path varchar(255), vote_average double precision',
+        'merge': """
+            INSERT INTO movies (id, title, release_date, poster_path, vote_average)
+            SELECT id, title, release_date, poster_path, vote_average FROM staging_movies ORDER BY id
+            ON CONFLICT (id) DO NOTHING
+            RETURNING id
+        """,
+    },
+    'actors_movies': {
+        'columnas': ('id_actor', 'id_movie', 'character', 'order'),
+        'tipos': 'id_actor bigint, id_movie bigint, "character" varchar(500), "order" integer',
+        'merge': """
+            INSERT INTO actors_movies (id_actor, id_movie, "character", "order")
+            SELECT id_actor, id_movie, COALESCE("character", 'None'), "order"
+            FROM staging_actors_movies ORDER BY id_actor, id_movie
+            ON CONFLICT ON CONSTRAINT uix_actor_movie DO NOTHING
+            RETURNING id_actor, id_movie
+        """,
+    },
+}
+
+
+def _valor_copy(valor) -> str:
+    """Un campo en el formato de texto de COPY (\\N es NULL)."""
+    if valor is None:
+        return '\\N'
+    return (str(valor).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class _FilasCopy:
+    """
+    Objeto tipo archivo que va generando las líneas de COPY a medida que
+    psycopg2 las lee, sin armar todo el lote en memoria.
+    """
+    def __init__(self, filas: Iterable[dict], columnas: Tuple[str, ...]):
+        self._lineas = (
+            '\t'.join(_valor_copy(fila.get(columna)) for columna in columnas) + '\n'
+            for fila in filas
+        )
+        self._resto = ''
+
+    def read(self, size: int = -1) -> str:
+        partes = [self._resto]
+        largo = len(self._resto)
+        while size < 0 or largo < size:
+            linea = next(self._lineas, None)
+            if linea is None:
+                break
+            partes.append(linea)
+            largo += len(linea)
+        datos = ''.join(partes)
+        if size < 0:
+            self._resto = ''
+            return datos
+        self._resto = datos[size:]
+        return datos[:size]
+
+
+class CopyBulkLoader:
+    """
+    Carga por lotes con COPY: las filas se envían con COPY FROM STDIN a una
+    tabla de staging temporal y se pasan a la tabla real con un solo
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING por tabla. Comparado con un
+    INSERT de muchos VALUES evita armar y parsear el SQL de cada fila.
+
+    Trabaja dentro de la transacción de la sesión y hace commit al final,
+    igual que los métodos *_bulk de los servicios.
+    """
+    def __init__(self, db_session):
+        self.db_session = db_session
+
+    def _merge(self, tabla: str, filas: List[dict]) -> list:
+        """Copia las filas a la staging de 'tabla', las fusiona y retorna las claves nuevas."""
+        staging = STAGING[tabla]
+        conexion = self.db_session.connection()
+        conexion.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS staging_{tabla} ({staging['tipos']}) ON COMMIT DELETE ROWS"
+        ))
+        # El COPY a la staging le asigna el xid a la transacción antes de que el
+        # merge pida IDs (ActorMovieService.get_credits_horizon depende de eso)
+        columnas = ', '.join(f'"{columna}"' for columna in staging['columnas'])
+        cursor = conexion.connection.dbapi_connection.cursor()
+        try:
+            for i in range(0, len(filas), COPY_CHUNK_ROWS):
+                cursor.copy_expert(
+                    f"COPY staging_{tabla} ({columnas}) FROM STDIN",
+                    _FilasCopy(filas[i:i + COPY_CHUNK_ROWS], staging['columnas'])
+                )
+        finally:
+            cursor.close()
+        nuevas = conexion.execute(text(staging['merge'])).all()
+        self.db_session.commit()
+        return nuevas
+
+    def load_actors(self, actors: List[Dict[str, Any]]) -> List[int]:
+        """Inserta los actores que no existen; retorna los IDs insertados."""
+        if not actors:
+            return []
+        return [row.id for row in self._merge('actors', actors)]
+
+    def load_movies(self, movies: List[Dict[str, Any]]) -> List[int]:
+        """Inserta las películas que no existen; retorna los IDs insertados."""
+        if not movies:
+            return []
+        return [row.id for row in self._merge('movies', movies)]
+
+    def load_actor_movies(self, relations: List[Dict[str, Any]]) -> set:
+        """Inserta los créditos que no existen; retorna los pares (id_actor, id_movie) nuevos."""
+        if not relations:
+            return set()
+        return {(row.id_actor, row.id_movie) for row in self._merge('actors_movies', relations)}
@@ -1,8 +1,20 @@
 from src.models.graphs import Graphs
+from src.models.csr_graphs import CSRGraphs
+from src.models.bipartite_graphs import BipartiteGraphs
+from src.models.sql_graphs import SQLGraphs
+from src.models.landmarks import LandmarkIndex
+from src.models.graph_snapshot import GraphSnapshot
+from src.models.components import ComponentIndex
 from src.services.actors_service import ActorService
 from src.services.movies_service import MovieService
 from src.services.actor_movie_service import ActorMovieService
 from src.services.tmdb_service import TMDBService
+from src.services.path_cache_service import PathCacheService
+from src.services.tmdb_async_fetcher import TMDBAsyncFetcher
+from src.services.tmdb_errors import TMDBError, TMDBNotFoundError, TMDBRateLimitError
+from src.services.ingestion_worker_pool import IngestionWorkerPool
+from src.services.single_flight import SingleFlight, AdvisoryLocks
+from src.services import metrics
 from src.interfaces.models_interface import ActorInteface
 from typing import List
 import time
@@ -12,7 +24,14 @@ from typing import Dict, Any
 class GameService:
     def __init__(
             self, actor_service: ActorService, movie_service: MovieService,
-            actor_movie_service: ActorMovieService, tmdb_service: TMDBService
+            actor_movie_service: ActorMovieService, tmdb_service: TMDBService,
+            graph_backend: str = 'lista', graph_search: str = 'bidireccional',
+            graph_max_vertices: int = None, landmarks: LandmarkIndex = None,
+            graph_snapshot: GraphSnapshot = None, path_cache: PathCacheService = None,
+            verify_mode: str = 'secuencial', credits_fetcher: TMDBAsyncFetcher = None,
+            ingestion_pool: IngestionWorkerPool = None, single_flight: SingleFlight = None,
+            advisory_locks: AdvisoryLocks = None, graph_sql_max_hops: int = 12,
+            components: ComponentIndex = None
         ):
         self.actor_service = actor_service
         self.movie_service = movie_service
@@ -24,24 +43,256 @@ class GameService:
         self._chunk_size = 20
         self._max_retries = 3
         self._rate_limit_pause = 0.25  # seconds pause between chunks
-        self.graphs = Graphs(self.actor_movie_service)
+        # Descarga asíncrona con token bucket (None = hilos por lotes de arriba)
+        self.credits_fetcher = credits_fetcher
+        self.graphs = self.__create_graph__(graph_backend, graph_max_vertices, graph_snapshot, graph_sql_max_hops)
+        # Los créditos nuevos invalidan los vértices afectados del grafo en memoria
+        self.actor_movie_service.suscribir(self.graphs.invalidar_creditos)
+        if self.graphs.snapshot is not None:
+            self.__sync_snapshot__()
+        # Rutas ya hidratadas por par de actores (None = sin caché); se vacía
+        # cuando cambia el horizonte de créditos, ver search_connection
+        self.path_cache = path_cache
+        if graph_search not in ('bidireccional', 'balanceada', 'landmarks'):
+            raise ValueError(f"Estrategia de búsqueda desconocida: {graph_search}")
+        # Índice de landmarks (ALT) precalculado con 'flask build-landmarks', opcional
+        self.landmarks = landmarks
+        if graph_search == 'landmarks' and landmarks is None:
+            print("No hay índice de landmarks cargado, se usa la búsqueda balanceada")
+            graph_search = 'balanceada'
+        self.graph_search = graph_search
+        if verify_mode not in ('secuencial', 'concurrente'):
+            raise ValueError(f"Modo de verificación desconocido: {verify_mode}")
+        self.verify_mode = verify_mode
+        # Cola de ingestas en segundo plano (None = la ingesta corre dentro del request)
+        self.ingestion_pool = ingestion_pool
+        # Una sola ingesta en curso por actor y una sola descarga por película
+        # (None = sin deduplicar); los advisory locks extienden esto entre procesos
+        self.single_flight = single_flight
+        self.advisory_locks = advisory_locks if single_flight is not None else None
+        # Componentes conexos (union-find) para responder "sin ruta" sin buscar (None = siempre se busca)
+        self.components = components
+        if components is not None:
+            self.actor_movie_service.suscribir(components.agregar_creditos)
+
+    def __create_graph__(
+            self, graph_backend: str, max_vertices: int = None, snapshot: GraphSnapshot = None,
+            sql_max_hops: int = 12
+        ) -> Graphs:
+        """
+        Crea el grafo en memoria según el backend configurado:
+        - 'lista': lista de adyacencia con un dict de atributos por arista (original)
+        - 'csr': índices densos y bloques CSR en arreglos compactos
+        - 'bipartito': vértices actor y película, guarda los créditos sin proyectarlos
+        - 'sql': sin grafo en memoria, la búsqueda corre en Postgres (hasta 'sql_max_hops' saltos)
+        'max_vertices' limita los vértices expandidos en memoria (desalojo LRU).
+        'snapshot' (solo 'lista' y 'csr', que guardan aristas actor-actor) sirve
+        los vértices desde el archivo mmap en lugar de la DB.
+        """
+        backends = {
+            'lista': Graphs,
+            'csr': CSRGraphs,
+            'bipartito': BipartiteGraphs,
+            'sql': SQLGraphs,
+        }
+        if graph_backend not in backends:
+            raise ValueError(f"Backend de grafo desconocido: {graph_backend}")
+        if graph_backend == 'bipartito':
+            if snapshot is not None:
+                print("El backend bipartito no usa el snapshot del grafo (guarda créditos, no aristas actor-actor)")
+            return BipartiteGraphs(self.actor_movie_service, max_vertices=max_vertices)
+        if graph_backend == 'sql':
+            if snapshot is not None:
+                print("El backend sql no usa el snapshot del grafo (la búsqueda corre en Postgres)")
+            return SQLGraphs(self.actor_movie_service, max_saltos=sql_max_hops)
+        return backends[graph_backend](self.actor_movie_service, max_vertices=max_vertices, snapshot=snapshot)
+
+    def __sync_snapshot__(self):
+        """
+        Marca como desactualizados los actores con créditos posteriores al
+        watermark del snapshot; esos se siguen cargando desde la DB.
+        """
+        snapshot = self.graphs.snapshot
+        if snapshot.watermark >= self.actor_movie_service.get_credits_watermark():
+            print(f"Snapshot del grafo al día ({snapshot.num_vertices} vértices)")
+            return
+
+        stale = self.actor_movie_service.get_actor_ids_with_credits_since(snapshot.watermark)
+        self.graphs.invalidar_vertices(stale)
+        print(f"Snapshot del grafo: {len(stale)} de {snapshot.num_vertices} vértices con créditos más nuevos")
+        if len(stale) > snapshot.num_vertices * 0.1:
+            print("El snapshot está muy desactualizado, regenerelo con 'flask graph-snapshot'")
 
     def saved_data_in_db(self, actor_id_a: int, actor_id_b: int) -> bool:
         """
         Guarda en la base de datos la información necesaria para verificar la conexión entre dos actores.
         """
-        actorA = self.__add_actor_if_not_exists__(actor_id_a)
-        if actorA and not actorA['all_movies_saved']:
-            print('Add actor A done')
-            self.__add_movies_and_cast__(actor_id_a)
-            print('Add movies and cast A done')
-
-        actorB = self.__add_actor_if_not_exists__(actor_id_b)
-        if actorB and not actorB['all_movies_saved']:
-            print('Add actor B done')
-            self.__add_movies_and_cast__(actor_id_b)
-            print('Add movies and cast B done')
-    
+        self.__ingest_actor__(actor_id_a)
+        self.__ingest_actor__(actor_id_b)
+
+    def __ingest_actor__(self, actor_id: int, progress=None):
+        """
+        Guarda al actor, sus películas y el reparto de cada una si aún no están en la DB.
+        'progress(fetched, total)' se llama a medida que se descargan los repartos.
+        Si el mismo actor ya se está ingestando en otro hilo, espera su resultado.
+        """
+        if self.single_flight is None:
+            return self.__ingest_actor_once__(actor_id, progress)
+        return self.single_flight.do('actor', actor_id, lambda: self.__ingest_actor_exclusive__(actor_id, progress))
+
+    def __ingest_actor_exclusive__(self, actor_id: int, progress=None):
+        """
+        Ingesta con el advisory lock del actor tomado. Si otro proceso lo tenía,
+        al obtenerlo el actor probablemente ya está completo y no se repite nada.
+        """
+        if self.advisory_locks is None:
+            return self.__ingest_actor_once__(actor_id, progress)
+        with self.advisory_locks.hold('actor', actor_id) as waited:
+            if waited:
+                self.single_flight.count('actor', 'remote_waits')
+                # Lo que la sesión tenga cargado del actor es anterior a la ingesta del otro proceso
+                self.actor_service.db_session.expire_all()
+                if self.is_actor_ingested(actor_id):
+                    self.single_flight.count('actor', 'avoided')
+                    return
+            self.__ingest_actor_once__(actor_id, progress)
+
+    def __ingest_actor_once__(self, actor_id: int, progress=None):
+        actor = self.__add_actor_if_not_exists__(actor_id)
+        if actor and not actor['all_movies_saved']:
+            print(f'Add actor {actor_id} done')
+            self.__add_movies_and_cast__(actor_id, progress)
+            print(f'Add movies and cast {actor_id} done')
+
+    def ingest_actor(self, actor_id: int, progress=None):
+        """
+        Ingesta de un actor desde un job de fondo (IngestionWorkerPool). A
+        diferencia de __ingest_actor__, falla si el actor no quedó completo
+        (no existe en TMDB o no es actor), así el job queda marcado 'failed'.
+        """
+        self.__ingest_actor__(actor_id, progress)
+        if not self.is_actor_ingested(actor_id):
+            raise ValueError(f"El actor {actor_id} no existe en TMDB o no es un actor")
+
+    def is_actor_ingested(self, actor_id: int) -> bool:
+        actor = self.actor_service.get_actor_by_id(actor_id)
+        return bool(actor and actor['all_movies_saved'])
+
+    def enqueue_missing_ingestions(self, actor_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Encola la ingesta de los actores que todavía no están completos en la
+        DB y retorna sus jobs; lista vacía si ya se puede responder.
+        """
+        return [
+            self.ingestion_pool.enqueue(actor_id)
+            for actor_id in dict.fromkeys(actor_ids)
+            if actor_id and not self.is_actor_ingested(actor_id)
+        ]
+
+    def get_ingestion_job(self, job_id: int):
+        return self.ingestion_pool.get_job(job_id)
+
+    def verify_connection(self, actor_0: int, actor_a: int, actor_b: int, explain: bool = False):
+        """
+        Busca las rutas 0 -> A y A -> B, guardando antes a los tres actores.
+        Retorna (ruta, ruta2, timings) con los tiempos de cada etapa en ms; con
+        'explain' cada tramo trae además las estadísticas de su búsqueda.
+
+        - 'secuencial': ingesta y búsqueda de un tramo y luego del otro (original)
+        - 'concurrente': los tres actores se ingestan en paralelo (A una sola
+          vez) y cada tramo busca apenas estén listos sus dos extremos
+        """
+        inicio = time.perf_counter()
+        if self.verify_mode == 'concurrente':
+            ruta, ruta2, timings = self.__verify_connection_concurrent__(actor_0, actor_a, actor_b, explain)
+        else:
+            ruta, ruta2, timings = self.__verify_connection_sequential__(actor_0, actor_a, actor_b, explain)
+
+        timings['mode'] = self.verify_mode
+        timings['total_ms'] = self.__elapsed_ms__(inicio)
+        print(f"verify_connection {actor_0} -> {actor_a} -> {actor_b}: {timings}")
+        return ruta, ruta2, timings
+
+    def __verify_connection_sequential__(self, actor_0: int, actor_a: int, actor_b: int, explain: bool = False):
+        ingest_ms = {}
+        legs = []
+        rutas = []
+        for actor_from, actor_to in ((actor_0, actor_a), (actor_a, actor_b)):
+            for actor_id in (actor_from, actor_to):
+                inicio = time.perf_counter()
+                self.__ingest_actor__(actor_id)
+                ingest_ms[str(actor_id)] = ingest_ms.get(str(actor_id), 0) + self.__elapsed_ms__(inicio)
+
+            estadisticas = {} if explain else None
+            inicio = time.perf_counter()
+            rutas.append(self.search_connection(actor_from, actor_to, estadisticas))
+            search_ms = self.__elapsed_ms__(inicio)
+            leg = {'from': actor_from, 'to': actor_to, 'wait_ms': 0.0, 'search_ms': search_ms}
+            if explain:
+                leg['explain'] = estadisticas
+            legs.append(leg)
+
+        return rutas[0], rutas[1], {'ingest_ms': ingest_ms, 'legs': legs}
+
+    def __verify_connection_concurrent__(self, actor_0: int, actor_a: int, actor_b: int, explain: bool = False):
+        actor_ids = list(dict.fromkeys((actor_0, actor_a, actor_b)))
+        # Una ingesta por actor distinto y un hilo por tramo, para que los tramos
+        # no esperen un hilo libre mientras las ingestas corren
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(actor_ids) + 2) as executor:
+            ingestions = {
+                actor_id: executor.submit(metrics.propagar(self.__run_in_own_session__), self.__timed_ingest__, actor_id)
+                for actor_id in actor_ids
+            }
+            legs = [
+                executor.submit(
+                    metrics.propagar(self.__run_in_own_session__), self.__run_leg__,
+                    actor_from, actor_to, ingestions[actor_from], ingestions[actor_to], explain
+                )
+                for actor_from, actor_to in ((actor_0, actor_a), (actor_a, actor_b))
+            ]
+            (ruta, leg_1), (ruta2, leg_2) = legs[0].result(), legs[1].result()
+            ingest_ms = {str(actor_id): fut.result() for actor_id, fut in ingestions.items()}
+
+        return ruta, ruta2, {'ingest_ms': ingest_ms, 'legs': [leg_1, leg_2]}
+
+    def __timed_ingest__(self, actor_id: int) -> float:
+        inicio = time.perf_counter()
+        self.__ingest_actor__(actor_id)
+        return self.__elapsed_ms__(inicio)
+
+    def __run_leg__(self, actor_from: int, actor_to: int, ingest_from, ingest_to, explain: bool = False):
+        """Espera la ingesta de ambos extremos y busca la ruta del tramo."""
+        inicio = time.perf_counter()
+        ingest_from.result()
+        ingest_to.result()
+        wait_ms = self.__elapsed_ms__(inicio)
+
+        estadisticas = {} if explain else None
+        inicio = time.perf_counter()
+        ruta = self.search_connection(actor_from, actor_to, estadisticas)
+        search_ms = self.__elapsed_ms__(inicio)
+        leg = {'from': actor_from, 'to': actor_to, 'wait_ms': wait_ms, 'search_ms': search_ms}
+        if explain:
+            leg['explain'] = estadisticas
+        return ruta, leg
+
+    def __run_in_own_session__(self, fn, *args):
+        """
+        Ejecuta 'fn' en un hilo del pool. La sesión es un scoped_session, así
+        que cada hilo usa su propia sesión (y conexión); al terminar se cierra
+        para devolver la conexión al pool.
+        """
+        try:
+            return fn(*args)
+        finally:
+            remove = getattr(self.actor_service.db_session, 'remove', None)
+            if remove is not None:
+                remove()
+
+    @staticmethod
+    def __elapsed_ms__(inicio: float) -> float:
+        return round((time.perf_counter() - inicio) * 1000, 1)
+
     def __add_actor_if_not_exists__(self, actor_id: int) -> ActorInteface:
         """
         Verifica si un actor existe en la base de datos.
@@ -63,7 +314,7 @@ class GameService:
         except Exception as e:
             print( "Error al agregar o verificar actor:", e)
 
-    def __add_movies_and_cast__(self, actor_id: int):
+    def __add_movies_and_cast__(self, actor_id: int, progress=None):
         """
         Agrega películas y su elenco a la base de datos.
         """
@@ -132,14 +383,72 @@ class GameService:
         ]
         
         print(f"Movies needing cast: {len(movies_needing_cast)}")
-        if movies_needing_cast:
-            self.__add_cast_bulk__([m['id'] for m in movies_needing_cast])
+        if progress is not None:
+            progress(0, len(movies_needing_cast))
+        if movies_needing_cast and self.single_flight is not None:
+            self.__add_cast_deduplicated__([m['id'] for m in movies_needing_cast], progress)
+        elif movies_needing_cast:
+            self.__add_cast_bulk__([m['id'] for m in movies_needing_cast], progress)
             self.movie_service.check_cast_saved_bulk([m['id'] for m in movies_needing_cast], True)
 
         # 8. Actualizar estado del actor
         self.actor_service.check_movies_saved(actor_id, True)
 
-    def __add_cast_bulk__(self, movie_ids: List[int]):
+    def __add_cast_deduplicated__(self, movie_ids: List[int], progress=None):
+        """
+        __add_cast_bulk__ sin repetir descargas en curso: las películas que ya
+        procesa otro hilo (single-flight) u otro proceso (advisory lock) se
+        esperan en lugar de pedirlas de nuevo a TMDB. Después se vuelven a
+        consultar en la DB y solo se descargan las que siguen sin reparto
+        (por ejemplo, si el otro falló).
+        """
+        leading, following = self.single_flight.lead_many('movie', movie_ids)
+        busy = []
+        error = None
+        try:
+            if self.advisory_locks is not None:
+                with self.advisory_locks.hold_many('movie', leading) as (acquired, busy):
+                    self.__add_missing_cast__(acquired, progress)
+            else:
+                self.__add_missing_cast__(leading, progress)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.single_flight.resolve_many('movie', leading, error)
+
+        for call in following.values():
+            try:
+                call.wait()
+            except Exception:
+                # Falló el otro hilo: la película sigue sin reparto y se descarga abajo
+                pass
+        if busy:
+            self.single_flight.count('movie', 'remote_waits', len(busy))
+            self.advisory_locks.wait_released('movie', busy)
+
+        waited = list(following) + busy
+        if waited:
+            missing = self.movie_service.get_movie_ids_without_cast(waited)
+            self.single_flight.count('movie', 'avoided', len(waited) - len(missing))
+            if missing:
+                self.__add_cast_bulk__(missing)
+                self.movie_service.check_cast_saved_bulk(missing, True)
+        if progress is not None:
+            progress(len(movie_ids), len(movie_ids))
+
+    def __add_missing_cast__(self, movie_ids: List[int], progress=None):
+        """
+        Descarga el reparto de las películas que lo siguen necesitando: otro
+        líder pudo terminarlas entre la consulta inicial y la toma del lock.
+        """
+        missing = self.movie_service.get_movie_ids_without_cast(movie_ids)
+        self.single_flight.count('movie', 'avoided', len(movie_ids) - len(missing))
+        if missing:
+            self.__add_cast_bulk__(missing, progress)
+            self.movie_service.check_cast_saved_bulk(missing, True)
+
+    def __add_cast_bulk__(self, movie_ids: List[int], progress=None):
         """
         Versión optimizada para agregar el cast de múltiples películas
         """
@@ -155,36 +464,48 @@ class GameService:
             attempt = 0
             while attempt < self._max_retries:
                 try:
-                    # Call the TMDB service; let it raise on network errors so we can retry here
+                    # Call the TMDB service; it raises typed TMDBError so we can retry here
                     casts = self.tmdb_service.get_movie_credits(mid)
                     # Normalize None -> empty list
                     if casts is None:
                         casts = []
                     return mid, casts
-                except Exception as e:
+                except TMDBNotFoundError:
+                    return mid, []
+                except TMDBError as e:
+                    if not e.retryable:
+                        print(f"Error fetching credits for {mid}: {e}. Skipping.")
+                        return mid, []
                     attempt += 1
-                    backoff = 0.5 * (2 ** (attempt - 1))
+                    # After a 429 the shared limiter already holds every thread for Retry-After
+                    backoff = 0 if isinstance(e, TMDBRateLimitError) else 0.5 * (2 ** (attempt - 1))
                     print(f"Error fetching credits for {mid} (attempt {attempt}/{self._max_retries}): {e}. Backing off {backoff}s")
                     time.sleep(backoff)
             # All retries failed
             print(f"Failed to fetch credits for movie {mid} after {self._max_retries} attempts. Skipping.")
             return mid, []
 
-        # Process in chunks to limit burst rate and optionally sleep between chunks
-        for i in range(0, len(movie_ids), self._chunk_size):
-            chunk = movie_ids[i:i + self._chunk_size]
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
-                future_to_mid = {executor.submit(fetch_with_retries, mid): mid for mid in chunk}
-                for fut in concurrent.futures.as_completed(future_to_mid):
-                    mid = future_to_mid[fut]
-                    try:
-                        movie_id, casts = fut.result()
-                        all_casts_by_movie[movie_id] = casts
-                    except Exception as e:
-                        # Shouldn't happen because fetch_with_retries catches, but just in case
-                        print(f"Unexpected error fetching {mid}: {e}")
-            # small pause between chunks to reduce burst risk
-            time.sleep(self._rate_limit_pause)
+        if self.credits_fetcher is not None:
+            # Pipeline continuo limitado por el token bucket, sin lotes ni pausas
+            all_casts_by_movie = self.credits_fetcher.fetch_movie_credits_many(movie_ids, progress)
+        else:
+            # Process in chunks to limit burst rate and optionally sleep between chunks
+            for i in range(0, len(movie_ids), self._chunk_size):
+                chunk = movie_ids[i:i + self._chunk_size]
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                    future_to_mid = {executor.submit(metrics.propagar(fetch_with_retries), mid): mid for mid in chunk}
+                    for fut in concurrent.futures.as_completed(future_to_mid):
+                        mid = future_to_mid[fut]
+                        try:
+                            movie_id, casts = fut.result()
+                            all_casts_by_movie[movie_id] = casts
+                        except Exception as e:
+                            # Shouldn't happen because fetch_with_retries catches, but just in case
+                            print(f"Unexpected error fetching {mid}: {e}")
+                        if progress is not None:
+                            progress(len(all_casts_by_movie), len(movie_ids))
+                # small pause between chunks to reduce burst risk
+                time.sleep(self._rate_limit_pause)
 
         # 2. Extraer IDs únicos de actores
         unique_actor_ids = {cast['id'] for casts in all_casts_by_movie.values() for cast in casts}
@@ -254,43 +575,141 @@ class GameService:
             except Exception as e:
                 print(f"Error adding actor-movie relations in bulk: {e}")
 
-    def search_connection(self, actor_a_id: int, actor_b_id: int):
+    def search_connection(self, actor_a_id: int, actor_b_id: int, estadisticas: Dict[str, Any] = None):
         """
         Se busca todos los actores asociados a uno
         Luego se agrega esos al grafo para luego buscar mediandte el algoritmo BFS
+
+        Si se pasa 'estadisticas' (dict) se llena con la estrategia, si la ruta
+        salió de la caché de rutas o se descartó por el índice de componentes,
+        las estadísticas de la búsqueda en el grafo ('busqueda') y el tiempo
+        de hidratar la ruta.
         """
         # Antes se tenia asi, se creaba cada vez el objeto, hacia lento las operaciones, ya que no se persistian los nodos y aristas
         # graphs = Graphs(self.actor_movie_service)
 
+        if estadisticas is not None:
+            estadisticas.update({'estrategia': self.graph_search, 'cache_rutas': False})
+
+        generation = None
+        if self.path_cache is not None:
+            # Una consulta: detecta créditos nuevos de cualquier proceso
+            generation = self.path_cache.sync_credits(*self.actor_movie_service.get_credits_horizon())
+            cached = self.path_cache.get(actor_a_id, actor_b_id)
+            if cached is not None:
+                if estadisticas is not None:
+                    estadisticas['cache_rutas'] = True
+                return cached
+
+        if self.__in_different_components__(actor_a_id, actor_b_id):
+            if estadisticas is not None:
+                estadisticas['sin_ruta_por_componentes'] = True
+            return None
+        if estadisticas is not None and self.components is not None:
+            estadisticas['tamano_componentes'] = [
+                self.components.tamano_componente(actor_a_id), self.components.tamano_componente(actor_b_id)
+            ]
+
+        busqueda = None if estadisticas is None else {}
         # BSF unidireccional
         # ruta = self.graphs.bfs(actor_a_id, actor_b_id)
-        ruta = self.graphs.bfs_bidireccional(actor_a_id, actor_b_id)
+        with metrics.medir('bfs', metrics.GRAPH_SEARCH_SECONDS, algorithm=self.graph_search):
+            if self.graph_search == 'landmarks':
+                ruta = self.graphs.a_estrella(actor_a_id, actor_b_id, self.landmarks, busqueda)
+            elif self.graph_search == 'balanceada':
+                ruta = self.graphs.bfs_bidireccional_balanceada(actor_a_id, actor_b_id, busqueda)
+            else:
+                ruta = self.graphs.bfs_bidireccional(actor_a_id, actor_b_id, busqueda)
+        if estadisticas is not None:
+            estadisticas['busqueda'] = busqueda
+            estadisticas['saltos'] = len(ruta) if ruta else None
         if not ruta:
             return None
         
+        inicio = time.perf_counter()
+        ruta_con_actores = self.__hydrate_path__(ruta)
+        if estadisticas is not None:
+            estadisticas['hidratacion_ms'] = self.__elapsed_ms__(inicio)
+
+        if self.path_cache is not None:
+            self.path_cache.put(actor_a_id, actor_b_id, ruta_con_actores, generation)
+        return ruta_con_actores
+
+    def __in_different_components__(self, actor_a_id: int, actor_b_id: int) -> bool:
+        """
+        True si el índice de componentes asegura que no hay ruta. Antes de
+        descartar se sincroniza con los créditos de otros procesos (una
+        consulta si no hay nuevos), porque el índice solo puede atrasarse en
+        uniones, nunca sobrar.
+        """
+        if self.components is None or actor_a_id == actor_b_id:
+            return False
+        if self.components.conectados(actor_a_id, actor_b_id) is not False:
+            return False
+        self.components.sincronizar(self.actor_movie_service)
+        if self.components.conectados(actor_a_id, actor_b_id) is not False:
+            return False
+        self.components.registrar_rechazo()
+        return True
+
+    def estimate_separation(self, actor_a_id: int, actor_b_id: int):
+        """
+        Cotas de los grados de separación entre dos actores según el índice de
+        landmarks, sin recorrer el grafo ni consultar la DB.
+        Retorna None si no hay índice o si alguno de los actores no está en él.
+        """
+        if self.landmarks is None:
+            return None
+        return self.landmarks.estimar(actor_a_id, actor_b_id)
+
+    def __hydrate_path__(self, ruta) -> List[Dict[str, Any]]:
+        """
+        Convierte la ruta del grafo (actor, attr, actor) en la respuesta con los
+        datos de cada actor y película. Son dos consultas IN (actores y
+        películas) sin importar el largo de la ruta; los actores repetidos
+        salen de la caché de ActorService.
+        """
+        actor_ids = [r[0] for r in ruta] + [r[2] for r in ruta]
+        actors = self.actor_service.get_actors_map_by_ids(actor_ids)
+        movie_ids = list({r[1]['movie_id'] for r in ruta if r[1]})
+        movies = self.movie_service.get_movies_map_by_ids(movie_ids)
+
         ruta_con_actores: List = []
-        for r in ruta:
-            actor1 = self.actor_service.get_actor_by_id(r[0])
-            actor2 = self.actor_service.get_actor_by_id(r[2])
+        for actual, attr, destino in ruta:
+            movie = attr
+            if attr and attr['movie_id'] in movies:
+                # Copia: el attr es compartido por el grafo en memoria
+                detalle = movies[attr['movie_id']]
+                movie = {**attr, 'release_date': detalle['release_date'], 'vote_average': detalle['vote_average']}
             ruta_con_actores.append({
-                'actual': actor1,
-                'movie': r[1],
-                'destino': actor2
+                'actual': actors.get(actual),
+                'movie': movie,
+                'destino': actors.get(destino)
             })
         return ruta_con_actores
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de las cachés en memoria, para dimensionar los presupuestos."""
+        return {
+            'graph': self.graphs.estadisticas_cache(),
+            'paths': None if self.path_cache is None else self.path_cache.get_stats(),
+            'actors': self.actor_service.get_cache_stats(),
+            'landmarks': None if self.landmarks is None else {
+                'k': self.landmarks.k,
+                'actores': self.landmarks.num_actores
+            },
+            'tmdb_cache': self.tmdb_service.get_cache_stats(),
+            'tmdb_limiter': self.tmdb_service.get_limiter_stats(),
+            'tmdb_fetcher': None if self.credits_fetcher is None else self.credits_fetcher.get_stats(),
+            'ingestion': None if self.ingestion_pool is None else self.ingestion_pool.get_stats(),
+            'single_flight': None if self.single_flight is None else self.single_flight.get_stats(),
+            'components': None if self.components is None else self.components.estadisticas()
+        }
+
     def actors_shared_movies(self, actora_id: int, actorb_id):
-        actorA = self.__add_actor_if_not_exists__(actora_id)
-        if actorA and not actorA['all_movies_saved']:
-            print('Add actor A done')
-            self.__add_movies_and_cast__(actora_id)
-            print('Add movies and cast A done')
-
-        actorB = self.__add_actor_if_not_exists__(actorb_id)
-        if actorB and not actorB['all_movies_saved']:
-            print('Add actor B done')
-            self.__add_movies_and_cast__(actorb_id)
-            print('Add movies and cast B done')
+        # Misma ingesta que el resto del juego (single-flight y advisory lock por actor)
+        self.__ingest_actor__(actora_id)
+        self.__ingest_actor__(actorb_id)
         movies_shared = self.actor_movie_service.shared_movies(actora_id, actorb_id)
 
         if not movies_shared:
@@ -0,0 +1,203 @@
+from datetime import timedelta
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models.database import IngestionJob
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+class IngestionJobService:
+    """
+    Cola persistente de ingestas de actores (tabla 'ingestion_jobs').
+
+    Varios procesos pueden atender la misma cola: cada worker toma el próximo
+    job pendiente con SELECT ... FOR UPDATE SKIP LOCKED, así ninguno se
+    procesa dos veces. El índice único parcial sobre (actor_id) para los
+    estados activos hace que los pedidos concurrentes del mismo actor
+    compartan un solo job.
+    """
+    def __init__(self, db_session, max_attempts: int = 3, failure_cooldown: float = 60.0, retry_backoff: float = 10.0):
+        self.db_session = db_session
+        self.max_attempts = max_attempts
+        # Un job que falló vuelve a tomarse tras retry_backoff * 2^(intentos - 1) segundos
+        self.retry_backoff = retry_backoff
+        # Tras un fallo, no se vuelve a encolar el mismo actor durante este tiempo
+        self.failure_cooldown = failure_cooldown
+
+    @staticmethod
+    def _to_dict(job: IngestionJob) -> Dict[str, Any]:
+        total = job.movies_total or 0
+        fetched = job.movies_fetched or 0
+        return {
+            'id': job.id,
+            'actor_id': job.actor_id,
+            'status': job.status,
+            'movies_total': total,
+            'movies_fetched': fetched,
+            'progress': round(fetched / total, 4) if total else (1.0 if job.status == 'done' else 0.0),
+            'attempts': job.attempts,
+            'error': job.error,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None
+        }
+
+    def enqueue(self, actor_id: int) -> Dict[str, Any]:
+        """
+        Encola la ingesta del actor o retorna el job activo que ya la tiene.
+        Si falló hace menos de 'failure_cooldown' segundos, retorna ese job fallido.
+        """
+        recent_failure = (
+            self.db_session.query(IngestionJob)
+            .filter(
+                IngestionJob.actor_id == actor_id,
+                IngestionJob.status == 'failed',
+                IngestionJob.finished_at > func.now() - timedelta(seconds=self.failure_cooldown)
+            )
+            .order_by(IngestionJob.id.desc())
+            .first()
+        )
+        if recent_failure is not None:
+            return self._to_dict(recent_failure)
+
+        stmt = (
+            insert(IngestionJob)
+            .values(actor_id=actor_id, status='pending')
+            .on_conflict_do_nothing(
+                index_elements=['actor_id'],
+                index_where=IngestionJob.status.in_(ACTIVE_STATUSES)
+            )
+            .returning(IngestionJob.id)
+        )
+        job_id = self.db_session.execute(stmt).scalar()
+        self.db_session.commit()
+
+        if job_id is not None:
+            job = self.db_session.get(IngestionJob, job_id)
+        else:
+            job = (
+                self.db_session.query(IngestionJob)
+                .filter(IngestionJob.actor_id == actor_id, IngestionJob.status.in_(ACTIVE_STATUSES))
+                .first()
+            )
+            if job is None:
+                # El job activo terminó entre el INSERT y la consulta: se vuelve a intentar
+                return self.enqueue(actor_id)
+        return self._to_dict(job)
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        # populate_existing: el job lo actualiza otro hilo o proceso, no sirve la copia en sesión
+        job = (
+            self.db_session.query(IngestionJob)
+            .filter(IngestionJob.id == job_id)
+            .populate_existing()
+            .first()
+        )
+        return None if job is None else self._to_dict(job)
+
+    def get_jobs(self, job_ids: List[int]) -> List[Dict[str, Any]]:
+        if not job_ids:
+            return []
+        jobs = (
+            self.db_session.query(IngestionJob)
+            .filter(IngestionJob.id.in_(job_ids))
+            .populate_existing()
+            .all()
+        )
+        return [self._to_dict(job) for job in sorted(jobs, key=lambda j: j.id)]
+
+    def _retry_at(self):
+        """Momento desde el que un job pendiente con intentos previos se puede volver a tomar."""
+        segundos = self.retry_backoff * func.power(2, func.least(IngestionJob.attempts - 1, 10))
+        return IngestionJob.updated_at + func.make_interval(0, 0, 0, 0, 0, 0, segundos)
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Toma el job pendiente más antiguo y lo marca 'running' (None si no hay).
+        Los reintentos esperan su backoff (ver mark_failed).
+        """
+        job = (
+            self.db_session.query(IngestionJob)
+            .filter(
+                IngestionJob.status == 'pending',
+                or_(IngestionJob.attempts == 0, self._retry_at() <= func.now())
+            )
+            .order_by(IngestionJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            self.db_session.rollback()
+            return None
+
+        job.status = 'running'
+        job.attempts = (job.attempts or 0) + 1
+        job.started_at = func.now()
+        job.updated_at = func.now()
+        self.db_session.commit()
+        return self._to_dict(job)
+
+    def update_progress(self, job_id: int, movies_fetched: int, movies_total: int):
+        self.db_session.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == job_id)
+            .values(movies_fetched=movies_fetched, movies_total=movies_total, updated_at=func.now())
+        )
+        self.db_session.commit()
+
+    def mark_done(self, job_id: int):
+        self.db_session.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == job_id)
+            .values(
+                status='done', movies_fetched=IngestionJob.movies_total,
+                finished_at=func.now(), updated_at=func.now()
+            )
+        )
+        self.db_session.commit()
+
+    def mark_failed(self, job_id: int, error: str):
+        """
+        Vuelve a dejar el job pendiente si le quedan intentos; si no, 'failed'.
+        'updated_at' marca el fallo: claim_next no lo toma hasta que pase el
+        backoff exponencial en 'attempts'.
+        """
+        self.db_session.rollback()
+        job = self.db_session.get(IngestionJob, job_id)
+        if job is None:
+            return
+        job.error = (error or '')[:1000]
+        job.updated_at = func.now()
+        if job.attempts < self.max_attempts:
+            job.status = 'pending'
+        else:
+            job.status = 'failed'
+            job.finished_at = func.now()
+        self.db_session.commit()
+
+    def requeue_stale(self, older_than_seconds: float) -> int:
+        """
+        Devuelve a 'pending' los jobs 'running' sin latido reciente (el proceso
+        que los tenía murió). Retorna cuántos se reencolaron.
+        """
+        result = self.db_session.execute(
+            update(IngestionJob)
+            .where(
+                IngestionJob.status == 'running',
+                IngestionJob.updated_at < func.now() - timedelta(seconds=older_than_seconds)
+            )
+            .values(status='pending', updated_at=func.now())
+        )
+        self.db_session.commit()
+        return result.rowcount
+
+    def get_queue_stats(self) -> Dict[str, int]:
+        rows = (
+            self.db_session.query(IngestionJob.status, func.count(IngestionJob.id))
+            .group_by(IngestionJob.status)
+            .all()
+        )
+        return {status: count for status, count in rows}
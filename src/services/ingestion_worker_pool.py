@@ -0,0 +1,158 @@
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Any, List
+
+from src.services.ingestion_job_service import IngestionJobService
+
+
+class IngestionWorkerPool:
+    """
+    Hilos de fondo que procesan la cola de 'ingestion_jobs', para que los
+    requests HTTP no esperen la descarga de la filmografía de un actor.
+
+    'ingest' es la función que hace la ingesta (GameService.ingest_actor):
+    recibe el ID del actor y un callback progress(fetched, total). Cada hilo
+    usa su propia sesión (scoped_session) y la cierra después de cada job.
+    Los jobs encolados por este proceso despiertan a un worker al instante;
+    los de otros procesos se toman en el siguiente sondeo.
+
+    Los jobs 'running' sin latido por más de 'stale_seconds' (su worker
+    murió, aquí o en otro proceso) se reencolan al arrancar y luego cada
+    'stale_seconds / 2' desde el ciclo de sondeo.
+    """
+    def __init__(
+            self, job_service: IngestionJobService, ingest: Callable, workers: int = 2,
+            poll_seconds: float = 2.0, progress_interval: float = 0.5, stale_seconds: float = 600.0
+        ):
+        self.job_service = job_service
+        self.ingest = ingest
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.progress_interval = progress_interval
+        self.stale_seconds = stale_seconds
+        self._wakeup = threading.Condition()
+        self._pending_signals = 0
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._requeue_lock = threading.Lock()
+        self._next_requeue = 0.0
+        self.jobs_done = 0
+        self.jobs_failed = 0
+
+    def start(self):
+        if self._threads:
+            return
+        self.__maybe_requeue_stale__()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self.__run__, name=f'ingestion-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, actor_id: int) -> Dict[str, Any]:
+        """Encola (o reutiliza) el job del actor y despierta a un worker."""
+        job = self.job_service.enqueue(actor_id)
+        if job['status'] == 'pending':
+            with self._wakeup:
+                self._pending_signals += 1
+                self._wakeup.notify()
+        return job
+
+    def get_job(self, job_id: int):
+        return self.job_service.get_job(job_id)
+
+    def __requeue_stale__(self):
+        requeued = self.job_service.requeue_stale(self.stale_seconds)
+        if requeued:
+            print(f"Ingestion jobs reencolados (sin latido): {requeued}")
+
+    def __maybe_requeue_stale__(self):
+        # Un solo hilo por intervalo hace el barrido; los demás siguen de largo
+        with self._requeue_lock:
+            now = time.monotonic()
+            if now < self._next_requeue:
+                return
+            self._next_requeue = now + self.stale_seconds / 2
+        try:
+            self._in_own_session(self.__requeue_stale__)
+        except Exception as e:
+            print(f"Error reencolando ingestion jobs: {e}")
+
+    def __run__(self):
+        while not self._stop.is_set():
+            self.__maybe_requeue_stale__()
+            try:
+                job = self._in_own_session(self.job_service.claim_next)
+            except Exception as e:
+                print(f"Error tomando un ingestion job: {e}")
+                job = None
+
+            if job is None:
+                self.__wait__()
+                continue
+            try:
+                self._in_own_session(self.__process__, job)
+            except Exception as e:
+                # Falló mark_done/mark_failed (p. ej. se cayó la conexión): el job
+                # queda 'running' sin latido y el barrido periódico lo reencola
+                traceback.print_exc()
+                print(f"Error cerrando el ingestion job {job['id']}: {e}")
+
+    def __wait__(self):
+        with self._wakeup:
+            if self._pending_signals == 0:
+                self._wakeup.wait(self.poll_seconds)
+            self._pending_signals = max(0, self._pending_signals - 1)
+
+    def __process__(self, job: Dict[str, Any]):
+        job_id, actor_id = job['id'], job['actor_id']
+        last_report = [0.0]
+
+        def progress(fetched: int, total: int):
+            # Se escribe a lo sumo cada 'progress_interval' segundos (y al completar)
+            now = time.monotonic()
+            if fetched < total and now - last_report[0] < self.progress_interval:
+                return
+            last_report[0] = now
+            self.job_service.update_progress(job_id, fetched, total)
+
+        inicio = time.perf_counter()
+        try:
+            self.ingest(actor_id, progress)
+            self.job_service.mark_done(job_id)
+            with self._stats_lock:
+                self.jobs_done += 1
+            print(f"Ingestion job {job_id} (actor {actor_id}) done in {time.perf_counter() - inicio:.1f}s")
+        except Exception as e:
+            traceback.print_exc()
+            self.job_service.mark_failed(job_id, f"{type(e).__name__}: {e}")
+            with self._stats_lock:
+                self.jobs_failed += 1
+
+    def _in_own_session(self, fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            remove = getattr(self.job_service.db_session, 'remove', None)
+            if remove is not None:
+                remove()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = {
+                'workers': self.workers,
+                'alive': sum(1 for t in self._threads if t.is_alive()),
+                'jobs_done': self.jobs_done,
+                'jobs_failed': self.jobs_failed
+            }
+        stats['queue'] = self.job_service.get_queue_stats()
+        return stats
@@ -0,0 +1,262 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple
+
+# Límites superiores de los buckets de los histogramas
+BUCKETS_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BUCKETS_CANTIDAD = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def _etiquetas_texto(etiquetas: Dict[str, str]) -> str:
+    if not etiquetas:
+        return ''
+    partes = []
+    for nombre, valor in etiquetas.items():
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        partes.append(f'{nombre}="{valor}"')
+    return '{' + ','.join(partes) + '}'
+
+
+def _numero(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Counter:
+    """Contador monótono con etiquetas (formato de texto de Prometheus)."""
+    tipo = 'counter'
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self._valores = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, cantidad: float = 1, **etiquetas):
+        clave = tuple(str(etiquetas.get(e, '')) for e in self.etiquetas)
+        with self._lock:
+            self._valores[clave] += cantidad
+
+    def _muestras(self):
+        with self._lock:
+            valores = list(self._valores.items())
+        for clave, valor in valores:
+            yield self.nombre, dict(zip(self.etiquetas, clave)), valor
+
+
+class Histogram:
+    """Histograma acumulado por buckets, con _sum y _count, por combinación de etiquetas."""
+    tipo = 'histogram'
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (), buckets=BUCKETS_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self.buckets = tuple(buckets)
+        # clave -> [cuentas por bucket (+Inf al final), suma]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, valor: float, **etiquetas):
+        clave = tuple(str(etiquetas.get(e, '')) for e in self.etiquetas)
+        posicion = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][posicion] += 1
+            serie[1] += valor
+
+    def _muestras(self):
+        with self._lock:
+            series = [(clave, list(cuentas), suma) for clave, (cuentas, suma) in self._series.items()]
+        for clave, cuentas, suma in series:
+            etiquetas = dict(zip(self.etiquetas, clave))
+            acumulado = 0
+            for limite, cuenta in zip(self.buckets + (float('inf'),), cuentas):
+                acumulado += cuenta
+                yield f'{self.nombre}_bucket', {**etiquetas, 'le': _numero(limite)}, acumulado
+            yield f'{self.nombre}_sum', etiquetas, suma
+            yield f'{self.nombre}_count', etiquetas, acumulado
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso, expuesto en /metrics con el formato de
+    texto de Prometheus. Con varios procesos worker cada uno tiene sus propias
+    series: Prometheus las suma al consultar (una instancia por worker).
+    """
+    def __init__(self):
+        self._metricas = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, metrica):
+        with self._lock:
+            return self._metricas.setdefault(metrica.nombre, metrica)
+
+    def counter(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()) -> Counter:
+        return self._registrar(Counter(nombre, ayuda, etiquetas))
+
+    def histogram(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (), buckets=BUCKETS_SEGUNDOS) -> Histogram:
+        return self._registrar(Histogram(nombre, ayuda, etiquetas, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        lineas = []
+        for metrica in metricas:
+            lineas.append(f'# HELP {metrica.nombre} {metrica.ayuda}')
+            lineas.append(f'# TYPE {metrica.nombre} {metrica.tipo}')
+            for nombre, etiquetas, valor in metrica._muestras():
+                lineas.append(f'{nombre}{_etiquetas_texto(etiquetas)} {_numero(valor)}')
+        return '\n'.join(lineas) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+TMDB_SECONDS = REGISTRY.histogram(
+    'tmdb_call_seconds', 'Duración de las llamadas de TMDBService (caché incluida)', ('endpoint',)
+)
+TMDB_REQUESTS = REGISTRY.counter(
+    'tmdb_http_requests_total', 'Requests HTTP enviados a TMDB por estado de la respuesta', ('status',)
+)
+DB_SECONDS = REGISTRY.histogram(
+    'db_statement_seconds', 'Duración de cada sentencia SQL', ('operation',)
+)
+GRAPH_EXPAND_SECONDS = REGISTRY.histogram(
+    'graph_expand_seconds', 'Duración de las cargas de vértices del grafo desde la DB'
+)
+GRAPH_EXPANDED_VERTICES = REGISTRY.counter(
+    'graph_expanded_vertices_total', 'Vértices del grafo cargados desde la DB'
+)
+GRAPH_SEARCH_SECONDS = REGISTRY.histogram(
+    'graph_search_seconds', 'Duración de cada búsqueda de ruta', ('algorithm',)
+)
+JSON_SECONDS = REGISTRY.histogram(
+    'json_serialization_seconds', 'Duración de la serialización JSON de las respuestas'
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    'http_request_seconds', 'Duración de los requests HTTP', ('endpoint', 'method', 'status')
+)
+HTTP_DB_ROUND_TRIPS = REGISTRY.histogram(
+    'http_request_db_round_trips', 'Sentencias SQL por request HTTP', ('endpoint',), BUCKETS_CANTIDAD
+)
+HTTP_EXPANDED_VERTICES = REGISTRY.histogram(
+    'http_request_expanded_vertices', 'Vértices cargados desde la DB por request HTTP', ('endpoint',), BUCKETS_CANTIDAD
+)
+ACTOR_SEARCHES = REGISTRY.counter(
+    'actor_search_total', 'Búsquedas de actores por origen de los resultados (local, tmdb)', ('source',)
+)
+
+
+class RequestTimings:
+    """
+    Tiempo acumulado y cantidad por categoría ('tmdb', 'db', 'expandir',
+    'bfs', 'json') dentro de un request. Con hilos el tiempo acumulado de una
+    categoría puede superar la duración total del request.
+    """
+    def __init__(self):
+        self.segundos = defaultdict(float)
+        self.cantidad = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def sumar(self, categoria: str, segundos: float, cantidad: int = 1):
+        with self._lock:
+            self.segundos[categoria] += segundos
+            self.cantidad[categoria] += cantidad
+
+    def server_timing(self) -> str:
+        """Valor del header Server-Timing: 'db;dur=12.3;desc="5"' por categoría."""
+        with self._lock:
+            return ', '.join(
+                f'{categoria};dur={segundos * 1000:.1f};desc="{self.cantidad[categoria]}"'
+                for categoria, segundos in self.segundos.items()
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                categoria: {'ms': round(segundos * 1000, 3), 'count': self.cantidad[categoria]}
+                for categoria, segundos in self.segundos.items()
+            }
+
+
+_request_actual = contextvars.ContextVar('request_timings', default=None)
+
+
+def request_actual() -> RequestTimings:
+    """Los tiempos del request en curso (None fuera de un request)."""
+    return _request_actual.get()
+
+
+def iniciar_request() -> contextvars.Token:
+    return _request_actual.set(RequestTimings())
+
+
+def terminar_request(token: contextvars.Token):
+    _request_actual.reset(token)
+
+
+def sumar_al_request(categoria: str, segundos: float, cantidad: int = 1):
+    timings = _request_actual.get()
+    if timings is not None:
+        timings.sumar(categoria, segundos, cantidad)
+
+
+@contextmanager
+def medir(categoria: str, histograma: Histogram = None, **etiquetas):
+    """Mide el bloque: lo observa en 'histograma' y lo suma al request en curso."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        if histograma is not None:
+            histograma.observe(segundos, **etiquetas)
+        sumar_al_request(categoria, segundos)
+
+
+def propagar(fn):
+    """
+    Envuelve 'fn' para que corra con el contexto del hilo actual (el request
+    en curso) cuando se ejecuta en otro hilo, p. ej. en un ThreadPoolExecutor.
+    """
+    contexto = contextvars.copy_context()
+
+    def envuelta(*args, **kwargs):
+        # Una copia por llamada: un mismo Context no puede estar activo en dos hilos
+        return contexto.copy().run(fn, *args, **kwargs)
+
+    return envuelta
+
+
+def instrumentar_engine(engine):
+    """Mide cada sentencia SQL del engine y la cuenta como un viaje a la DB del request."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metricas_inicio', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def despues(conn, cursor, statement, parameters, context, executemany):
+        inicios = conn.info.get('metricas_inicio')
+        if not inicios:
+            return
+        segundos = time.perf_counter() - inicios.pop()
+        operacion = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+        DB_SECONDS.observe(segundos, operation=operacion)
+        sumar_al_request('db', segundos)
+
+    @event.listens_for(engine, 'handle_error')
+    def error(contexto):
+        # La sentencia falló: after_cursor_execute no se llama, se descarta su inicio
+        conexion = contexto.connection
+        if conexion is not None and conexion.info.get('metricas_inicio'):
+            conexion.info['metricas_inicio'].pop()
@@ -1,10 +1,14 @@
 from src.models.database import Movie
 from src.interfaces.models_interface import MovieInterface
-from typing import List
+from typing import List, Dict, Any
+from sqlalchemy.dialects.postgresql import insert
+from src.services.copy_bulk_loader import CopyBulkLoader
 
 class MovieService:
-    def __init__(self, db_session):
+    def __init__(self, db_session, bulk_loader: CopyBulkLoader = None):
         self.db_session = db_session
+        # Carga con COPY + staging para los *_bulk (None = INSERT ... VALUES)
+        self.bulk_loader = bulk_loader
 
     def get_movie_by_id(self, movie_id) -> MovieInterface:
         movie = self.db_session.query(Movie).filter(Movie.id == movie_id).first()
@@ -50,9 +54,38 @@ class MovieService:
             .all()
         ]
     
+    def get_movies_map_by_ids(self, movie_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Retorna {id: película} de las películas dadas en una sola consulta IN"""
+        if not movie_ids:
+            return {}
+
+        return {
+            movie.id: {
+                'id': movie.id,
+                'title': movie.title,
+                'release_date': movie.release_date,
+                'poster_path': movie.poster_path,
+                'vote_average': movie.vote_average
+            }
+            for movie in self.db_session.query(Movie).filter(Movie.id.in_(movie_ids)).all()
+        }
+
     def create_movies_bulk(self, movies: List[dict]):
-        """Crea múltiples películas en una sola transacción"""
-        self.db_session.bulk_insert_mappings(Movie, movies)
+        """
+        Crea múltiples películas en una sola transacción. ON CONFLICT DO NOTHING
+        evita el error si una ingesta concurrente ya creó alguna de ellas.
+        """
+        if not movies:
+            return
+
+        if self.bulk_loader is not None:
+            self.bulk_loader.load_movies(movies)
+            return
+
+        stmt = insert(Movie).values(movies)
+        stmt = stmt.on_conflict_do_nothing(index_elements=['id'])
+
+        self.db_session.execute(stmt)
         self.db_session.commit()
 
     def check_cast_saved_bulk(self, movie_ids: List[int], saved: bool):
@@ -60,4 +93,24 @@ class MovieService:
         self.db_session.query(Movie)\
             .filter(Movie.id.in_(movie_ids))\
             .update({Movie.all_cast_saved: saved}, synchronize_session=False)
-        self.db_session.commit()
\ No newline at end of file
+        self.db_session.commit()
+
+    def get_movie_ids_without_cast(self, movie_ids: List[int]) -> List[int]:
+        """Retorna los IDs de las películas dadas cuyo reparto todavía no está guardado"""
+        if not movie_ids:
+            return []
+
+        return [
+            movie.id for movie in
+            self.db_session.query(Movie.id)
+            .filter(Movie.id.in_(movie_ids), Movie.all_cast_saved.is_(False))
+            .all()
+        ]
+
+    def iter_all_movies(self, batch_size: int = 10000):
+        """Recorre todas las películas como (id, title, poster_path, release_date), por bloques"""
+        rows = self.db_session.query(Movie.id, Movie.title, Movie.poster_path, Movie.release_date)\
+            .execution_options(yield_per=batch_size)
+
+        for row in rows:
+            yield row.id, row.title, row.poster_path, row.release_date
\ No newline at end of file
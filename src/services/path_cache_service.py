@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+class PathCacheService:
+    """
+    Caché LRU (con TTL opcional) de rutas ya hidratadas entre dos actores.
+
+    La clave es simétrica: (A, B) y (B, A) comparten la entrada y la ruta se
+    invierte al servirla en el otro sentido.
+
+    Créditos nuevos (de este proceso o de otro) pueden acortar rutas que no
+    pasan por los actores afectados, así que la caché se vacía completa cuando
+    cambia el horizonte de créditos (ver sync_credits) y solo guarda rutas
+    calculadas con la generación vigente.
+    """
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # (menor, mayor) -> (ruta de 'menor' a 'mayor', guardado_en)
+        self._entries = OrderedDict()
+        # Mayor ID de créditos visto y xmax de esa lectura mientras puedan
+        # confirmarse créditos con un ID menor (None = ya no)
+        self._credits_max = None
+        self._pending_xmax = None
+        self.generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(actor_a: int, actor_b: int):
+        return (actor_a, actor_b) if actor_a <= actor_b else (actor_b, actor_a)
+
+    @staticmethod
+    def _reverse(ruta: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {'actual': paso['destino'], 'movie': paso['movie'], 'destino': paso['actual']}
+            for paso in reversed(ruta)
+        ]
+
+    def get(self, actor_a: int, actor_b: int) -> Optional[List[Dict[str, Any]]]:
+        """Retorna la ruta de A a B si está en caché (None si no está o venció)."""
+        key = self._key(actor_a, actor_b)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            ruta, saved_at = entry
+            if self.ttl_seconds and time.monotonic() - saved_at > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return list(ruta) if key[0] == actor_a else self._reverse(ruta)
+
+    def put(self, actor_a: int, actor_b: int, ruta: List[Dict[str, Any]], generation: Optional[int]):
+        """
+        Guarda la ruta hidratada de A a B, calculada con la generación que
+        retornó sync_credits; si la caché se vació después, se descarta.
+        """
+        key = self._key(actor_a, actor_b)
+        if key[0] != actor_a:
+            ruta = self._reverse(ruta)
+
+        with self._lock:
+            if generation is None or generation != self.generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (ruta, time.monotonic())
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def sync_credits(self, credits_max: int, xmin: int, xmax: int) -> Optional[int]:
+        """
+        Recibe el horizonte de créditos (ActorMovieService.get_credits_horizon)
+        y vacía la caché si hay créditos nuevos. Un ID menor al máximo puede
+        confirmarse después, mientras sigan abiertas las transacciones de esa
+        lectura (xmin < xmax leído); en ese lapso no se guardan rutas y al
+        terminar se vacía otra vez. Retorna la generación que se pasa a put(),
+        o None si por ahora no se debe guardar.
+        """
+        with self._lock:
+            if credits_max != self._credits_max:
+                self._credits_max = credits_max
+                self._pending_xmax = xmax
+                self._invalidate_all()
+            elif self._pending_xmax is not None and xmin >= self._pending_xmax:
+                self._pending_xmax = None
+                self._invalidate_all()
+            return None if self._pending_xmax is not None else self.generation
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def _invalidate_all(self):
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self.generation += 1
+
+    def _remove(self, key):
+        del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de la caché de rutas."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'generation': self.generation,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
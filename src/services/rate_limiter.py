@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Any
+
+
+class AdaptiveRateLimiter:
+    """
+    Limitador de tasa compartido por todas las llamadas a TMDB del proceso
+    (TMDBService y TMDBAsyncFetcher, desde cualquier hilo).
+
+    Reparte turnos separados por 1 / tasa (con una ráfaga de hasta 'rafaga'
+    requests si estuvo ocioso); cada llamador reserva su turno bajo el lock y
+    duerme fuera de él. La tasa es AIMD: un 429 la multiplica por
+    'factor_reduccion' y pausa a todos durante el Retry-After; mientras no
+    haya 429 sube 'aumento' req/s por segundo hasta volver a 'tasa_maxima'.
+
+    El estado es por proceso: con varios workers, TMDB_RATE_LIMIT es el
+    presupuesto de cada uno.
+    """
+    def __init__(
+            self, tasa_maxima: float = 40, tasa_minima: float = 2, rafaga: int = 10,
+            factor_reduccion: float = 0.75, aumento: float = 1.0, pausa_sin_retry_after: float = 1.0
+        ):
+        if tasa_minima <= 0 or tasa_maxima < tasa_minima:
+            raise ValueError("Se necesita 0 < tasa_minima <= tasa_maxima")
+        self.tasa_maxima = tasa_maxima
+        self.tasa_minima = tasa_minima
+        self.rafaga = rafaga
+        self.factor_reduccion = factor_reduccion
+        self.aumento = aumento
+        self.pausa_sin_retry_after = pausa_sin_retry_after
+        self.tasa = tasa_maxima
+        self._siguiente = 0.0
+        self._pausa_hasta = 0.0
+        self._ultimo_ajuste = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.esperas = 0
+        self.segundos_esperados = 0.0
+        self.throttles = 0
+        self.ultimo_retry_after = None
+
+    def _reservar(self) -> float:
+        """Reserva el próximo turno y retorna cuántos segundos faltan para él."""
+        with self._lock:
+            ahora = time.monotonic()
+            intervalo = 1.0 / self.tasa
+            turno = max(self._siguiente, ahora - self.rafaga * intervalo, self._pausa_hasta)
+            self._siguiente = turno + intervalo
+            espera = max(0.0, turno - ahora)
+            self.requests += 1
+            if espera > 0:
+                self.esperas += 1
+                self.segundos_esperados += espera
+            return espera
+
+    def adquirir(self):
+        """Bloquea al hilo hasta su turno."""
+        espera = self._reservar()
+        if espera:
+            time.sleep(espera)
+
+    async def adquirir_async(self):
+        """Como adquirir(), sin bloquear el event loop."""
+        espera = self._reservar()
+        if espera:
+            await asyncio.sleep(espera)
+
+    def registrar_exito(self):
+        """Aumento aditivo de la tasa, proporcional al tiempo desde el último ajuste."""
+        if self.tasa >= self.tasa_maxima:
+            return
+        with self._lock:
+            ahora = time.monotonic()
+            if ahora < self._pausa_hasta:
+                return
+            self.tasa = min(self.tasa_maxima, self.tasa + self.aumento * (ahora - self._ultimo_ajuste))
+            self._ultimo_ajuste = ahora
+
+    def registrar_throttle(self, retry_after: float = None):
+        """
+        TMDB respondió 429: reduce la tasa (multiplicativo) y pausa a todos los
+        llamadores hasta que venza el Retry-After.
+        """
+        pausa = self.pausa_sin_retry_after if retry_after is None else retry_after
+        with self._lock:
+            ahora = time.monotonic()
+            # Los 429 de requests que ya estaban en vuelo durante la pausa no
+            # vuelven a reducir la tasa (una reducción por episodio)
+            if ahora >= self._pausa_hasta:
+                self.tasa = max(self.tasa_minima, self.tasa * self.factor_reduccion)
+            self._pausa_hasta = max(self._pausa_hasta, ahora + pausa)
+            self._ultimo_ajuste = self._pausa_hasta
+            # Los turnos ya repartidos se corren detrás de la pausa
+            self._siguiente = max(self._siguiente, self._pausa_hasta)
+            self.throttles += 1
+            self.ultimo_retry_after = retry_after
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rate': round(self.tasa, 2),
+                'max_rate': self.tasa_maxima,
+                'min_rate': self.tasa_minima,
+                'requests': self.requests,
+                'waits': self.esperas,
+                'seconds_waited': round(self.segundos_esperados, 3),
+                'throttles': self.throttles,
+                'last_retry_after': self.ultimo_retry_after,
+                'paused_for': round(max(0.0, self._pausa_hasta - time.monotonic()), 3)
+            }
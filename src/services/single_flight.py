@@ -0,0 +1,209 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, List
+
+from sqlalchemy import text
+
+# Espacio de claves de cada tipo de trabajo en los advisory locks de Postgres
+NAMESPACES = {'actor': 1, 'movie': 2}
+
+
+class _Call:
+    """Trabajo en curso de un líder; los seguidores esperan a que termine."""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """
+    Deduplicación de trabajos concurrentes dentro del proceso: el primer hilo
+    que pide una clave (namespace, id) hace el trabajo (líder) y los que la
+    piden mientras tanto esperan su resultado (seguidores) en lugar de
+    repetirlo. Al terminar la clave se libera; no es una caché.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: defaultdict(int))
+
+    def do(self, namespace: str, key, fn):
+        """Ejecuta fn() una sola vez por clave en vuelo y comparte su resultado (o error)."""
+        with self._lock:
+            call = self._calls.get((namespace, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(namespace, key)] = _Call()
+                self._stats[namespace]['leaders'] += 1
+            else:
+                self._stats[namespace]['followers'] += 1
+
+        if not leader:
+            result = call.wait()
+            self.count(namespace, 'avoided')
+            return result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self.__release__(namespace, key, call)
+
+    def lead_many(self, namespace: str, keys: Iterable):
+        """
+        Versión por lotes: retorna (claves que lidera este hilo, {clave: _Call}
+        de las que ya estaban en vuelo). El llamador debe liberar las suyas con
+        resolve_many() aunque falle.
+        """
+        leading, following = [], {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get((namespace, key))
+                if call is None:
+                    self._calls[(namespace, key)] = _Call()
+                    leading.append(key)
+                else:
+                    following[key] = call
+            self._stats[namespace]['leaders'] += len(leading)
+            self._stats[namespace]['followers'] += len(following)
+        return leading, following
+
+    def resolve_many(self, namespace: str, keys: Iterable, error: BaseException = None):
+        for key in keys:
+            with self._lock:
+                call = self._calls.get((namespace, key))
+            if call is not None:
+                call.error = error
+                self.__release__(namespace, key, call)
+
+    def count(self, namespace: str, counter: str, amount: int = 1):
+        with self._lock:
+            self._stats[namespace][counter] += amount
+
+    def __release__(self, namespace: str, key, call: _Call):
+        with self._lock:
+            if self._calls.get((namespace, key)) is call:
+                del self._calls[(namespace, key)]
+        call.done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Por namespace: 'leaders' (trabajos hechos), 'followers' (esperas en el
+        proceso), 'remote_waits' (esperas a otro proceso) y 'avoided'
+        (trabajos duplicados que no se repitieron).
+        """
+        with self._lock:
+            stats = {namespace: dict(counters) for namespace, counters in self._stats.items()}
+            stats['in_flight'] = len(self._calls)
+            return stats
+
+
+class AdvisoryLocks:
+    """
+    La misma idea entre procesos, con advisory locks de sesión de Postgres
+    sobre la clave (namespace << 48) | id. Cada lock se toma en una conexión
+    propia del engine (no en la sesión ORM, que devuelve su conexión al pool
+    en cada commit) y se libera siempre al salir.
+    """
+    def __init__(self, engine, timeout_seconds: float = 300.0):
+        self.engine = engine
+        self.timeout_seconds = timeout_seconds
+
+    @staticmethod
+    def _key(namespace: str, key: int) -> int:
+        return (NAMESPACES[namespace] << 48) | int(key)
+
+    @contextmanager
+    def _connection(self):
+        conn = self.engine.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _set_timeout(self, conn):
+        """
+        lock_timeout solo para la transacción en curso (la conexión vuelve al
+        pool): un líder colgado termina en error, no en un worker bloqueado.
+        """
+        conn.execute(text("SELECT set_config('lock_timeout', :timeout, true)"),
+                     {'timeout': f"{int(self.timeout_seconds * 1000)}ms"})
+
+    @staticmethod
+    def _unlock(conn, statement: str, params: dict):
+        try:
+            conn.execute(text(statement), params)
+            conn.commit()
+        except Exception:
+            # Cerrar la conexión física libera los locks que hayan quedado tomados
+            conn.invalidate()
+            raise
+
+    @contextmanager
+    def hold(self, namespace: str, key: int):
+        """
+        Toma el lock de la clave, esperando si otro proceso lo tiene. Entrega
+        True si tuvo que esperar (el otro proceso probablemente ya hizo el trabajo).
+        """
+        lock_key = self._key(namespace, key)
+        with self._connection() as conn:
+            self._set_timeout(conn)
+            waited = not conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {'k': lock_key}).scalar()
+            if waited:
+                conn.execute(text("SELECT pg_advisory_lock(:k)"), {'k': lock_key})
+            conn.commit()
+            try:
+                yield waited
+            finally:
+                self._unlock(conn, "SELECT pg_advisory_unlock(:k)", {'k': lock_key})
+
+    @contextmanager
+    def hold_many(self, namespace: str, keys: List[int]):
+        """
+        Intenta tomar los locks de todas las claves en una sola consulta, sin
+        esperar. Entrega (tomadas, ocupadas por otro proceso); las tomadas se
+        liberan al salir.
+        """
+        if not keys:
+            yield [], []
+            return
+        by_lock_key = {self._key(namespace, key): key for key in keys}
+        with self._connection() as conn:
+            rows = conn.execute(
+                text("SELECT k, pg_try_advisory_lock(k) FROM unnest(CAST(:keys AS bigint[])) AS k"),
+                {'keys': list(by_lock_key)}
+            ).all()
+            conn.commit()
+            acquired = [lock_key for lock_key, ok in rows if ok]
+            try:
+                yield [by_lock_key[k] for k in acquired], [by_lock_key[k] for k, ok in rows if not ok]
+            finally:
+                if acquired:
+                    self._unlock(
+                        conn, "SELECT pg_advisory_unlock(k) FROM unnest(CAST(:keys AS bigint[])) AS k",
+                        {'keys': acquired}
+                    )
+
+    def wait_released(self, namespace: str, keys: List[int]):
+        """Espera a que otro proceso suelte los locks de las claves (sin quedárselos)."""
+        if not keys:
+            return
+        with self._connection() as conn:
+            self._set_timeout(conn)
+            for key in keys:
+                lock_key = self._key(namespace, key)
+                conn.execute(text("SELECT pg_advisory_lock(:k)"), {'k': lock_key})
+                conn.execute(text("SELECT pg_advisory_unlock(:k)"), {'k': lock_key})
+            conn.commit()
@@ -0,0 +1,215 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Dict, List, Any
+
+import httpx
+
+from src.services import metrics
+from src.services.tmdb_service import TMDBService
+from src.services.tmdb_cache_service import TMDBResponseCache
+from src.services.rate_limiter import AdaptiveRateLimiter
+from src.services.tmdb_errors import TMDBError, TMDBNetworkError, TMDBNotFoundError, TMDBRateLimitError, error_from_response
+
+class TMDBAsyncFetcher:
+    """
+    Descarga los créditos de muchas películas con httpx.AsyncClient.
+
+    En lugar de lotes fijos con una pausa entre cada uno, mantiene hasta
+    'max_en_vuelo' requests en curso: apenas termina uno empieza el siguiente,
+    y el AdaptiveRateLimiter de TMDBService (compartido por todas las
+    llamadas a TMDB del proceso) respeta la tasa permitida y los 429. Cada película se reintenta por
+    separado, así una lenta o fallida no frena a las demás.
+
+    El event loop corre en un hilo propio, con un solo cliente (y su pool de
+    conexiones) para toda la app; fetch_movie_credits_many() es sincrónico y
+    se puede llamar desde cualquier hilo de Flask.
+
+    Con 'cache' (la misma TMDBResponseCache de TMDBService) las películas ya
+    guardadas no consumen tokens y las vencidas se revalidan con un GET
+    condicional. La cache es sqlite sincrónico: se consulta antes de entrar
+    al event loop y se escribe desde el executor por defecto.
+    """
+    def __init__(
+            self, api_key: str, base_url: str, max_in_flight: int = 20,
+            max_retries: int = 3, timeout: float = 10.0, cache: TMDBResponseCache = None,
+            limiter: AdaptiveRateLimiter = None
+        ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self._loop = None
+        self._client = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _iniciar(self):
+        """Arranca (una sola vez) el hilo con el event loop y crea el cliente dentro de él."""
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='tmdb-async', daemon=True).start()
+
+            async def crear():
+                self._client = httpx.AsyncClient(
+                    base_url=self.base_url or '',
+                    headers={
+                        "accept": "application/json",
+                        "Authorization": f"Bearer {self.api_key}"
+                    },
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_in_flight,
+                        max_keepalive_connections=self.max_in_flight
+                    )
+                )
+
+            asyncio.run_coroutine_threadsafe(crear(), loop).result()
+            self._loop = loop
+
+    def fetch_movie_credits_many(self, movie_ids: List[int], progress=None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Retorna {movie_id: reparto} para todas las películas. Las que fallan
+        después de todos los reintentos quedan con reparto vacío.
+        'progress(fetched, total)' se llama desde el hilo que espera (no desde
+        el event loop), así puede escribir en la DB sin frenar las descargas.
+        """
+        if not movie_ids:
+            return {}
+        with metrics.medir('tmdb', metrics.TMDB_SECONDS, endpoint='movie_credits_many'):
+            return self._fetch_and_wait(movie_ids, progress)
+
+    def _fetch_and_wait(self, movie_ids: List[int], progress) -> Dict[int, List[Dict[str, Any]]]:
+        self._iniciar()
+        movie_ids = list(dict.fromkeys(movie_ids))
+        # La cache (sqlite, sincrónica) se consulta en este hilo y no en el
+        # event loop: los aciertos ni siquiera llegan a programarse
+        cached, entradas = self._buscar_en_cache(movie_ids)
+        pendientes = [mid for mid in movie_ids if mid not in cached]
+        completed = [len(cached)]
+        descargados = {}
+        if pendientes:
+            future = asyncio.run_coroutine_threadsafe(self._fetch_many(pendientes, entradas, completed), self._loop)
+            if progress is None:
+                descargados = future.result()
+            else:
+                while True:
+                    try:
+                        descargados = future.result(timeout=0.5)
+                        break
+                    except concurrent.futures.TimeoutError:
+                        progress(completed[0], len(movie_ids))
+        if progress is not None:
+            progress(len(movie_ids), len(movie_ids))
+        return {mid: cached[mid] if mid in cached else descargados[mid] for mid in movie_ids}
+
+    def _buscar_en_cache(self, movie_ids: List[int]):
+        """
+        ({movie_id: reparto} de las entradas vigentes, {movie_id: entrada} de
+        las vencidas, para revalidarlas con un GET condicional).
+        """
+        cached, entradas = {}, {}
+        if self.cache is None:
+            return cached, entradas
+        for mid in movie_ids:
+            entrada = self.cache.buscar(f"/movie/{mid}/credits")
+            if entrada and entrada['vigente']:
+                cached[mid] = TMDBService.parse_movie_credits(entrada['cuerpo'])
+            elif entrada:
+                entradas[mid] = entrada
+        return cached, entradas
+
+    async def _fetch_many(self, movie_ids: List[int], entradas: dict, completed: list):
+        en_vuelo = asyncio.Semaphore(self.max_in_flight)
+
+        async def una(mid):
+            async with en_vuelo:
+                cast = await self._fetch_with_retries(mid, entradas.get(mid))
+            completed[0] += 1
+            return mid, cast
+
+        return dict(await asyncio.gather(*(una(mid) for mid in movie_ids)))
+
+    async def _fetch_with_retries(self, movie_id: int, entrada: dict = None) -> List[Dict[str, Any]]:
+        path = f"/movie/{movie_id}/credits"
+        headers = TMDBResponseCache.encabezados_condicionales(entrada)
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = await self._request(path, headers)
+                # Las escrituras a la cache van al executor para no frenar el event loop
+                if response.status_code == 304 and entrada:
+                    await loop.run_in_executor(None, self.cache.renovar, path)
+                    return TMDBService.parse_movie_credits(entrada['cuerpo'])
+                data = response.json()
+                if self.cache is not None:
+                    await loop.run_in_executor(
+                        None, self.cache.guardar, path, 'movie_credits', data,
+                        response.headers.get('etag'), response.headers.get('last-modified')
+                    )
+                return TMDBService.parse_movie_credits(data)
+            except TMDBNotFoundError:
+                return []
+            except TMDBError as e:
+                if not e.retryable:
+                    print(f"Error fetching credits for {movie_id}: {e}. Skipping.")
+                    self.failures += 1
+                    return []
+                error = e
+
+            if attempt < self.max_retries:
+                self.retries += 1
+                # Tras un 429 el limitador ya hace esperar a todos el Retry-After
+                backoff = 0 if isinstance(error, TMDBRateLimitError) else 0.5 * (2 ** (attempt - 1))
+                print(f"Error fetching credits for {movie_id} (attempt {attempt}/{self.max_retries}): {error}. Backing off {backoff}s")
+                # Solo espera esta película; el resto del pipeline sigue
+                await asyncio.sleep(backoff)
+
+        print(f"Failed to fetch credits for movie {movie_id} after {self.max_retries} attempts. Skipping.")
+        self.failures += 1
+        return []
+
+    async def _request(self, path: str, headers: dict) -> httpx.Response:
+        """Versión asíncrona de TMDBService._request."""
+        await self.limiter.adquirir_async()
+        self.requests += 1
+        try:
+            response = await self._client.get(path, headers=headers)
+        except httpx.TransportError as e:
+            metrics.TMDB_REQUESTS.inc(status='error')
+            raise TMDBNetworkError(f"Error de red llamando a TMDB {path}: {e}") from e
+        metrics.TMDB_REQUESTS.inc(status=response.status_code)
+
+        if response.status_code == 429:
+            error = error_from_response(response)
+            self.limiter.registrar_throttle(error.retry_after)
+            raise error
+        if response.status_code >= 400:
+            raise error_from_response(response)
+        self.limiter.registrar_exito()
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_in_flight': self.max_in_flight,
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures
+        }
+
+    def close(self):
+        """Cierra el cliente y detiene el event loop (al apagar la app)."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
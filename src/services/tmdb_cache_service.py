@@ -0,0 +1,175 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+
+# TTL por defecto (segundos) de cada tipo de endpoint de TMDB
+TTL_POR_ENDPOINT = {
+    'search': 3600,                  # /search/person: cambia seguido, pero se repite mucho al tipear
+    'movie_credits': 30 * 86400,     # /movie/{id}/credits: casi nunca cambia
+    'actor_movies': 86400,           # /person/{id}/movie_credits: crece con estrenos nuevos
+    'actor': 7 * 86400,              # /person/{id}
+    'movie': 7 * 86400,              # /movie/{id}
+}
+# Cada cuántas escrituras se revisa el tope de entradas
+REVISAR_TOPE_CADA = 64
+# Evita escribir en cada hit solo para actualizar el orden LRU
+REFRESCO_USO = 60.0
+
+
+class TMDBResponseCache:
+    """
+    Caché persistente de respuestas de TMDB en SQLite, con clave endpoint +
+    parámetros y un TTL por tipo de endpoint.
+
+    Una entrada vencida no se borra: se guardan su ETag y Last-Modified para
+    revalidarla con un GET condicional, que si TMDB responde 304 no trae el
+    cuerpo de nuevo. Al superar 'max_entries' se desalojan las menos usadas
+    (el tope se revisa cada REVISAR_TOPE_CADA escrituras, así que es aproximado).
+
+    La base está en modo WAL y cada hilo usa su propia conexión, así la
+    comparten los hilos de Flask y varios procesos worker.
+    """
+    def __init__(self, ruta: str, max_entries: int = 50000, ttls: Dict[str, float] = None):
+        self.ruta = ruta
+        self.max_entries = max_entries
+        self.ttls = {**TTL_POR_ENDPOINT, **(ttls or {})}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._escrituras = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+        conexion = self._conexion()
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("""
+            CREATE TABLE IF NOT EXISTS respuestas (
+                clave TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                cuerpo TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                guardado_en REAL NOT NULL,
+                usado_en REAL NOT NULL
+            )
+        """)
+        conexion.execute("CREATE INDEX IF NOT EXISTS ix_respuestas_usado_en ON respuestas (usado_en)")
+
+    def _conexion(self) -> sqlite3.Connection:
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            # autocommit: cada sentencia es su propia transacción corta
+            conexion = sqlite3.connect(self.ruta, timeout=10, isolation_level=None)
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    @staticmethod
+    def clave(path: str, params: dict = None) -> str:
+        """Clave estable: el path más los parámetros ordenados."""
+        if not params:
+            return path
+        return f"{path}?{urlencode(sorted(params.items()))}"
+
+    def _contar(self, campo: str, cantidad: int = 1):
+        with self._lock:
+            setattr(self, campo, getattr(self, campo) + cantidad)
+
+    def buscar(self, clave: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna {'cuerpo', 'etag', 'last_modified', 'vigente'} o None si no
+        está. Una entrada no vigente todavía sirve para revalidar.
+        """
+        fila = self._conexion().execute(
+            "SELECT endpoint, cuerpo, etag, last_modified, guardado_en, usado_en FROM respuestas WHERE clave = ?",
+            (clave,)
+        ).fetchone()
+        if fila is None:
+            self._contar('misses')
+            return None
+
+        endpoint, cuerpo, etag, last_modified, guardado_en, usado_en = fila
+        ahora = time.time()
+        # El TTL se aplica al leer, así un cambio de configuración vale también para lo ya guardado
+        vigente = ahora < guardado_en + self.ttls.get(endpoint, 0)
+        if vigente:
+            self._contar('hits')
+            if ahora - usado_en > REFRESCO_USO:
+                self._conexion().execute("UPDATE respuestas SET usado_en = ? WHERE clave = ?", (ahora, clave))
+        else:
+            self._contar('expired')
+        return {'cuerpo': json.loads(cuerpo), 'etag': etag, 'last_modified': last_modified, 'vigente': vigente}
+
+    @staticmethod
+    def encabezados_condicionales(entrada: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Headers para revalidar una entrada vencida (vacío si no hay validadores)."""
+        headers = {}
+        if entrada and not entrada['vigente']:
+            if entrada['etag']:
+                headers['If-None-Match'] = entrada['etag']
+            if entrada['last_modified']:
+                headers['If-Modified-Since'] = entrada['last_modified']
+        return headers
+
+    def guardar(self, clave: str, endpoint: str, cuerpo: Any, etag: str = None, last_modified: str = None):
+        ahora = time.time()
+        self._conexion().execute(
+            "INSERT OR REPLACE INTO respuestas "
+            "(clave, endpoint, cuerpo, etag, last_modified, guardado_en, usado_en) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (clave, endpoint, json.dumps(cuerpo), etag, last_modified, ahora, ahora)
+        )
+        with self._lock:
+            self._escrituras += 1
+            revisar = self._escrituras % REVISAR_TOPE_CADA == 0
+        if revisar:
+            self._aplicar_tope()
+
+    def renovar(self, clave: str):
+        """TMDB respondió 304: la entrada sigue valiendo otro TTL completo."""
+        ahora = time.time()
+        self._conexion().execute(
+            "UPDATE respuestas SET guardado_en = ?, usado_en = ? WHERE clave = ?",
+            (ahora, ahora, clave)
+        )
+        self._contar('revalidated')
+
+    def _aplicar_tope(self):
+        conexion = self._conexion()
+        (total,) = conexion.execute("SELECT COUNT(*) FROM respuestas").fetchone()
+        sobrantes = total - self.max_entries
+        if sobrantes > 0:
+            conexion.execute(
+                "DELETE FROM respuestas WHERE clave IN "
+                "(SELECT clave FROM respuestas ORDER BY usado_en LIMIT ?)",
+                (sobrantes,)
+            )
+            self._contar('evictions', sobrantes)
+
+    def clear(self):
+        self._conexion().execute("DELETE FROM respuestas")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de este proceso y tamaño actual de la caché (compartida)."""
+        (entradas,) = self._conexion().execute("SELECT COUNT(*) FROM respuestas").fetchone()
+        with self._lock:
+            total = self.hits + self.misses + self.expired
+            return {
+                'path': self.ruta,
+                'entries': entradas,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'revalidated': self.revalidated,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,71 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+class TMDBError(Exception):
+    """
+    Error al llamar a la API de TMDB. 'retryable' indica si tiene sentido
+    reintentar el mismo request.
+    """
+    retryable = False
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TMDBNotFoundError(TMDBError):
+    """El recurso no existe (404)."""
+
+
+class TMDBClientError(TMDBError):
+    """Request inválido o sin autorización (4xx): reintentar no cambia el resultado."""
+
+
+class TMDBRateLimitError(TMDBError):
+    """TMDB limitó la tasa (429); 'retry_after' son los segundos a esperar, si los indicó."""
+    retryable = True
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message, 429)
+        self.retry_after = retry_after
+
+
+class TMDBServerError(TMDBError):
+    """Error del lado de TMDB (5xx)."""
+    retryable = True
+
+
+class TMDBNetworkError(TMDBError):
+    """Timeout o fallo de conexión."""
+    retryable = True
+
+
+def parse_retry_after(value: str):
+    """Segundos a esperar según el header Retry-After (en segundos o fecha HTTP), o None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        fecha = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds())
+
+
+def error_from_response(response) -> TMDBError:
+    """Excepción tipada para una respuesta de TMDB que no es 2xx ni 304."""
+    status = response.status_code
+    message = f"TMDB respondió {status} para {response.request.url.path}"
+    if status == 404:
+        return TMDBNotFoundError(message, status)
+    if status == 429:
+        return TMDBRateLimitError(message, parse_retry_after(response.headers.get('retry-after')))
+    if status >= 500:
+        return TMDBServerError(message, status)
+    return TMDBClientError(message, status)
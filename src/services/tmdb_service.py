@@ -1,10 +1,22 @@
 import httpx
+from src.services import metrics
+from src.services.tmdb_cache_service import TMDBResponseCache
+from src.services.rate_limiter import AdaptiveRateLimiter
+from src.services.tmdb_errors import TMDBClientError, TMDBNetworkError, error_from_response
 
 class TMDBService:
 
-    def __init__(self, api_key, base_url):
+    def __init__(
+            self, api_key, base_url, max_connections: int = 20, max_keepalive: int = 10,
+            keepalive_expiry: float = 30.0, timeout: float = 10.0, http2: bool = False,
+            cache: TMDBResponseCache = None, limiter: AdaptiveRateLimiter = None
+        ):
         self.api_key = api_key
         self.base_url = base_url
+        # Caché persistente de respuestas (None = siempre a la red)
+        self.cache = cache
+        # Todas las llamadas a la red pasan por el mismo limitador (lo comparte TMDBAsyncFetcher)
+        self.limiter = limiter or AdaptiveRateLimiter()
 
         # Manejando variables para evitar duplicación
         self.headers = {
@@ -12,12 +24,95 @@ class TMDBService:
             "Authorization": f"Bearer {self.api_key}"
         }
 
+        if http2:
+            try:
+                import h2  # noqa: F401 (httpx lo necesita para HTTP/2)
+            except ImportError:
+                print("HTTP/2 requiere el paquete 'h2' (pip install h2), se usa HTTP/1.1")
+                http2 = False
+
+        # Un solo cliente para toda la app: reutiliza conexiones (keep-alive) en
+        # lugar de abrir TCP + TLS en cada request. httpx.Client es seguro entre
+        # hilos, así que lo comparten los workers de __add_cast_bulk__.
+        self.client = httpx.Client(
+            base_url=self.base_url or '',
+            headers=self.headers,
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+
+    def _get(self, path: str, params: dict = None, endpoint: str = None) -> dict:
+        """
+        GET a la API de TMDB con el cliente compartido, pasando por el limitador.
+        'endpoint' es el tipo de endpoint para el TTL de la caché (None = sin caché).
+        Lanza una subclase de TMDBError si la respuesta no es 2xx.
+        """
+        with metrics.medir('tmdb', metrics.TMDB_SECONDS, endpoint=endpoint or 'otro'):
+            return self._get_con_cache(path, params, endpoint)
+
+    def _get_con_cache(self, path: str, params: dict, endpoint: str) -> dict:
+        use_cache = self.cache is not None and endpoint is not None
+        entrada = None
+        if use_cache:
+            clave = self.cache.clave(path, params)
+            entrada = self.cache.buscar(clave)
+            if entrada and entrada['vigente']:
+                return entrada['cuerpo']
+
+        headers = self.cache.encabezados_condicionales(entrada) if use_cache else None
+        response = self._request(path, params, headers)
+        if response.status_code == 304 and entrada:
+            self.cache.renovar(clave)
+            return entrada['cuerpo']
+        data = response.json()
+        if use_cache:
+            self.cache.guardar(
+                clave, endpoint, data,
+                response.headers.get('etag'), response.headers.get('last-modified')
+            )
+        return data
+
+    def _request(self, path: str, params: dict = None, headers: dict = None) -> httpx.Response:
+        """Un GET a la red: espera su turno en el limitador y traduce los errores a TMDBError."""
+        self.limiter.adquirir()
+        try:
+            response = self.client.get(path, params=params, headers=headers)
+        except httpx.TransportError as e:
+            metrics.TMDB_REQUESTS.inc(status='error')
+            raise TMDBNetworkError(f"Error de red llamando a TMDB {path}: {e}") from e
+        metrics.TMDB_REQUESTS.inc(status=response.status_code)
+
+        if response.status_code == 429:
+            error = error_from_response(response)
+            # Frena a todos los hilos del proceso, no solo a este
+            self.limiter.registrar_throttle(error.retry_after)
+            raise error
+        if response.status_code >= 400:
+            raise error_from_response(response)
+        self.limiter.registrar_exito()
+        return response
+
+    def get_limiter_stats(self):
+        return self.limiter.get_stats()
+
+    def get_cache_stats(self):
+        return None if self.cache is None else self.cache.get_stats()
+
+    def close(self):
+        """Cierra las conexiones del pool (al apagar la app)."""
+        self.client.close()
+
     def search_actors(self, query: str):
         """
         Busca actores usando la API de TMDB.
         """
         if not query:
-            return {'error': 'Query parameter "q" is required.'}, 400
+            raise TMDBClientError('Query parameter "q" is required.', 400)
 
         params = {
             'query': query,
@@ -26,157 +121,119 @@ class TMDBService:
             'page': 1
         }
 
-        try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/search/person",
-                    params=params,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            actors = []
-            for person in data.get('results', []):
-                if person.get('known_for_department') == "Acting":
-                    actors.append({
-                        'id': person.get('id'),
-                        'name': person.get('name'),
-                        'profile_path': person.get('profile_path'),
-                        'popularity': person.get('popularity')
-                    })
-
-            actors.sort(key=lambda x: x.get('popularity', 0), reverse=True)
-            return actors
-        except Exception as e:
-            return {'error': str(e)}, 500
-        
+        data = self._get("/search/person", params=params, endpoint='search')
+
+        actors = []
+        for person in data.get('results', []):
+            if person.get('known_for_department') == "Acting":
+                actors.append({
+                    'id': person.get('id'),
+                    'name': person.get('name'),
+                    'profile_path': person.get('profile_path'),
+                    'popularity': person.get('popularity')
+                })
+
+        actors.sort(key=lambda x: x.get('popularity', 0), reverse=True)
+        return actors
+
     def get_list_movies_by_actor(self, actor_id: int):
         """
         Obtiene la lista de películas asociadas a un actor dado su ID.
         """
 
-        try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/person/{actor_id}/movie_credits",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            movies = []
-            ORDER_THRESHOLD = 50
-            for movie in data.get('cast', []):
-                movie_order = movie.get('order')
-                # ✨ FILTRO CLAVE: Ignorar roles con orden alto (cameos/extras)
-                if movie_order is not None and movie_order > ORDER_THRESHOLD:
-                    continue # Salta este crédito y no lo agrega a la lista
-                movies.append({
-                    'id': movie.get('id'),
-                    'title': movie.get('title'),
-                    'poster_path': movie.get('poster_path'),
-                    'release_date': movie.get('release_date'),
-                    'vote_average': movie.get('vote_average'),
-                    'character': movie.get('character'),
-                    'order': movie.get('order')
-                })
+        data = self._get(f"/person/{actor_id}/movie_credits", endpoint='actor_movies')
+
+        movies = []
+        ORDER_THRESHOLD = 50
+        for movie in data.get('cast', []):
+            movie_order = movie.get('order')
+            # ✨ FILTRO CLAVE: Ignorar roles con orden alto (cameos/extras)
+            if movie_order is not None and movie_order > ORDER_THRESHOLD:
+                continue # Salta este crédito y no lo agrega a la lista
+            movies.append({
+                'id': movie.get('id'),
+                'title': movie.get('title'),
+                'poster_path': movie.get('poster_path'),
+                'release_date': movie.get('release_date'),
+                'vote_average': movie.get('vote_average'),
+                'character': movie.get('character'),
+                'order': movie.get('order')
+            })
+
+        movies = sorted(movies, key=lambda x: x.get('release_date', ''), reverse=True)[:150]
+        return movies
+
+    @staticmethod
+    def parse_movie_credits(data: dict) -> list:
+        """
+        Extrae el reparto de la respuesta de /movie/{id}/credits (también lo usa
+        TMDBAsyncFetcher).
+        """
+        cast = []
+        ORDER_THRESHOLD = 50
+        for person in data.get('cast', []):
+            movie_order = person.get('order')
+            # FILTRO CLAVE: Ignorar roles con orden alto (cameos/extras)
+            if movie_order is not None and movie_order > ORDER_THRESHOLD:
+                continue # Salta esta persona y no lo agrega a la lista
+            cast.append({
+                'id': person.get('id'),
+                'name': person.get('name'),
+                'profile_path': person.get('profile_path'),
+                'popularity': person.get('popularity'),
+                'character': person.get('character'),
+                'order': person.get('order')
+            })
+
+        return sorted(cast, key=lambda x: x.get('order', ''))[:80]
 
-            movies = sorted(movies, key=lambda x: x.get('release_date', ''), reverse=True)[:150]
-            return movies
-        except Exception as e:
-            return {'error': str(e)}, 500
-        
     def get_movie_credits(self, movie_id: int):
         """
         Obtiene los créditos de una película dada su ID.
         """
 
-        try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/movie/{movie_id}/credits",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            cast = []
-            ORDER_THRESHOLD = 50
-            for person in data.get('cast', []):
-                movie_order = person.get('order')
-                # FILTRO CLAVE: Ignorar roles con orden alto (cameos/extras)
-                if movie_order is not None and movie_order > ORDER_THRESHOLD:
-                    continue # Salta esta persona y no lo agrega a la lista
-                cast.append({
-                    'id': person.get('id'),
-                    'name': person.get('name'),
-                    'profile_path': person.get('profile_path'),
-                    'popularity': person.get('popularity'),
-                    'character': person.get('character'),
-                    'order': person.get('order')
-                })
+        data = self._get(f"/movie/{movie_id}/credits", endpoint='movie_credits')
+
+        cast = self.parse_movie_credits(data)
+        print("CAST TMDB:", len(cast))
+        return cast
 
-            cast = sorted(cast, key=lambda x: x.get('order', ''))[:80]
-            print("CAST TMDB:", len(cast))
-            return cast
-        except Exception as e:
-            return {'error': str(e)}, 500
-        
     def get_actor_details(self, actor_id: int):
         """
         Obtiene los detalles de un actor dado su ID.
         """
 
-        try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/person/{actor_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            actor_details = {
-                'id': data.get('id'),
-                'name': data.get('name'),
-                'profile_path': data.get('profile_path'),
-                'popularity': data.get('popularity'),
-                'known_for_department': data.get('known_for_department')
-            }
-
-            if actor_details['known_for_department'] != "Acting":
-                return None
-
-            return {
-                'id': actor_details['id'], 'name': actor_details['name'],
-                'profile_path': actor_details['profile_path'], 'popularity': actor_details['popularity'],
-                'all_movies_saved': False
-            }
-        except Exception as e:
-            return {'error': str(e)}, 500
-        
+        data = self._get(f"/person/{actor_id}", endpoint='actor')
+
+        actor_details = {
+            'id': data.get('id'),
+            'name': data.get('name'),
+            'profile_path': data.get('profile_path'),
+            'popularity': data.get('popularity'),
+            'known_for_department': data.get('known_for_department')
+        }
+
+        if actor_details['known_for_department'] != "Acting":
+            return None
+
+        return {
+            'id': actor_details['id'], 'name': actor_details['name'],
+            'profile_path': actor_details['profile_path'], 'popularity': actor_details['popularity'],
+            'all_movies_saved': False
+        }
+
     def get_movie_details(self, movie_id: int):
         """
         Obtiene los detalles de una película dada su ID.
         """
 
-        try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/movie/{movie_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            movie_details = {
-                'id': data.get('id'),
-                'title': data.get('title'),
-                'poster_path': data.get('poster_path'),
-                'release_date': data.get('release_date')
-            }
-
-            return movie_details
-        except Exception as e:
-            return {'error': str(e)}, 500
+        data = self._get(f"/movie/{movie_id}", endpoint='movie')
+
+        movie_details = {
+            'id': data.get('id'),
+            'title': data.get('title'),
+            'poster_path': data.get('poster_path'),
+            'release_date': data.get('release_date')
+        }
+
+        return movie_details